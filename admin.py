@@ -0,0 +1,60 @@
+"""
+StudyTrack AI - admin-only sidebar: dataset cache and stage timings.
+
+Imported only when the admin account is logged in, so other users never
+pay for pandas here.
+"""
+
+import pandas as pd
+import streamlit as st
+
+import metrics
+from cache import CACHE
+
+# reruns listed in the admin timing panel
+METRICS_PANEL_RUNS = 5
+
+
+def render_sidebar():
+    cache_stats = CACHE.stats()
+    st.sidebar.caption(
+        f"🗄️ Dataset cache: {cache_stats['entries']} entries, "
+        f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB "
+        f"({cache_stats['extra_bytes'] / 2**20:.1f} MB derived), "
+        f"{cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+        f"{cache_stats['evictions']} evictions, "
+        f"{cache_stats['spilled_entries']} on disk ({cache_stats['spilled_bytes'] / 2**20:.1f} MB)"
+    )
+
+    # ---------- STAGE TIMINGS (LAST RERUNS) ----------
+    with st.sidebar.expander("⏱️ Stage timings"):
+        # recording is one switch for the whole server process: show its
+        # current state (another admin may have flipped it) and only
+        # change it when this toggle is flipped
+        st.session_state["metrics_enabled"] = metrics.enabled()
+        st.toggle(
+            "Record timings (server-wide)", key="metrics_enabled",
+            on_change=lambda: metrics.set_enabled(st.session_state["metrics_enabled"]),
+            help="Turns timing spans on or off for every session on this server, not just yours."
+        )
+        timing_rows = [
+            {
+                "Page": run["page"],
+                "Stage": s["name"],
+                "ms": round(s["seconds"] * 1000, 1),
+                "Rows": s["rows"],
+                "Mem MB": round(s["mem_bytes"] / 2**20, 1),
+            }
+            for run in metrics.recent_runs(METRICS_PANEL_RUNS)
+            for s in run["spans"] + [{"name": "(rerun total)", "seconds": run["seconds"], "rows": None, "mem_bytes": 0}]
+        ]
+        if timing_rows:
+            st.dataframe(pd.DataFrame(timing_rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No reruns recorded yet.")
+        st.download_button(
+            "⬇️ Prometheus metrics",
+            metrics.prometheus_text,
+            "studytrack_metrics.prom",
+            "text/plain"
+        )
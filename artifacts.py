@@ -0,0 +1,191 @@
+"""
+StudyTrack AI - persisted training artifacts.
+
+Every Train Model run is saved as a versioned artifact per user:
+
+    artifacts/<user>/v0003/data.arrow      scored frame (uncompressed Arrow IPC)
+    artifacts/<user>/v0003/meta.json       formula / weights, row count, timestamp
+    artifacts/<user>/v0003/insights.pkl    precomputed insights bundle
+    artifacts/<user>/LATEST                name of the newest version
+
+A new session memory-maps data.arrow instead of re-parsing a CSV, so
+Insights and Recommendation work right after login without a re-upload.
+"""
+
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from datasets import ARROW_AVAILABLE
+from insights import upgrade_bundle
+from recommendations import RECOMMENDATION_COLUMN, encode_recommendations, is_flags
+from scoring import FORMULAS, LEVELS, register_formula
+
+ARTIFACT_ROOT = os.environ.get(
+    "STUDYTRACK_ARTIFACTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+)
+
+# versions kept per user
+KEEP_VERSIONS = 3
+
+
+def user_dir(username):
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", username)
+    return os.path.join(ARTIFACT_ROOT, safe)
+
+
+def _versions(root):
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if re.fullmatch(r"v\d{4}", name))
+
+
+def _formula_meta(name):
+    spec = FORMULAS[name]
+    return {
+        "name": name,
+        "columns": spec["columns"],
+        "weights": spec["weights"].tolist(),
+        "caps": [None if cap != cap else cap for cap in spec["caps"].tolist()],
+        "intercept": spec["intercept"],
+        "clip": spec["clip"],
+        "decimals": spec["decimals"],
+        "version": spec["version"],
+    }
+
+
+# ------------------------------------------------
+# SAVE
+# ------------------------------------------------
+def save_artifact(username, df, bundle, formula, dataset_key=None):
+    """
+    Write a new artifact version for username; returns its directory.
+    dataset_key is the frame's key in the shared dataset cache.
+    """
+    if not ARROW_AVAILABLE:
+        return None
+
+    root = user_dir(username)
+    os.makedirs(root, exist_ok=True)
+
+    versions = _versions(root)
+    version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+
+    # write into a temp dir and rename, so readers never see half a version
+    tmp = tempfile.mkdtemp(dir=root, prefix=".tmp-")
+    try:
+        df.reset_index(drop=True).to_feather(
+            os.path.join(tmp, "data.arrow"), compression="uncompressed"
+        )
+
+        with open(os.path.join(tmp, "insights.pkl"), "wb") as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        meta = {
+            "version": version,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "rows": len(df),
+            "formula": _formula_meta(formula),
+            "dataset_key": dataset_key,
+        }
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        os.replace(tmp, os.path.join(root, version))
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    with open(os.path.join(root, "LATEST"), "w", encoding="utf-8") as f:
+        f.write(version)
+
+    for old in _versions(root)[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+    return os.path.join(root, version)
+
+
+# ------------------------------------------------
+# LOAD
+# ------------------------------------------------
+def latest_version(username):
+    root = user_dir(username)
+    try:
+        with open(os.path.join(root, "LATEST"), encoding="utf-8") as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(root, version)
+    return path if os.path.isdir(path) else None
+
+
+def _restore_formula(meta):
+    # fitted formulas only live in memory - re-register them after a restart
+    formula = meta["formula"]
+    if formula["name"] not in FORMULAS:
+        terms = [
+            (col, weight) if cap is None else (col, weight, cap)
+            for col, weight, cap in zip(formula["columns"], formula["weights"], formula["caps"])
+        ]
+        register_formula(
+            formula["name"], terms,
+            intercept=formula["intercept"],
+            clip=tuple(formula["clip"]) if formula["clip"] else None,
+            decimals=formula["decimals"]
+        )
+    return formula["name"]
+
+
+def _as_key(value):
+    # JSON turns the cache key tuples into lists
+    return tuple(_as_key(v) for v in value) if isinstance(value, list) else value
+
+
+def _upgrade(df):
+    # versions saved before the advice bit flags / ordered levels, so they
+    # still append to frames trained now without falling back to text
+    changes = {}
+    if RECOMMENDATION_COLUMN in df.columns and not is_flags(df[RECOMMENDATION_COLUMN]):
+        flags = encode_recommendations(df[RECOMMENDATION_COLUMN])
+        if flags is not None:
+            changes[RECOMMENDATION_COLUMN] = flags
+    level = df.get("Performance_Level")
+    if level is not None and isinstance(level.dtype, pd.CategoricalDtype) and not level.cat.ordered:
+        if set(level.cat.categories) <= set(LEVELS):
+            changes["Performance_Level"] = level.cat.set_categories(LEVELS, ordered=True)
+    return df.assign(**changes) if changes else df
+
+
+def load_artifact(path, data=True):
+    """
+    Memory-map an artifact -> (df, bundle, formula_name, meta).
+
+    Numeric columns stay backed by the mapped file (read-only, zero-copy),
+    so opening even a large dataset costs milliseconds. With data=False
+    only the formula and meta are loaded and df / bundle are None.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["dataset_key"] = _as_key(meta.get("dataset_key"))
+    if not data:
+        return None, None, _restore_formula(meta), meta
+
+    source = pa.memory_map(os.path.join(path, "data.arrow"), "r")
+    table = ipc.open_file(source).read_all()
+    df = table.to_pandas(split_blocks=True, self_destruct=False)
+    df = _upgrade(df)
+
+    with open(os.path.join(path, "insights.pkl"), "rb") as f:
+        bundle = upgrade_bundle(pickle.load(f))
+
+    return df, bundle, _restore_formula(meta), meta
@@ -0,0 +1,130 @@
+"""
+StudyTrack AI - static images for the Home and Documentation pages.
+
+The source PNGs are large (1536 px, up to 1.4 MB) and their names differ
+in case from the ones the pages ask for. Images are looked up
+case-insensitively, resized to the width they are displayed at and
+re-encoded as JPEG (optimized PNG if they have transparency).
+
+st.image only passes JPEG / PNG / GIF bytes through untouched; anything
+else (WebP, or an opaque PNG) is decoded and re-encoded on every rerun.
+So variants are produced in exactly the format st.image keeps, at most
+as wide as it displays them.
+
+Encoded variants are kept in memory for the life of the process and on
+disk under a name that includes an ETag of the source file (size, mtime)
+and the encode settings, so a restart reuses them and an edited image
+gets new variants automatically. Run `python assets.py` to pre-generate
+every variant the pages use.
+"""
+
+import hashlib
+import io
+import os
+import threading
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+VARIANT_DIR = os.environ.get("STUDYTRACK_ASSET_CACHE", os.path.join(ASSET_DIR, ".asset_cache"))
+
+# width used for use_container_width images (wide layout content column,
+# below st.image's own 1460 px cap so it never resizes them again)
+CONTAINER_WIDTH = 1200
+JPEG_QUALITY = 82
+
+# (image, display width) used by the pages
+DISPLAYED = [
+    ("images.png", CONTAINER_WIDTH),
+    ("image2.png", 600),
+]
+
+# (name.lower(), width) -> (encoded bytes, etag)
+_variants = {}
+_lock = threading.Lock()
+
+
+def resolve(name):
+    """Path of name in ASSET_DIR, matched case-insensitively."""
+    path = os.path.join(ASSET_DIR, name)
+    if os.path.isfile(path):
+        return path
+    for entry in os.listdir(ASSET_DIR):
+        if entry.lower() == name.lower() and os.path.isfile(os.path.join(ASSET_DIR, entry)):
+            return os.path.join(ASSET_DIR, entry)
+    raise FileNotFoundError(f"No image named {name!r} in {ASSET_DIR}")
+
+
+def _etag(path, width):
+    stat = os.stat(path)
+    key = f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}:{width}:{JPEG_QUALITY}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _encode(path, width):
+    """-> (bytes, "jpeg" | "png")"""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        if img.width > width:
+            height = round(img.height * width / img.width)
+            img = img.resize((width, height), Image.LANCZOS)
+
+        buf = io.BytesIO()
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            img.convert("RGBA").save(buf, "PNG", optimize=True)
+            return buf.getvalue(), "png"
+        img.convert("RGB").save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return buf.getvalue(), "jpeg"
+
+
+def variant(name, width):
+    """(bytes, etag) of name resized to width, encoded once per process."""
+    key = (name.lower(), width)
+    cached = _variants.get(key)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        if key in _variants:
+            return _variants[key]
+
+        path = resolve(name)
+        etag = _etag(path, width)
+        stem = os.path.splitext(os.path.basename(path))[0].lower()
+        stored = [
+            os.path.join(VARIANT_DIR, f"{stem}-{width}-{etag}.{ext}") for ext in ("jpeg", "png")
+        ]
+
+        data = None
+        for disk_path in stored:
+            if os.path.isfile(disk_path):
+                with open(disk_path, "rb") as f:
+                    data = f.read()
+                break
+
+        if data is None:
+            data, ext = _encode(path, width)
+            disk_path = os.path.join(VARIANT_DIR, f"{stem}-{width}-{etag}.{ext}")
+            try:
+                os.makedirs(VARIANT_DIR, exist_ok=True)
+                tmp = f"{disk_path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, disk_path)
+            except OSError:
+                # read-only checkout - the in-memory copy is enough
+                pass
+
+        _variants[key] = (data, etag)
+        return _variants[key]
+
+
+def image(name, width=CONTAINER_WIDTH):
+    """Encoded bytes for st.image."""
+    return variant(name, width)[0]
+
+
+if __name__ == "__main__":
+    for name, width in DISPLAYED:
+        data, etag = variant(name, width)
+        source = os.path.getsize(resolve(name))
+        print(f"{name:<12} {width:>5}px  {source / 1024:>8.0f} KB -> {len(data) / 1024:>6.0f} KB  ({etag})")
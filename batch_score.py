@@ -0,0 +1,287 @@
+"""
+StudyTrack AI - headless batch scoring.
+
+Runs the same Train Model / Bulk Prediction pipeline as the Streamlit app,
+without importing Streamlit, over many files at once. Files are spread
+across a process pool and large CSVs are split into newline-aligned byte
+ranges so one big file also keeps every core busy.
+
+A byte range can only start on a row boundary if no quoted field holds a
+newline, so a large CSV with any double quote in it is split by rows
+instead: the main process parses it chunk by chunk and hands the chunks
+to the pool, a few at a time.
+
+    python batch_score.py "schools/*.csv" --mode train --format parquet --out results
+"""
+
+import argparse
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from datasets import apply_schema, dataset_format, read_dataset
+from pipeline import BULK_REQUIRED, TRAINING_REQUIRED, missing_columns, predict_bulk, train_dataset
+from recommendations import readable
+
+MODES = {
+    "train": (train_dataset, TRAINING_REQUIRED),
+    "bulk": (predict_bulk, BULK_REQUIRED),
+}
+
+DEFAULT_SHARD_MB = 64
+
+# block size when scanning a CSV for quotes / sampling its row length
+SCAN_BYTES = 16 * 1024 * 1024
+
+# row chunks parsed ahead of the pool, per worker
+CHUNKS_AHEAD = 2
+
+
+# ------------------------------------------------
+# SHARDING
+# ------------------------------------------------
+def csv_shards(path, shard_bytes):
+    """Split a CSV into (start, end) byte ranges that begin on a new row."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+        bounds = [header_end]
+        pos = header_end + shard_bytes
+        while pos < size:
+            f.seek(pos)
+            f.readline()  # move to the start of the next row
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+            pos = f.tell() + shard_bytes
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def has_quotes(path):
+    """True if the file holds a double quote - a field may then span lines."""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(SCAN_BYTES), b""):
+            if b'"' in block:
+                return True
+    return False
+
+
+def rows_per_shard(path, shard_bytes):
+    """Rows in about shard_bytes of the file, from the length of its first rows."""
+    with open(path, "rb") as f:
+        f.readline()
+        sample = f.read(min(shard_bytes, SCAN_BYTES))
+    return max(1, int(shard_bytes * max(sample.count(b"\n"), 1) / max(len(sample), 1)))
+
+
+def row_chunks(path, shard_bytes):
+    """Parse a CSV in row chunks of about shard_bytes each."""
+    return pd.read_csv(path, chunksize=rows_per_shard(path, shard_bytes))
+
+
+def plan_tasks(paths, shard_bytes):
+    """
+    Yield one task per file, per byte range of a large CSV, or per parsed
+    row chunk of a large CSV with quoted fields (shard count then None).
+    """
+    for path in paths:
+        if dataset_format(path) != "csv" or os.path.getsize(path) <= shard_bytes:
+            yield path, 0, 1, None
+        elif has_quotes(path):
+            for shard, chunk in enumerate(row_chunks(path, shard_bytes)):
+                yield path, shard, None, chunk
+        else:
+            ranges = csv_shards(path, shard_bytes)
+            for shard, byte_range in enumerate(ranges):
+                yield path, shard, len(ranges), byte_range
+
+
+# ------------------------------------------------
+# WORKER
+# ------------------------------------------------
+def _read_shard(path, byte_range):
+    if byte_range is None:
+        return read_dataset(path)
+    if isinstance(byte_range, pd.DataFrame):
+        # a row chunk parsed by the main process
+        return apply_schema(byte_range)
+
+    start, end = byte_range
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        body = f.read(end - start)
+    return apply_schema(pd.read_csv(io.BytesIO(header + body)))
+
+
+def score_task(task, mode, fmt, work_dir):
+    """Score one file or shard and write it as a part file."""
+    path, shard, shards, byte_range = task
+    # wall-clock stamps (comparable across workers) for the per-file span
+    started_at = time.time()
+    started = time.perf_counter()
+
+    df = _read_shard(path, byte_range)
+    pipeline, required = MODES[mode]
+    missing = missing_columns(df, required)
+    if missing:
+        raise ValueError(f"{path}: missing required columns: {', '.join(missing)}")
+
+    # part files are exports - advice bit flags written as text
+    df = readable(pipeline(df))
+
+    part = os.path.join(work_dir, f"{os.path.basename(path)}.{shard:05d}.{fmt}")
+    if fmt == "parquet":
+        df.to_parquet(part, index=False)
+    else:
+        # only the first shard carries the header row
+        df.to_csv(part, index=False, header=shard == 0)
+
+    return {"path": path, "shard": shard, "shards": shards, "rows": len(df),
+            "seconds": time.perf_counter() - started, "part": part,
+            "started_at": started_at, "finished_at": time.time()}
+
+
+# ------------------------------------------------
+# OUTPUT
+# ------------------------------------------------
+def output_path(path, out_dir, fmt):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir, f"{stem}_scored.{fmt}")
+
+
+def merge_parts(parts, target, fmt):
+    """Stitch the shard part files of one input into the final output."""
+    if fmt == "csv":
+        with open(target, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # shards can infer different compact dtypes (uint8 vs float32,
+    # dictionary index widths) - write them all with one widened schema
+    schema = pa.unify_schemas(
+        [pq.read_schema(part) for part in parts], promote_options="permissive"
+    ).remove_metadata()
+    with pq.ParquetWriter(target, schema) as writer:
+        for part in parts:
+            table = pq.read_table(part).replace_schema_metadata(None)
+            writer.write_table(table.select(schema.names).cast(schema))
+
+
+def expand_inputs(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(m for m in matches if os.path.isfile(m))
+    return list(dict.fromkeys(paths))
+
+
+# ------------------------------------------------
+# MAIN
+# ------------------------------------------------
+def run(paths, mode, fmt, out_dir, workers, shard_bytes):
+    os.makedirs(out_dir, exist_ok=True)
+
+    results = {path: [] for path in paths}
+    started = time.perf_counter()
+    errors = {}
+
+    def collect(done):
+        for future in done:
+            path = futures.pop(future)
+            try:
+                results[path].append(future.result())
+            except Exception as err:
+                errors[path] = str(err)
+
+    with tempfile.TemporaryDirectory(dir=out_dir) as work_dir:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for path in paths:
+                try:
+                    for task in plan_tasks([path], shard_bytes):
+                        futures[pool.submit(score_task, task, mode, fmt, work_dir)] = path
+                        # row chunks are parsed here - keep only a few in flight
+                        if len(futures) >= workers * CHUNKS_AHEAD:
+                            collect(wait(futures, return_when=FIRST_COMPLETED).done)
+                except Exception as err:
+                    # a row-chunked CSV that does not parse
+                    errors[path] = str(err)
+            collect(wait(futures).done)
+
+        for path in paths:
+            if path in errors:
+                continue
+            parts = [r["part"] for r in sorted(results[path], key=lambda r: r["shard"])]
+            merge_parts(parts, output_path(path, out_dir, fmt), fmt)
+
+    total = time.perf_counter() - started
+    report(paths, results, errors, total, workers)
+    return 1 if errors else 0
+
+
+def file_span(shard_results):
+    """Seconds from the first shard of a file starting to its last one finishing."""
+    if not shard_results:
+        return 0.0
+    return max(r["finished_at"] for r in shard_results) - min(r["started_at"] for r in shard_results)
+
+
+def report(paths, results, errors, total, workers):
+    print()
+    print(f"{'file':<40} {'shards':>6} {'rows':>12} {'wall s':>9} {'cpu s':>9} {'rows/s':>12}")
+    print("-" * 92)
+
+    all_rows = 0
+    for path in paths:
+        name = os.path.basename(path)[:40]
+        if path in errors:
+            print(f"{name:<40} ERROR: {errors[path]}")
+            continue
+        rows = sum(r["rows"] for r in results[path])
+        cpu = sum(r["seconds"] for r in results[path])
+        wall = file_span(results[path])
+        all_rows += rows
+        print(f"{name:<40} {len(results[path]):>6} {rows:>12,} {wall:>9.2f} {cpu:>9.2f} {rows / max(wall, 1e-9):>12,.0f}")
+
+    print("-" * 92)
+    print(f"{len(paths)} files, {all_rows:,} rows in {total:.2f}s "
+          f"({all_rows / max(total, 1e-9):,.0f} rows/s, {workers} workers)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score student datasets without the Streamlit UI.")
+    parser.add_argument("inputs", nargs="+", help="input files or glob patterns (CSV, Parquet, Feather)")
+    parser.add_argument("--mode", choices=sorted(MODES), default="train",
+                        help="train = marks + level + recommendation, bulk = marks + level")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="output format")
+    parser.add_argument("--out", default="scored", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--shard-mb", type=float, default=DEFAULT_SHARD_MB,
+                        help="split CSVs larger than this into row ranges of about this size "
+                             "(CSVs with quoted fields are parsed in row chunks by the main process)")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("no input files matched")
+
+    return run(paths, args.mode, args.format, args.out, max(1, args.workers),
+               int(args.shard_mb * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
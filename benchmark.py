@@ -0,0 +1,307 @@
+"""
+StudyTrack AI - benchmarks for the Train Model / Bulk Prediction hot paths.
+
+Generates synthetic student datasets (seeded, so every run sees the same
+data) and times each pipeline stage the app runs on an upload:
+
+    ingest     read_dataset on the CSV (compact schema)
+    predict    predicted marks with the "training" formula
+    bucket     performance levels
+    recommend  recommendation text per student
+    insights   Data Insights aggregates
+    export     CSV encode of the trained frame
+
+Each size runs in a fresh process, so peak RSS is not inflated by the
+previous size. Results are written as JSON; pass --baseline to compare
+against an earlier run and exit non-zero on regressions.
+
+    python benchmark.py --rows 10k,100k,1M --out bench.json
+    python benchmark.py --rows 10k,100k,1M,10M --baseline bench.json
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics import peak_rss_bytes, rss_bytes, set_enabled
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_SIZES = "10k,100k,1M"
+STAGES = ["ingest", "predict", "bucket", "recommend", "insights", "export"]
+
+# stages faster than this are reported but never flagged - timer noise
+NOISE_FLOOR_SECONDS = 0.005
+DEFAULT_TOLERANCE = 0.20
+
+GENERATOR_CHUNK_ROWS = 1_000_000
+
+
+# ------------------------------------------------
+# SYNTHETIC DATA
+# ------------------------------------------------
+def synthetic_students(rows, seed=0, start_id=0):
+    """
+    Student dataset with the columns the Train Model page expects.
+    Final_Marks follows the behaviour columns plus noise, so fitted
+    weights and correlations look like real data.
+    """
+    rng = np.random.default_rng(seed)
+    study = np.round(rng.gamma(4.0, 1.2, rows).clip(0, 12), 1)
+    sleep = np.round(rng.normal(7.0, 1.2, rows).clip(3, 10), 1)
+    play = np.round(rng.exponential(1.5, rows).clip(0, 8), 1)
+    exercise = rng.integers(0, 8, rows)
+    attendance = rng.normal(82, 10, rows).clip(30, 100).round().astype(np.int64)
+    attention = rng.normal(65, 15, rows).clip(10, 100).round().astype(np.int64)
+    previous = rng.normal(65, 14, rows).clip(0, 100).round().astype(np.int64)
+    final = (
+        10 + 3.0 * study + 1.5 * sleep - 1.0 * play + 0.8 * exercise
+        + 0.15 * attendance + 0.15 * attention + 0.35 * previous
+        + rng.normal(0, 6, rows)
+    ).clip(0, 100).round().astype(np.int64)
+
+    ids = np.arange(start_id, start_id + rows)
+    return pd.DataFrame({
+        "Student_ID": ids,
+        "Student_Name": [f"Student {i}" for i in ids],
+        "Study_Hours": study,
+        "Sleep_Hours": sleep,
+        "Play_Hours": play,
+        "Exercise": exercise,
+        "Attendance_Percentage": attendance,
+        "Attention_Level": attention,
+        "Previous_Marks": previous,
+        "Final_Marks": final,
+    })
+
+
+def synthetic_csv(rows, data_dir, seed=0):
+    """Path to a generated CSV with rows students, written once per (rows, seed)."""
+    path = os.path.join(data_dir, f"students_{rows}_{seed}.csv")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(data_dir, exist_ok=True)
+    tmp = path + ".part"
+    with open(tmp, "w", newline="") as f:
+        for n, start in enumerate(range(0, rows, GENERATOR_CHUNK_ROWS)):
+            chunk = synthetic_students(min(GENERATOR_CHUNK_ROWS, rows - start), seed + n, start)
+            chunk.to_csv(f, index=False, header=start == 0)
+    os.replace(tmp, path)
+    return path
+
+
+# ------------------------------------------------
+# MEMORY
+# ------------------------------------------------
+class RssSampler:
+    """Polls RSS on a thread to catch the peak of one stage."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_bytes = rss_bytes()
+        self.peak = self.start_bytes
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+        return self.peak
+
+
+# ------------------------------------------------
+# STAGES
+# ------------------------------------------------
+def measure(fn, rows, repeat):
+    """Run fn repeat times -> (last result, best wall time and peak memory)."""
+    result = None
+    best = None
+    peak = 0
+    delta = 0
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        sampler = RssSampler()
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        peak = max(peak, sampler.stop())
+        delta = max(delta, sampler.peak - sampler.start_bytes)
+        best = seconds if best is None else min(best, seconds)
+
+    return result, {
+        "seconds": best,
+        "rows_per_s": rows / best if best > 0 else None,
+        "peak_rss_mb": peak / 2**20,
+        "rss_delta_mb": delta / 2**20,
+    }
+
+
+def run_size(path, rows, repeat):
+    """Time every stage on one dataset (runs in a worker process)."""
+    from datasets import STUDENT_COLUMNS, encode_dataset, read_dataset
+    from insights import build_insights
+    from recommendations import generate_recommendations
+    from scoring import performance_levels, predict_marks
+
+    # time the stages themselves, not the app's span bookkeeping
+    set_enabled(False)
+
+    stages = {}
+    df, stages["ingest"] = measure(lambda: read_dataset(path, columns=STUDENT_COLUMNS), rows, repeat)
+    marks, stages["predict"] = measure(lambda: predict_marks(df, "training"), rows, repeat)
+    levels, stages["bucket"] = measure(lambda: performance_levels(marks), rows, repeat)
+
+    df = df.assign(Predicted_Marks=marks, Performance_Level=levels)
+    recs, stages["recommend"] = measure(lambda: generate_recommendations(df), rows, repeat)
+
+    df = df.assign(Recommendation=recs)
+    _, stages["insights"] = measure(lambda: build_insights(df), rows, repeat)
+    _, stages["export"] = measure(lambda: encode_dataset(df, "CSV"), rows, repeat)
+
+    return {
+        "rows": rows,
+        "stages": stages,
+        "total_seconds": sum(s["seconds"] for s in stages.values()),
+        "peak_rss_mb": peak_rss_bytes() / 2**20,
+    }
+
+
+# ------------------------------------------------
+# BASELINE COMPARISON
+# ------------------------------------------------
+def compare(results, baseline, tolerance):
+    """
+    Rows of (size, stage, metric, baseline, current, ratio, regressed) for
+    every stage present in both runs.
+    """
+    rows = []
+    for size, current in results["sizes"].items():
+        before = baseline.get("sizes", {}).get(size)
+        if before is None:
+            continue
+        for stage in STAGES:
+            if stage not in current["stages"] or stage not in before["stages"]:
+                continue
+            new, old = current["stages"][stage], before["stages"][stage]
+            for metric, floor in (("seconds", NOISE_FLOOR_SECONDS), ("rss_delta_mb", 1.0)):
+                ratio = new[metric] / old[metric] if old[metric] > 0 else None
+                regressed = (
+                    ratio is not None and ratio > 1 + tolerance
+                    and max(new[metric], old[metric]) >= floor
+                )
+                rows.append((size, stage, metric, old[metric], new[metric], ratio, regressed))
+    return rows
+
+
+# ------------------------------------------------
+# MAIN
+# ------------------------------------------------
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def report(results):
+    print()
+    print(f"{'size':>5} {'stage':<10} {'seconds':>9} {'rows/s':>14} {'peak MB':>9} {'delta MB':>9}")
+    print("-" * 61)
+    for size, result in results["sizes"].items():
+        for stage, m in result["stages"].items():
+            print(f"{size:>5} {stage:<10} {m['seconds']:>9.4f} {m['rows_per_s']:>14,.0f} "
+                  f"{m['peak_rss_mb']:>9.1f} {m['rss_delta_mb']:>9.1f}")
+        print(f"{size:>5} {'total':<10} {result['total_seconds']:>9.4f} "
+              f"{result['rows'] / result['total_seconds']:>14,.0f} {result['peak_rss_mb']:>9.1f}")
+        print("-" * 61)
+
+
+def report_comparison(rows, tolerance):
+    print()
+    print(f"vs baseline (tolerance {tolerance:.0%})")
+    print(f"{'size':>5} {'stage':<10} {'metric':<13} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    print("-" * 60)
+    for size, stage, metric, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{size:>5} {stage:<10} {metric:<13} {old:>10.4f} {new:>10.4f} {ratio_text}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the StudyTrack AI scoring pipeline.")
+    parser.add_argument("--rows", default=DEFAULT_SIZES,
+                        help=f"comma-separated sizes from {', '.join(SIZES)} (default {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "studytrack-bench"),
+                        help="where generated CSVs are kept between runs")
+    parser.add_argument("--out", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown / memory growth before a stage counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.rows.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {"environment": environment(), "repeat": args.repeat, "seed": args.seed, "sizes": {}}
+
+    # a fresh process per size keeps peak RSS per size honest
+    ctx = multiprocessing.get_context("spawn")
+    for size in sizes:
+        rows = SIZES[size]
+        print(f"{size}: generating / reusing data...", flush=True)
+        path = synthetic_csv(rows, args.data_dir, args.seed)
+        print(f"{size}: running {len(STAGES)} stages x {args.repeat}...", flush=True)
+        with ctx.Pool(1) as pool:
+            results["sizes"][size] = pool.apply(run_size, (path, rows, max(1, args.repeat)))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    report(results)
+    print(f"\nResults written to {args.out}")
+
+    if baseline is None:
+        return 0
+
+    rows = compare(results, baseline, args.tolerance)
+    report_comparison(rows, args.tolerance)
+    regressions = [r for r in rows if r[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
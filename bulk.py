@@ -0,0 +1,96 @@
+"""
+StudyTrack AI - chunked bulk prediction.
+
+Reads a student CSV in fixed-size chunks, scores each chunk with the shared
+scoring engine and appends the result to a spooled temp file, so peak
+memory stays around one chunk no matter how large the upload is.
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from scoring import PERFORMANCE_BANDS, DEFAULT_LEVEL, score
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# results stay in RAM up to this size, then roll over to a temp file on disk
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+
+def new_summary():
+    """Rolling counters shown while the chunks are processed."""
+    return {
+        "rows": 0,
+        "chunks": 0,
+        "marks_sum": 0.0,
+        "levels": {label: 0 for label in [label for _, label in PERFORMANCE_BANDS] + [DEFAULT_LEVEL]},
+    }
+
+
+def update_summary(summary, scored):
+    summary["rows"] += len(scored)
+    summary["chunks"] += 1
+    summary["marks_sum"] += float(scored["Predicted_Marks"].sum())
+
+    for label, count in scored["Performance_Level"].value_counts().items():
+        summary["levels"][label] = summary["levels"].get(label, 0) + int(count)
+    return summary
+
+
+def stream_predictions(source, required_cols, formula="bulk",
+                       chunksize=DEFAULT_CHUNK_ROWS, on_chunk=None):
+    """
+    Score a CSV chunk by chunk.
+
+    source:   path or binary file-like object holding the CSV.
+    on_chunk: optional callback(summary, first_chunk_result) after every chunk.
+
+    Returns (spooled_file, summary). The spooled file holds the scored CSV
+    and is rewound to the start. Raises ValueError when the first chunk is
+    missing any of required_cols; an exception raised by on_chunk stops
+    the run.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    summary = new_summary()
+    preview = None
+
+    try:
+        for chunk in pd.read_csv(source, chunksize=chunksize):
+
+            # ---------- VALIDATE ONCE, ON THE FIRST CHUNK ----------
+            if preview is None:
+                missing = [col for col in required_cols if col not in chunk.columns]
+                if missing:
+                    raise ValueError(f"CSV missing required columns: {', '.join(missing)}")
+
+            scored = score(chunk, formula)
+            scored.to_csv(out, index=False, header=preview is None, encoding="utf-8")
+
+            if preview is None:
+                preview = scored.head()
+
+            update_summary(summary, scored)
+            if on_chunk is not None:
+                on_chunk(summary, preview)
+    except BaseException:
+        # invalid file, or on_chunk stopped the run (e.g. a cancelled job)
+        out.close()
+        raise
+
+    out.seek(0)
+    return out, summary
+
+
+def read_result(spooled):
+    """
+    Bytes of a stream_predictions() result, for a download button.
+
+    Streamlit reads any file object handed to it into bytes (and never
+    closes it), so the bytes are read here through a reader that is closed
+    right away. The result moves to its temp file on disk first.
+    """
+    with os.fdopen(os.dup(spooled.fileno()), "rb") as reader:
+        reader.seek(0)
+        return reader.read()
@@ -0,0 +1,275 @@
+"""
+StudyTrack AI - process-wide store for parsed and scored datasets.
+
+Streamlit reruns app.py on every widget change, and every browser tab is
+its own session. Frames are kept once per server process, under a key
+built from a content hash of the uploaded bytes (plus the formula version
+for scored results), so a rerun, a page switch or a second user loading
+the same term file never parses, scores or stores the same data twice.
+Sessions only keep the key.
+
+The store has one memory budget, shared by the frames and the objects
+derived from them (insights bundle, ranking index, charts). Past it,
+least recently used frames (preferring large ones) are spilled to Arrow
+files on disk and memory-mapped back on the next access, or dropped if
+pyarrow is missing; their derived objects are dropped with them.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from datasets import ARROW_AVAILABLE
+
+# memory budget in MB, override with STUDYTRACK_CACHE_MB
+DEFAULT_BUDGET_MB = 512
+
+# eviction looks at this many of the least recently used entries and
+# spills the largest, so one big frame goes before several small ones
+EVICTION_WINDOW = 4
+
+# frames are shared between sessions: with copy-on-write a session that
+# modifies "its" frame gets a private copy instead of changing everyone's
+# (always on from pandas 3)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def content_hash(data):
+    """sha256 hex digest of the raw upload bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def object_bytes(obj, _seen=None):
+    """
+    Approximate memory held by obj: frames, arrays and bytes by their
+    size, anything with an nbytes attribute by that, plotly figures by
+    their data, containers and plain objects by what they hold. Objects
+    reached twice are counted once.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return frame_bytes(obj)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (np.ndarray, bytes, bytearray, memoryview)):
+        return int(obj.nbytes) if hasattr(obj, "nbytes") else len(obj)
+    if isinstance(getattr(obj, "nbytes", None), (int, np.integer)):
+        return int(obj.nbytes)
+    if hasattr(obj, "to_plotly_json"):
+        return object_bytes(obj.to_plotly_json(), seen)
+
+    if isinstance(obj, dict):
+        items = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        items = [vars(obj)]
+    else:
+        items = ()
+    return sys.getsizeof(obj) + sum(object_bytes(item, seen) for item in items)
+
+
+class DatasetCache:
+    """
+    Thread-safe store of DataFrames bounded by total memory use.
+
+    Every cached frame is shared by all sessions and must be treated as
+    read-only. Objects derived from a frame (e.g. its insights bundle) are
+    kept next to it with extra(key, name, build): they count against the
+    budget as part of the frame's entry and are dropped with the frame
+    when it leaves memory.
+    """
+
+    def __init__(self, max_bytes, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()   # key -> (df, size)
+        self._spilled = {}              # key -> (path, size)
+        self._extras = {}               # key -> {name: object}
+        self._extra_bytes = {}          # key -> measured size of its extras
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self.reloads = 0
+
+    # ---------- SPILL FILES ----------
+    def _spill_path(self, key):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="studytrack-spill-")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.spill_dir, f"{name}.arrow")
+
+    def _spill(self, key, df, size):
+        # called with the lock held
+        if not ARROW_AVAILABLE:
+            return
+        path = self._spill_path(key)
+        try:
+            if not os.path.exists(path):
+                df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+        except (OSError, ValueError, TypeError):
+            return
+        self._spilled[key] = (path, size)
+        self.spills += 1
+
+    def _drop_spilled(self, key):
+        path, _ = self._spilled.pop(key)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _reload(self, key):
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        path, _ = self._spilled[key]
+        try:
+            table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+        except (OSError, pa.ArrowInvalid):
+            self._drop_spilled(key)
+            return None
+        self.reloads += 1
+        return table.to_pandas(split_blocks=True)
+
+    def _drop_extras(self, key):
+        # called with the lock held
+        self._extras.pop(key, None)
+        self.total_bytes -= self._extra_bytes.pop(key, 0)
+
+    def _evict(self):
+        # called with the lock held; an entry's size includes its extras
+        while self.total_bytes > self.max_bytes and self._entries:
+            window = list(self._entries)[:EVICTION_WINDOW]
+            key = max(window, key=lambda k: self._entries[k][1] + self._extra_bytes.get(k, 0))
+            df, size = self._entries.pop(key)
+            self._drop_extras(key)
+            self.total_bytes -= size
+            self.evictions += 1
+            self._spill(key, df, size)
+
+    # ---------- GET / PUT ----------
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            if key in self._spilled:
+                df = self._reload(key)
+                if df is not None:
+                    self.hits += 1
+                    self._insert(key, df)
+                    return df
+            self.misses += 1
+            return None
+
+    def _insert(self, key, df):
+        # called with the lock held
+        size = frame_bytes(df)
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+
+        if size > self.max_bytes:
+            # too big to ever fit in memory - keep it on disk only
+            self._drop_extras(key)
+            self._spill(key, df, size)
+            return
+
+        self._entries[key] = (df, size)
+        self.total_bytes += size
+        self._evict()
+
+    def put(self, key, df):
+        with self._lock:
+            if key in self._spilled:
+                self._drop_spilled(key)
+            self._insert(key, df)
+        return df
+
+    def get_or_compute(self, key, compute):
+        df = self.get(key)
+        if df is None:
+            df = self.put(key, compute())
+        return df
+
+    def extra(self, key, name, build):
+        """
+        Object derived from the frame stored under key, built once with
+        build() and kept with the frame while it is in memory. Its size is
+        added to the frame's entry, so it can push the frame out. When the
+        frame is not in memory the object is built but not kept.
+        """
+        with self._lock:
+            extras = self._extras.get(key, {})
+            if name in extras:
+                return extras[name]
+
+        # built outside the lock: it may scan the whole frame
+        value = build()
+        size = object_bytes(value)
+
+        with self._lock:
+            if key not in self._entries:
+                return value
+            extras = self._extras.setdefault(key, {})
+            if name in extras:
+                # another session built it first
+                return extras[name]
+            extras[name] = value
+            self._extra_bytes[key] = self._extra_bytes.get(key, 0) + size
+            self.total_bytes += size
+            self._entries.move_to_end(key)
+            self._evict()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._extras.clear()
+            self._extra_bytes.clear()
+            for key in list(self._spilled):
+                self._drop_spilled(key)
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "extra_bytes": sum(self._extra_bytes.values()),
+                "max_bytes": self.max_bytes,
+                "spilled_entries": len(self._spilled),
+                "spilled_bytes": sum(size for _, size in self._spilled.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "spills": self.spills,
+                "reloads": self.reloads,
+            }
+
+
+# one store per server process, shared by every session
+CACHE = DatasetCache(
+    int(os.environ.get("STUDYTRACK_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024,
+    spill_dir=os.environ.get("STUDYTRACK_SPILL_DIR")
+)
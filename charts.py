@@ -0,0 +1,180 @@
+"""
+StudyTrack AI - Plotly figures for the Data Insights page.
+
+Small datasets are plotted as before. Past LARGE_DATA_ROWS the scatter
+switches to WebGL and to either a server-side 2D density grid or a
+stratified sample that keeps the outliers, and the Actual vs Predicted
+line chart is downsampled with LTTB, so the payload sent to the browser
+stays roughly the same size however many students there are.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+LARGE_DATA_ROWS = 50_000
+
+# points kept in large-data mode
+SAMPLE_ROWS = 5_000
+LINE_POINTS = 2_000
+DENSITY_BINS = 60
+
+LEVEL_COLUMN = "Performance_Level"
+
+
+def is_large(df):
+    return len(df) > LARGE_DATA_ROWS
+
+
+# ------------------------------------------------
+# STUDY HOURS VS PREDICTED MARKS
+# ------------------------------------------------
+def _outlier_rows(values):
+    # Tukey fences: anything beyond 1.5 IQR of the quartiles
+    q1, q3 = np.nanpercentile(values, [25, 75])
+    spread = 1.5 * (q3 - q1)
+    return np.flatnonzero((values < q1 - spread) | (values > q3 + spread))
+
+
+def stratified_sample(df, n=SAMPLE_ROWS, column=LEVEL_COLUMN, seed=0):
+    """
+    About n rows, allocated to each level in proportion to its size, plus
+    every level's min/max and the Predicted_Marks outliers (capped at n).
+    """
+    rng = np.random.default_rng(seed)
+    codes = pd.Categorical(df[column]).codes
+    marks = df["Predicted_Marks"].to_numpy(dtype="float64")
+
+    keep = []
+    for code in np.unique(codes):
+        rows = np.flatnonzero(codes == code)
+        take = max(1, round(n * len(rows) / len(df)))
+        keep.append(rng.choice(rows, size=min(take, len(rows)), replace=False))
+
+        group_marks = marks[rows]
+        if not np.isnan(group_marks).all():
+            keep.append(rows[[np.nanargmin(group_marks), np.nanargmax(group_marks)]])
+
+    outliers = _outlier_rows(marks)
+    if len(outliers) > n:
+        outliers = rng.choice(outliers, size=n, replace=False)
+    keep.append(outliers)
+
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+def density_grid(df, x="Study_Hours", y="Predicted_Marks", bins=DENSITY_BINS):
+    """Server-side 2D histogram -> (counts[y, x], x_centers, y_centers)."""
+    xs = df[x].to_numpy(dtype="float64")
+    ys = df[y].to_numpy(dtype="float64")
+    ok = ~(np.isnan(xs) | np.isnan(ys))
+
+    counts, x_edges, y_edges = np.histogram2d(xs[ok], ys[ok], bins=bins)
+    return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def density_figure(counts, x_centers, y_centers, x="Study_Hours", y="Predicted_Marks"):
+    """Heatmap of a density_grid() result (empty cells left blank)."""
+    fig = go.Figure(go.Heatmap(
+        z=np.where(counts > 0, counts, np.nan),
+        x=x_centers,
+        y=y_centers,
+        colorscale="Viridis",
+        colorbar={"title": "Students"}
+    ))
+    fig.update_layout(xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def study_scatter(df, mode="Sample"):
+    """Study Hours vs Predicted Marks; mode is used only for large data."""
+    if not is_large(df):
+        return px.scatter(
+            df,
+            x="Study_Hours",
+            y="Predicted_Marks",
+            color=LEVEL_COLUMN,
+            size="Attendance_Percentage"
+        )
+
+    if mode == "Density":
+        return density_figure(*density_grid(df))
+
+    sample = stratified_sample(df)
+    return px.scatter(
+        sample,
+        x="Study_Hours",
+        y="Predicted_Marks",
+        color=LEVEL_COLUMN,
+        size="Attendance_Percentage",
+        render_mode="webgl"
+    )
+
+
+# ------------------------------------------------
+# ACTUAL VS PREDICTED (LTTB)
+# ------------------------------------------------
+def lttb(y, n_out=LINE_POINTS):
+    """
+    Largest-Triangle-Three-Buckets downsampling of y plotted against its
+    position. Returns the indices of the kept points (first and last
+    always included).
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    prev = 0
+
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+
+        # average of the next bucket (or the last point)
+        nxt_stop = edges[b + 2] if b + 2 < len(edges) else n
+        nxt = slice(stop, nxt_stop)
+        avg_x = x[nxt].mean()
+        avg_y = np.nanmean(y[nxt]) if not np.isnan(y[nxt]).all() else y[prev]
+
+        # point in this bucket with the largest triangle area
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        area = np.nan_to_num(area, nan=-1.0)
+        prev = start + int(np.argmax(area))
+        keep[b + 1] = prev
+
+    return keep
+
+
+def actual_vs_predicted(compare_df):
+    """Line chart of the Actual/Predicted columns, LTTB-downsampled if large."""
+    if not is_large(compare_df):
+        return px.line(
+            compare_df,
+            y=list(compare_df.columns),
+            markers=True,
+            title="Actual vs Predicted Marks Comparison"
+        )
+
+    fig = go.Figure()
+    for col in compare_df.columns:
+        values = compare_df[col].to_numpy(dtype="float64")
+        idx = lttb(values)
+        fig.add_trace(go.Scattergl(x=idx, y=values[idx], mode="lines", name=col))
+
+    fig.update_layout(
+        title=f"Actual vs Predicted Marks Comparison ({LINE_POINTS:,} point LTTB per series)",
+        xaxis_title="index",
+        yaxis_title="value",
+        legend_title_text="variable"
+    )
+    return fig
@@ -0,0 +1,161 @@
+"""
+StudyTrack AI - dataset loading and export.
+
+Student datasets can be uploaded as CSV, Parquet or Arrow IPC (Feather).
+Pages pass the columns they need so only those are read, and every frame
+gets a compact schema: behavioral columns as uint8 (whole numbers 0-255)
+or float32, label columns as categoricals.
+"""
+
+import importlib.util
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from metrics import span
+from recommendations import RECOMMENDATION_COLUMN, encode_recommendations, readable
+
+# Parquet / Feather need pyarrow; CSV works without it
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+UPLOAD_TYPES = ["csv", "parquet", "feather", "arrow"] if ARROW_AVAILABLE else ["csv"]
+EXPORT_FORMATS = ["CSV", "Parquet", "Feather"] if ARROW_AVAILABLE else ["CSV"]
+
+# ------------------------------------------------
+# COMPACT SCHEMA
+# ------------------------------------------------
+# numeric student parameters: uint8 when every value is a whole number
+# in 0-255, otherwise float32
+BEHAVIOR_COLUMNS = [
+    "Study_Hours",
+    "Sleep_Hours",
+    "Play_Hours",
+    "Social_Media_Hours",
+    "Exercise",
+    "Attendance_Percentage",
+    "Attention_Level",
+    "Previous_Marks",
+    "Final_Marks",
+]
+
+# identifiers and derived labels (Recommendation text that matches the
+# advice catalog is stored as bit flags instead, see recommendations.py)
+LABEL_COLUMNS = [
+    "Student_ID",
+    "Student_Name",
+    "Performance_Level",
+    "Recommendation",
+]
+
+STUDENT_COLUMNS = ["Student_ID", "Student_Name"] + BEHAVIOR_COLUMNS
+
+
+def _compact_numeric(values):
+    values = pd.to_numeric(values, errors="coerce")
+    arr = values.to_numpy(dtype="float64", na_value=np.nan)
+
+    if not np.isnan(arr).any() and (arr >= 0).all() and (arr <= 255).all() and (arr == np.floor(arr)).all():
+        return values.astype("uint8")
+    return values.astype("float32")
+
+
+def apply_schema(df):
+    """Return df with the compact student dtypes applied to known columns."""
+    changes = {}
+    for col in BEHAVIOR_COLUMNS:
+        if col in df.columns and df[col].dtype.kind in "iufb":
+            changes[col] = _compact_numeric(df[col])
+    if RECOMMENDATION_COLUMN in df.columns:
+        flags = encode_recommendations(df[RECOMMENDATION_COLUMN])
+        if flags is not None:
+            changes[RECOMMENDATION_COLUMN] = flags
+    for col in LABEL_COLUMNS:
+        if col in df.columns and col not in changes and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            changes[col] = df[col].astype("category")
+    return df.assign(**changes) if changes else df
+
+
+# ------------------------------------------------
+# READ
+# ------------------------------------------------
+def dataset_format(name):
+    ext = os.path.splitext(name)[1].lower().lstrip(".")
+    if ext in ("feather", "arrow", "ipc"):
+        return "feather"
+    if ext in ("parquet", "pq"):
+        return "parquet"
+    return "csv"
+
+
+def _available_columns(source, fmt):
+    # read only the file footer/schema, then rewind
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        names = pq.ParquetFile(source).schema_arrow.names
+    else:
+        import pyarrow.ipc as ipc
+        names = ipc.open_file(source).schema.names
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return names
+
+
+def read_dataset(source, columns=None, name=None, nrows=None):
+    """
+    Read a student dataset (path or uploaded file) with the compact schema.
+
+    columns: optional projection; columns missing from the file are skipped
+             so the caller can report them.
+    name:    file name used to pick the format, defaults to source.name.
+    nrows:   optional row limit (previews).
+    """
+    fmt = dataset_format(name or getattr(source, "name", str(source)))
+
+    with span(f"ingest.{fmt}") as s:
+        if fmt == "csv":
+            wanted = None if columns is None else set(columns)
+            usecols = None if wanted is None else (lambda col: col in wanted)
+            df = pd.read_csv(source, usecols=usecols, nrows=nrows)
+        else:
+            if columns is not None:
+                names = _available_columns(source, fmt)
+                columns = [col for col in columns if col in names]
+            if fmt == "parquet":
+                df = pd.read_parquet(source, columns=columns)
+            else:
+                df = pd.read_feather(source, columns=columns)
+            if nrows is not None:
+                df = df.head(nrows)
+
+        df = apply_schema(df)
+        s.rows = len(df)
+    return df
+
+
+# ------------------------------------------------
+# EXPORT
+# ------------------------------------------------
+# format -> (file extension, mime type)
+EXPORT_TYPES = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Feather": ("feather", "application/vnd.apache.arrow.file"),
+}
+
+
+def encode_dataset(df, fmt):
+    """df encoded as CSV / Parquet / Feather bytes (recommendations as text)."""
+    with span(f"encode.{fmt.lower()}", rows=len(df)):
+        df = readable(df)
+        if fmt == "Parquet":
+            buf = io.BytesIO()
+            df.to_parquet(buf, index=False)
+            return buf.getvalue()
+        if fmt == "Feather":
+            buf = io.BytesIO()
+            df.reset_index(drop=True).to_feather(buf)
+            return buf.getvalue()
+        return df.to_csv(index=False).encode("utf-8")
@@ -0,0 +1,388 @@
+"""
+StudyTrack AI - Data Insights over scored files on disk.
+
+The Data Insights page normally works on the trained frame in memory. For
+datasets too large for that (e.g. several years scored with
+`batch_score.py --format parquet`), the aggregations run where the data
+sits and only result-sized tables come back:
+
+    duckdb   SQL over the files, if duckdb is installed
+    arrow    pyarrow.dataset record-batch scan (needs only pyarrow)
+
+Both build the same bundle as insights.build_insights, so the page's
+render helpers (bar, pie, correlation, summary) work unchanged. Files live
+under DATA_ROOT: single Parquet / Arrow files, or directories of Parquet
+files (hive partitions like year=2024/ included).
+"""
+
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from charts import DENSITY_BINS
+from datasets import ARROW_AVAILABLE, LABEL_COLUMNS, dataset_format
+from insights import build_insights, update_insights
+from metrics import span
+from stats import Moments, RunningMax
+
+DATA_ROOT = os.environ.get(
+    "STUDYTRACK_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scored")
+)
+
+DUCKDB_AVAILABLE = importlib.util.find_spec("duckdb") is not None
+ENGINES = (["duckdb"] if DUCKDB_AVAILABLE else []) + (["arrow"] if ARROW_AVAILABLE else [])
+
+# rows per record batch in the arrow scan (peak memory ~ one batch)
+SCAN_BATCH_ROWS = 250_000
+
+# no read-ahead: memory stays at about one batch instead of a queue of them
+_SCAN_OPTIONS = {"batch_size": SCAN_BATCH_ROWS, "batch_readahead": 1, "fragment_readahead": 1}
+PREVIEW_ROWS = 1_000
+
+# scan results kept per (engine, files, stats)
+MAX_CACHED_SCANS = 16
+
+_scans = OrderedDict()
+_lock = threading.Lock()
+
+_LEVEL = "Performance_Level"
+_NAME = "Student_Name"
+_X, _Y = "Study_Hours", "Predicted_Marks"
+
+
+# ------------------------------------------------
+# SOURCES
+# ------------------------------------------------
+def _is_table_file(name):
+    return dataset_format(name) in ("parquet", "feather")
+
+
+def scored_sources(root=DATA_ROOT):
+    """Files and Parquet directories under root the engine can scan."""
+    if not os.path.isdir(root):
+        return []
+    sources = []
+    for entry in sorted(os.listdir(root)):
+        path = os.path.join(root, entry)
+        if entry.startswith("."):
+            continue
+        if os.path.isfile(path) and _is_table_file(entry):
+            sources.append(entry)
+        elif os.path.isdir(path) and _parquet_files(path):
+            sources.append(entry)
+    return sources
+
+
+def _parquet_files(path):
+    return sorted(
+        os.path.join(folder, name)
+        for folder, dirs, names in os.walk(path)
+        for name in names
+        if dataset_format(name) == "parquet" and not name.startswith(".")
+    )
+
+
+def _signature(path):
+    # changes whenever a file is added, replaced or rewritten
+    files = _parquet_files(path) if os.path.isdir(path) else [path]
+    return tuple((f, os.path.getsize(f), os.stat(f).st_mtime_ns) for f in files)
+
+
+def open_dataset(path):
+    """pyarrow dataset over a file or a directory of Parquet files."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    if not os.path.isdir(path):
+        fmt = "parquet" if dataset_format(path) == "parquet" else "ipc"
+        return ds.dataset(path, format=fmt)
+
+    # files scored separately can carry different compact dtypes (uint8
+    # vs float32) - scan them all with one widened schema
+    files = _parquet_files(path)
+    schema = pa.unify_schemas(
+        [pq.read_schema(f).remove_metadata() for f in files], promote_options="permissive"
+    )
+    partitions = ds.dataset(
+        files, format="parquet", partitioning="hive", partition_base_dir=path
+    ).partitioning.schema
+    for field in partitions:
+        schema = schema.append(field)
+    return ds.dataset(
+        files, schema=schema, format="parquet", partition_base_dir=path,
+        partitioning=ds.partitioning(partitions, flavor="hive")
+    )
+
+
+def _columns(dataset):
+    """(numeric columns, other columns the insights need) of dataset."""
+    # label columns are left out even when they come back as numbers (a
+    # categorical Student_ID is int64 once the pandas metadata is gone),
+    # so the moments cover the same columns as insights.numeric_columns
+    import pyarrow as pa
+
+    partitioning = getattr(dataset, "partitioning", None)
+    partitions = set(partitioning.schema.names) if partitioning is not None else set()
+    numeric = [
+        field.name for field in dataset.schema
+        if field.name not in partitions and field.name not in LABEL_COLUMNS
+        and (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+    ]
+    labels = [col for col in (_LEVEL, _NAME) if col in dataset.schema.names]
+    return numeric, labels
+
+
+def preview_rows(path, n=PREVIEW_ROWS):
+    """First n rows, for the table on the page."""
+    return _cached(("preview", n, _signature(path)), lambda: open_dataset(path).head(n).to_pandas())
+
+
+# ------------------------------------------------
+# ARROW ENGINE (RECORD-BATCH SCAN)
+# ------------------------------------------------
+def _arrow_insights(dataset):
+    # fold batch after batch into the additive bundle - only one batch
+    # is ever materialized
+    numeric, labels = _columns(dataset)
+    frame_columns = [col for col in numeric + labels if col != _NAME]
+    bundle = None
+    ranges = {}
+    topper = RunningMax()
+    for batch in dataset.to_batches(columns=numeric + labels, **_SCAN_OPTIONS):
+        # names stay in Arrow: turning a batch of unique names into a
+        # categorical costs more than the rest of the batch together
+        part = batch.select(frame_columns).to_pandas()
+        bundle = build_insights(part) if bundle is None else update_insights(bundle, part)
+
+        for col in (_X, _Y):
+            if col in part.columns and part[col].notna().any():
+                low, high = float(part[col].min()), float(part[col].max())
+                old = ranges.get(col, (low, high))
+                ranges[col] = (min(old[0], low), max(old[1], high))
+
+        # first row with the highest marks wins, like idxmax
+        if _NAME in labels and _Y in ranges and part[_Y].notna().any():
+            best = int(np.nanargmax(part[_Y].to_numpy(dtype="float64", na_value=np.nan)))
+            topper.offer(part[_Y].iat[best], batch.column(_NAME)[best].as_py())
+
+    if bundle is None:
+        bundle = build_insights(dataset.schema.empty_table().select(frame_columns).to_pandas())
+    bundle["topper"] = topper
+    bundle["ranges"] = ranges
+    return bundle
+
+
+def _arrow_density(dataset, x_edges, y_edges):
+    counts = np.zeros((len(x_edges) - 1, len(y_edges) - 1))
+    for batch in dataset.to_batches(columns=[_X, _Y], **_SCAN_OPTIONS):
+        xs = batch.column(_X).to_numpy(zero_copy_only=False).astype("float64")
+        ys = batch.column(_Y).to_numpy(zero_copy_only=False).astype("float64")
+        ok = ~(np.isnan(xs) | np.isnan(ys))
+        counts += np.histogram2d(xs[ok], ys[ok], bins=(x_edges, y_edges))[0]
+    return counts
+
+
+# ------------------------------------------------
+# DUCKDB ENGINE (SQL PUSHDOWN)
+# ------------------------------------------------
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _duckdb(dataset):
+    import duckdb
+
+    con = duckdb.connect()
+    # duckdb scans the arrow dataset lazily, pushing projections and
+    # aggregates down - nothing is read into pandas
+    con.register("students", dataset)
+    return con
+
+
+def _duckdb_moments(con, columns):
+    # the same pairwise-complete moments as stats.Moments; duckdb's
+    # avg / var_pop / covar_pop are numerically stable (Welford) as well.
+    # 0 * b is NULL when b is, which keeps a term to the rows where both
+    # columns are present without a FILTER per pair (far slower)
+    moments = Moments(columns)
+    k = len(columns)
+    if not k:
+        return moments
+
+    exprs, slots = [], []
+    for i in range(k):
+        for j in range(k):
+            a, b = f"c{i}", f"c{j}"
+            exprs += [f"avg({a} + 0 * {b})", f"var_pop({a} + 0 * {b})"]
+            slots += [("means", i, j), ("m2", i, j)]
+            if j >= i:
+                exprs += [f"count({a} * {b})", f"covar_pop({a}, {b})"]
+                slots += [("n", i, j), ("comoment", i, j)]
+
+    doubles = ", ".join(f"CAST({_q(col)} AS DOUBLE) AS c{i}" for i, col in enumerate(columns))
+    row = con.execute(f"SELECT {', '.join(exprs)} FROM (SELECT {doubles} FROM students)").fetchone()
+    for (key, i, j), value in zip(slots, row):
+        getattr(moments, key)[i, j] = value or 0.0
+        if key in ("n", "comoment"):
+            getattr(moments, key)[j, i] = value or 0.0
+    # var_pop / covar_pop are per row - scale back to sums of deviations
+    moments.m2 *= moments.n
+    moments.comoment *= moments.n
+    return moments
+
+
+def _duckdb_insights(dataset):
+    numeric, labels = _columns(dataset)
+    con = _duckdb(dataset)
+    try:
+        rows = con.execute("SELECT count(*) FROM students").fetchone()[0]
+
+        study_groups = pd.DataFrame({"sum": pd.Series(dtype="float64"), "count": pd.Series(dtype="int64")})
+        if _X in numeric and _Y in numeric:
+            study_groups = con.execute(f"""
+                SELECT {_q(_X)}, coalesce(sum({_q(_Y)}), 0) AS "sum", count({_q(_Y)}) AS "count"
+                FROM students WHERE {_q(_X)} IS NOT NULL GROUP BY 1 ORDER BY 1
+            """).df().set_index(_X)
+
+        level_counts = pd.Series(dtype="int64")
+        if _LEVEL in labels:
+            levels = con.execute(f"""
+                SELECT CAST({_q(_LEVEL)} AS VARCHAR) AS level, count(*) AS n
+                FROM students WHERE {_q(_LEVEL)} IS NOT NULL GROUP BY 1
+            """).df()
+            level_counts = pd.Series(levels["n"].to_numpy(), index=levels["level"].to_numpy(), name="count")
+
+        topper = RunningMax()
+        if _NAME in labels and _Y in numeric:
+            # first row with the highest marks wins, like idxmax
+            best = con.execute(f"""
+                SELECT marks, name FROM (
+                    SELECT {_q(_Y)} AS marks, CAST({_q(_NAME)} AS VARCHAR) AS name,
+                           row_number() OVER () AS row_id
+                    FROM students
+                )
+                WHERE marks IS NOT NULL ORDER BY marks DESC, row_id LIMIT 1
+            """).fetchone()
+            if best:
+                topper.offer(best[0], best[1])
+
+        ranges = {}
+        for col in (_X, _Y):
+            if col in numeric:
+                low, high = con.execute(f"SELECT min({_q(col)}), max({_q(col)}) FROM students").fetchone()
+                if low is not None:
+                    ranges[col] = (float(low), float(high))
+
+        return {
+            "rows": int(rows),
+            "columns": numeric,
+            "study_groups": study_groups,
+            "level_counts": level_counts,
+            "moments": _duckdb_moments(con, numeric),
+            "topper": topper,
+            "ranges": ranges,
+        }
+    finally:
+        con.close()
+
+
+def _duckdb_density(dataset, x_edges, y_edges):
+    bins_x, bins_y = len(x_edges) - 1, len(y_edges) - 1
+
+    def bin_of(value, edges, bins):
+        # arithmetic guess, then nudged against the real edges so values
+        # on a bin boundary land where np.histogram2d puts them
+        scale = float(bins / (edges[-1] - edges[0]))
+        guess = (f"least(greatest(CAST(floor(({value} - {float(edges[0])!r}) * {scale!r})"
+                 f" AS INTEGER), 0), {bins - 1})")
+        listed = "[" + ", ".join(repr(float(e)) for e in edges) + "]"
+        return (f"({guess} - CAST({value} < {listed}[{guess} + 1] AS INTEGER)"
+                f" + CAST({value} >= {listed}[{guess} + 2] AND {guess} < {bins - 1} AS INTEGER))")
+
+    con = _duckdb(dataset)
+    try:
+        cells = con.execute(f"""
+            SELECT {bin_of("x", x_edges, bins_x)} AS i, {bin_of("y", y_edges, bins_y)} AS j, count(*) AS n
+            FROM (
+                SELECT CAST({_q(_X)} AS DOUBLE) AS x, CAST({_q(_Y)} AS DOUBLE) AS y FROM students
+                WHERE {_q(_X)} IS NOT NULL AND {_q(_Y)} IS NOT NULL
+            )
+            GROUP BY 1, 2
+        """).fetchnumpy()
+    finally:
+        con.close()
+
+    counts = np.zeros((bins_x, bins_y))
+    counts[cells["i"], cells["j"]] = cells["n"]
+    return counts
+
+
+# ------------------------------------------------
+# PUBLIC API
+# ------------------------------------------------
+def _cached(key, compute):
+    with _lock:
+        if key in _scans:
+            _scans.move_to_end(key)
+            return _scans[key]
+    result = compute()
+    with _lock:
+        _scans[key] = result
+        while len(_scans) > MAX_CACHED_SCANS:
+            _scans.popitem(last=False)
+    return result
+
+
+def _engine(engine):
+    engine = engine or (ENGINES[0] if ENGINES else None)
+    if engine not in ENGINES:
+        raise ValueError(f"Engine {engine!r} is not available (installed: {', '.join(ENGINES) or 'none'})")
+    return engine
+
+
+def scan_insights(path, engine=None):
+    """Insights bundle for the scored file(s) at path, computed on disk."""
+    engine = _engine(engine)
+
+    def compute():
+        dataset = open_dataset(path)
+        with span(f"engine.{engine}.insights") as s:
+            bundle = _duckdb_insights(dataset) if engine == "duckdb" else _arrow_insights(dataset)
+            s.rows = bundle["rows"]
+        return bundle
+
+    return _cached(("insights", engine, _signature(path)), compute)
+
+
+def scan_density(path, bundle, engine=None, bins=DENSITY_BINS):
+    """
+    Study_Hours vs Predicted_Marks 2D histogram like charts.density_grid,
+    counted on disk -> (counts[y, x], x_centers, y_centers), or None.
+    """
+    engine = _engine(engine)
+    ranges = bundle.get("ranges", {})
+    if _X not in ranges or _Y not in ranges:
+        return None
+
+    def compute():
+        # same edges np.histogram2d would pick from the data range
+        x_edges = np.linspace(*_span_range(ranges[_X]), bins + 1)
+        y_edges = np.linspace(*_span_range(ranges[_Y]), bins + 1)
+        dataset = open_dataset(path)
+        with span(f"engine.{engine}.density", rows=bundle["rows"]):
+            density = _duckdb_density if engine == "duckdb" else _arrow_density
+            counts = density(dataset, x_edges, y_edges)
+        return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+    return _cached(("density", engine, bins, _signature(path)), compute)
+
+
+def _span_range(bounds):
+    low, high = bounds
+    return (low - 0.5, high + 0.5) if low == high else (low, high)
@@ -0,0 +1,304 @@
+"""
+StudyTrack AI - incremental bulk scoring keyed by Student_ID.
+
+The weekly roster re-uploaded to Bulk Student Prediction is mostly the
+same students with the same numbers. Each user gets a store holding, per
+Student_ID, a 64-bit fingerprint of the inputs the formula reads and the
+last predicted marks. A new upload is joined to it by ID (hash index) and
+only new or changed rows are scored; the rest reuse the stored marks.
+
+Every re-scored row is also appended to a change log, so each student has
+a compact time series of predictions (one entry per change, not per run).
+The log is indexed by student, so a student's history is a slice lookup.
+
+    artifacts/<user>/history/log/run-00003.arrow   rows re-scored in run 3
+    artifacts/<user>/history/runs.json             one entry per upload
+
+A run writes only its re-scored rows; the per-student state (fingerprint,
+latest marks) is rebuilt by replaying the log when the store is opened.
+
+Student_IDs are keyed as int64: whole-number IDs (17, 17.0, "17") by
+value, any other text by a 64-bit hash of it.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import user_dir
+from datasets import ARROW_AVAILABLE
+from metrics import span
+from scoring import FORMULAS, performance_levels, predict_marks
+
+ID_COLUMN = "Student_ID"
+
+
+# key of a missing Student_ID - such rows are always scored, never stored
+MISSING_KEY = np.iinfo("int64").min
+
+
+def fingerprints(df, columns):
+    """uint64 hash per row of the values in columns (uint8 5 == float 5.0)."""
+    combined = np.zeros(len(df), dtype="uint64")
+    for col in columns:
+        values = np.asarray(df[col], dtype="float64")
+        combined = combined * np.uint64(1_000_003) ^ pd.util.hash_array(values)
+    return combined
+
+
+def student_keys(ids):
+    """int64 key per Student_ID (see module docstring)."""
+    ids = pd.Series(ids, copy=False)
+    if isinstance(ids.dtype, pd.CategoricalDtype):
+        # key each distinct ID once, then spread through the codes
+        codes = ids.cat.codes.to_numpy()
+        keys = np.append(student_keys(ids.cat.categories), MISSING_KEY)
+        return keys[codes]
+
+    if ids.dtype.kind in "iub":
+        return ids.to_numpy(dtype="int64")
+
+    keys = np.full(len(ids), MISSING_KEY, dtype="int64")
+    present = ids.notna().to_numpy()
+    if ids.dtype.kind == "f":
+        values = ids.to_numpy(dtype="float64", na_value=np.nan)
+        whole = present & (values == np.floor(values))
+        keys[whole] = values[whole].astype("int64")
+        ids = ids.astype(str)
+        present = present & ~whole
+
+    text = ids[present].astype(str).str.strip()
+    number = text.str.fullmatch(r"-?\d{1,18}").to_numpy(dtype=bool, na_value=False)
+    spots = np.flatnonzero(present)
+    keys[spots[number]] = text[number].astype("int64").to_numpy()
+    keys[spots[~number]] = pd.util.hash_array(text[~number].to_numpy(dtype=object)).view("int64")
+    return keys
+
+
+def student_key(student_id):
+    """Key of one typed-in Student_ID."""
+    text = str(student_id).strip()
+    if re.fullmatch(r"-?\d{1,18}", text):
+        return int(text)
+    return int(pd.util.hash_array(np.array([text], dtype=object)).view("int64")[0])
+
+
+class StudentHistory:
+    """Per-user store of the latest marks and prediction history by Student_ID."""
+
+    def __init__(self, root=None):
+        self.root = root
+        self.lock = threading.Lock()
+
+        self.keys = pd.Index(np.zeros(0, dtype="int64"))
+        self.fingerprints = np.zeros(0, dtype="uint64")
+        self.marks = np.zeros(0)
+
+        # change log, one row per (re-)scored student per run
+        self.log_student = np.zeros(0, dtype="int64")
+        self.log_run = np.zeros(0, dtype="int64")
+        self.log_marks = np.zeros(0)
+
+        self.runs = []
+        self._by_student = None
+
+        if root and os.path.isdir(root):
+            self._load()
+
+    # ------------------------------------------------
+    # RESCORE
+    # ------------------------------------------------
+    def rescore(self, df, formula="bulk", source=None, source_key=None):
+        """
+        Score df, reusing stored marks for rows whose inputs did not change.
+        Returns (df with Predicted_Marks / Performance_Level, run stats).
+
+        source_key identifies the upload; re-submitting the upload of the
+        last run returns its result without logging a new run.
+        """
+        spec = FORMULAS[formula]
+        with self.lock, span("history.rescore", rows=len(df)):
+            keys = student_keys(df[ID_COLUMN])
+            prints = fingerprints(df, spec["columns"])
+
+            positions = self.keys.get_indexer(keys)
+            known = positions >= 0
+            changed = ~known
+            last = self.runs[-1] if self.runs else None
+            if last is None or last["formula_version"] != spec["version"]:
+                # different weights - nothing stored can be reused
+                changed[:] = True
+            else:
+                changed[known] = self.fingerprints[positions[known]] != prints[known]
+            # a missing or repeated ID cannot be matched to one stored row
+            unmatched = pd.Index(keys).duplicated(keep=False) | (keys == MISSING_KEY)
+            changed |= unmatched
+
+            marks = np.empty(len(df))
+            marks[~changed] = self.marks[positions[~changed]]
+            rows = np.flatnonzero(changed)
+            if len(rows):
+                marks[rows] = predict_marks(df.iloc[rows], formula)
+
+            scored = df.assign(Predicted_Marks=marks, Performance_Level=performance_levels(marks))
+            stats = {
+                "rows": len(df),
+                "new": int((~known).sum()),
+                "rescored": len(rows),
+                "reused": len(df) - len(rows),
+            }
+
+            if source_key is not None and last is not None and last.get("source_key") == source_key \
+                    and last["formula_version"] == spec["version"]:
+                return scored, dict(stats, run=last["run"], repeated=True)
+
+            run = self._record(keys, prints, marks, changed, spec["version"], source, source_key, stats)
+        return scored, dict(stats, run=run, repeated=False)
+
+    def _record(self, keys, prints, marks, changed, version, source, source_key, stats):
+        # only re-scored rows touch the store; the last occurrence wins
+        # for repeated IDs
+        rows = np.flatnonzero(changed & (keys != MISSING_KEY))
+        rows = rows[~pd.Index(keys[rows]).duplicated(keep="last")]
+        keys, prints, marks = keys[rows], prints[rows], marks[rows]
+
+        positions = self.keys.get_indexer(keys)
+        new = positions < 0
+        if new.any():
+            positions[new] = len(self.keys) + np.arange(new.sum())
+            self.keys = self.keys.append(pd.Index(keys[new]))
+            self.fingerprints = np.concatenate([self.fingerprints, np.zeros(new.sum(), dtype="uint64")])
+            self.marks = np.concatenate([self.marks, np.full(new.sum(), np.nan)])
+
+        self.fingerprints[positions] = prints
+        self.marks[positions] = marks
+
+        run = len(self.runs)
+        self.log_student = np.concatenate([self.log_student, positions])
+        self.log_run = np.concatenate([self.log_run, np.full(len(positions), run)])
+        self.log_marks = np.concatenate([self.log_marks, marks])
+        self._by_student = None
+
+        self.runs.append(dict(
+            stats,
+            run=run,
+            created=time.strftime("%Y-%m-%d %H:%M:%S"),
+            source=source,
+            source_key=source_key,
+            formula_version=version,
+        ))
+        self._save(run, positions, keys, prints, marks)
+        return run
+
+    # ------------------------------------------------
+    # HISTORY
+    # ------------------------------------------------
+    def _index(self):
+        # log positions grouped by student: student s owns
+        # order[starts[s]:starts[s + 1]], oldest first
+        if self._by_student is None:
+            order = np.argsort(self.log_student, kind="stable")
+            starts = np.searchsorted(self.log_student[order], np.arange(len(self.keys) + 1))
+            self._by_student = (order, starts)
+        return self._by_student
+
+    def __contains__(self, student_id):
+        return student_key(student_id) in self.keys
+
+    def history(self, student_id):
+        """Predictions logged for one student, oldest first (empty if unknown)."""
+        with self.lock:
+            try:
+                position = self.keys.get_loc(student_key(student_id))
+            except KeyError:
+                return pd.DataFrame(columns=["Run", "Date", "Predicted_Marks", "Performance_Level"])
+
+            order, starts = self._index()
+            entries = order[starts[position]:starts[position + 1]]
+            runs = self.log_run[entries]
+            marks = self.log_marks[entries]
+            return pd.DataFrame({
+                "Run": runs,
+                "Date": [self.runs[r]["created"] for r in runs],
+                "Predicted_Marks": marks,
+                "Performance_Level": performance_levels(marks),
+            })
+
+    def runs_frame(self):
+        columns = ["run", "created", "source", "rows", "new", "rescored", "reused"]
+        return pd.DataFrame(self.runs, columns=columns)
+
+    # ------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------
+    def _save(self, run, positions, keys, prints, marks):
+        if not self.root or not ARROW_AVAILABLE:
+            return
+        log_dir = os.path.join(self.root, "log")
+        os.makedirs(log_dir, exist_ok=True)
+
+        path = os.path.join(log_dir, f"run-{run:05d}.arrow")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        pd.DataFrame({
+            "student": positions,
+            "key": keys,
+            "fingerprint": prints,
+            "marks": marks,
+        }).to_feather(tmp, compression="uncompressed")
+        os.replace(tmp, path)
+
+        # runs.json last: a run only counts once its files are in place
+        tmp = os.path.join(self.root, f"runs.json.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.runs, f, indent=2)
+        os.replace(tmp, os.path.join(self.root, "runs.json"))
+
+    def _load(self):
+        runs_path = os.path.join(self.root, "runs.json")
+        if not ARROW_AVAILABLE or not os.path.isfile(runs_path):
+            return
+        with open(runs_path, encoding="utf-8") as f:
+            self.runs = json.load(f)
+
+        parts = [
+            pd.read_feather(os.path.join(self.root, "log", f"run-{run:05d}.arrow")).assign(run=run)
+            for run in range(len(self.runs))
+        ]
+        log = pd.concat(parts, ignore_index=True)
+        self.log_student = log["student"].to_numpy(dtype="int64")
+        self.log_run = log["run"].to_numpy(dtype="int64")
+        self.log_marks = log["marks"].to_numpy(dtype="float64")
+
+        # replay: a student's first entry carries its key (positions are
+        # handed out in order), the last one its current state. Each is
+        # picked out explicitly - assigning through repeated indices does
+        # not say which write wins.
+        students = pd.Index(self.log_student)
+        first = ~students.duplicated(keep="first")
+        last = ~students.duplicated(keep="last")
+        count = int(self.log_student.max()) + 1 if len(self.log_student) else 0
+        keys = np.zeros(count, dtype="int64")
+        keys[self.log_student[first]] = log["key"].to_numpy(dtype="int64")[first]
+        self.keys = pd.Index(keys)
+
+        self.fingerprints = np.zeros(count, dtype="uint64")
+        self.fingerprints[self.log_student[last]] = log["fingerprint"].to_numpy(dtype="uint64")[last]
+        self.marks = np.full(count, np.nan)
+        self.marks[self.log_student[last]] = self.log_marks[last]
+
+
+# one store per user, shared by that user's sessions
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def student_history(username):
+    with _STORES_LOCK:
+        if username not in _STORES:
+            _STORES[username] = StudentHistory(os.path.join(user_dir(username), "history"))
+        return _STORES[username]
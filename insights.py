@@ -0,0 +1,126 @@
+"""
+StudyTrack AI - precomputed Data Insights bundle.
+
+Train Model builds the bundle once, next to the trained frame, and the
+Data Insights page renders straight from it. Everything in the bundle is
+kept as mergeable counts / online accumulators (stats.py), so appending
+rows only scans the new rows. Downloads are not part of it: they are
+encoded from the frame when the button is clicked.
+"""
+
+import numpy as np
+import pandas as pd
+
+from recommendations import RECOMMENDATION_COLUMN
+from stats import Moments, RunningMax
+
+# ------------------------------------------------
+# BUILD / UPDATE
+# ------------------------------------------------
+def _study_groups(df):
+    grouped = df.groupby("Study_Hours", observed=True)["Predicted_Marks"]
+    return pd.DataFrame({"sum": grouped.sum(), "count": grouped.count()})
+
+
+def _level_counts(df):
+    counts = df["Performance_Level"].value_counts()
+    counts.index = counts.index.astype(str)
+    return counts
+
+
+def _topper(df):
+    topper = RunningMax()
+    if "Student_Name" in df.columns:
+        topper.update(df["Predicted_Marks"].to_numpy(dtype="float64", na_value=np.nan), df["Student_Name"])
+    return topper
+
+
+def numeric_columns(df):
+    """Columns that go into the moments (not the advice bit flags)."""
+    return [col for col in df.select_dtypes(include="number").columns if col != RECOMMENDATION_COLUMN]
+
+
+def build_insights(df):
+    """Aggregates, column moments and top student for df."""
+    columns = numeric_columns(df)
+    return {
+        "rows": len(df),
+        "columns": columns,
+        "study_groups": _study_groups(df),
+        "level_counts": _level_counts(df),
+        "moments": Moments.of(df, columns),
+        "topper": _topper(df),
+    }
+
+
+def update_insights(bundle, new_rows, full_df=None):
+    """
+    Fold appended rows into an existing bundle.
+
+    Only new_rows is scanned. full_df (old + new rows) is only used when
+    the numeric columns differ and the bundle has to be rebuilt; without
+    it that case raises ValueError rather than losing the earlier rows.
+    """
+    columns = bundle["columns"]
+    if numeric_columns(new_rows) != columns:
+        # column set changed - fall back to a full rebuild
+        if full_df is None:
+            raise ValueError(
+                f"Appended rows have numeric columns {numeric_columns(new_rows)}, "
+                f"expected {columns}; pass full_df to rebuild the insights"
+            )
+        return build_insights(full_df)
+
+    study_groups = bundle["study_groups"].add(_study_groups(new_rows), fill_value=0).sort_index()
+    study_groups["count"] = study_groups["count"].astype("int64")
+
+    level_counts = bundle["level_counts"].add(_level_counts(new_rows), fill_value=0).astype("int64")
+
+    return {
+        "rows": bundle["rows"] + len(new_rows),
+        "columns": columns,
+        "study_groups": study_groups,
+        "level_counts": level_counts,
+        "moments": bundle["moments"].merge(Moments.of(new_rows, columns)),
+        # the earlier topper keeps ties, same as idxmax on the full frame
+        "topper": bundle["topper"].merge(_topper(new_rows)),
+    }
+
+
+# ------------------------------------------------
+# RENDER HELPERS (CONSTANT TIME IN THE ROW COUNT)
+# ------------------------------------------------
+def average_marks_by_study(bundle):
+    groups = bundle["study_groups"]
+    return pd.DataFrame({
+        "Study_Hours": groups.index,
+        "Predicted_Marks": (groups["sum"] / groups["count"]).to_numpy(),
+    })
+
+
+def level_distribution(bundle):
+    counts = bundle["level_counts"]
+    counts = counts[counts > 0].sort_values(ascending=False)
+    return pd.DataFrame({"Performance_Level": counts.index.astype(str), "Count": counts.to_numpy()})
+
+
+def correlation(bundle):
+    return bundle["moments"].correlation()
+
+
+def column_mean(bundle, column):
+    return bundle["moments"].mean(column)
+
+
+def top_student(bundle):
+    return bundle["topper"].label
+
+
+def upgrade_bundle(bundle):
+    """Bundles saved with raw moment sums, a (marks, name) topper or exports."""
+    bundle.pop("exports", None)
+    if "sums" in bundle:
+        bundle["moments"] = Moments.from_sums(bundle["columns"], **bundle.pop("sums"))
+    if not isinstance(bundle.get("topper"), RunningMax):
+        bundle["topper"] = RunningMax(*(bundle.get("topper") or (None, None)))
+    return bundle
@@ -0,0 +1,235 @@
+"""
+StudyTrack AI - background jobs for Train Model and Bulk Prediction.
+
+A Streamlit rerun throws away whatever the script was doing, so the long
+pipelines run on a small pool of worker threads instead. The session only
+keeps the job id; the page polls the job for progress, can cancel it, and
+picks the result up when it is done - after any number of reruns or page
+switches.
+
+    job = JOBS.submit(username, "train", run_training, df, label="Train Model")
+    ...
+    def run_training(job, df):
+        job.update(0.5, "Scoring")      # raises Cancelled once cancel() was asked
+        job.update(levels=counts)       # extra state the page shows while it runs
+        return {...}
+
+A free worker takes the oldest queued job of the user served least
+recently, and each user runs at most MAX_RUNNING_PER_USER jobs at a time, so one user's queue of uploads
+never holds up everyone else. Workers are threads: results go into the
+process-wide dataset cache, and the NumPy / pandas / Arrow kernels doing
+the work release the GIL.
+"""
+
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from itertools import count
+
+from metrics import span
+
+# worker threads, override with STUDYTRACK_JOB_WORKERS
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# jobs of one user that may run at the same time (the rest wait in order)
+MAX_RUNNING_PER_USER = 1
+
+# finished jobs remembered per user
+KEEP_FINISHED = 20
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class Cancelled(Exception):
+    """Raised inside a job (by Job.update / Job.check) once it was cancelled."""
+
+
+class Job:
+    """One submitted piece of work; fields are read by the pages, written by the worker."""
+
+    def __init__(self, user, kind, fn, args, kwargs, label=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.user = user
+        self.kind = kind
+        self.label = label or kind
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Waiting for a worker"
+        self.details = {}
+        self.result = None
+        self.error = None
+
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def update(self, progress=None, message=None, **details):
+        """
+        Report progress (0-1) from inside the job; also a cancellation point.
+        details (e.g. running counts) replace the same keys of job.details -
+        pass copies, the page reads them from another thread.
+        """
+        if progress is not None:
+            self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        if details:
+            self.details = {**self.details, **details}
+        self.check()
+
+
+class JobRunner:
+    """Worker threads pulling jobs from fair per-user queues."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._cond = threading.Condition()
+        # user -> deque of queued jobs, and when each user last got a worker
+        self._queues = {}
+        self._served = {}
+        self._ticks = count()
+        self._running = {}
+        self._jobs = {}
+        self._finished = {}
+        self._threads = []
+
+    def _start_workers(self):
+        # started on the first submit, so importing the module costs nothing
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"studytrack-job-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    # ------------------------------------------------
+    # SUBMIT / LOOK UP
+    # ------------------------------------------------
+    def submit(self, user, kind, fn, *args, label=None, **kwargs):
+        """Queue fn(job, *args, **kwargs) for user -> Job."""
+        job = Job(user, kind, fn, args, kwargs, label)
+        with self._cond:
+            self._jobs[job.id] = job
+            self._queues.setdefault(user, deque()).append(job)
+            self._start_workers()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.cancel()
+        with self._cond:
+            queue = self._queues.get(job.user)
+            if job.status == QUEUED and queue is not None and job in queue:
+                # never started - take it out of the line right away
+                queue.remove(job)
+                self._finish(job, CANCELLED, message="Cancelled")
+
+    def stats(self):
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "running": sum(self._running.values()),
+            }
+
+    # ------------------------------------------------
+    # SCHEDULING
+    # ------------------------------------------------
+    def _next(self):
+        # of the users with a queued job and a free slot, the one served
+        # least recently (never served first)
+        ready = [
+            user for user, queue in self._queues.items()
+            if queue and self._running.get(user, 0) < MAX_RUNNING_PER_USER
+        ]
+        if not ready:
+            return None
+        user = min(ready, key=lambda name: self._served.get(name, -1))
+        self._served[user] = next(self._ticks)
+
+        queue = self._queues[user]
+        job = queue.popleft()
+        if not queue:
+            del self._queues[user]
+        return job
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next()
+                self._running[job.user] = self._running.get(job.user, 0) + 1
+                job.status = RUNNING
+                job.started = time.time()
+                job.message = "Starting"
+
+            status, result, error = DONE, None, None
+            try:
+                job.check()
+                with span(f"job.{job.kind}"):
+                    result = job.fn(job, *job.args, **job.kwargs)
+                job.progress = 1.0
+            except Cancelled:
+                status = CANCELLED
+            except Exception as exc:
+                status, error = FAILED, str(exc) or type(exc).__name__
+                traceback.print_exc()
+
+            with self._cond:
+                self._running[job.user] -= 1
+                self._finish(job, status, result, error)
+                # a slot of this user is free again
+                self._cond.notify_all()
+
+    def _finish(self, job, status, result=None, error=None, message=None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        job.message = message or {DONE: "Done", FAILED: "Failed", CANCELLED: "Cancelled"}[status]
+        # the work and its inputs are not needed any more
+        job.fn, job.args, job.kwargs = None, (), {}
+
+        finished = self._finished.setdefault(job.user, deque())
+        finished.append(job.id)
+        while len(finished) > KEEP_FINISHED:
+            self._jobs.pop(finished.popleft(), None)
+
+
+JOBS = JobRunner(int(os.environ.get("STUDYTRACK_JOB_WORKERS", DEFAULT_WORKERS)))
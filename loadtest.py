@@ -0,0 +1,611 @@
+"""
+StudyTrack AI - multi-session load test of a running app.py server.
+
+Starts `streamlit run app.py` (or targets --url) and drives it with
+scripted headless sessions speaking Streamlit's websocket protocol, the
+same messages a browser tab sends. Every session:
+
+    login      with one of the USERS accounts from app.py
+    upload     a synthetic student CSV (--rows, distinct data per session)
+    train      Train Model, waiting for the background job to finish
+    insights   open Data Insights and page through the table
+    sliders    move the Student / Recommendation sliders
+
+Concurrency ramps through --sessions (e.g. 1,2,4,8); at each level all
+sessions run the script at the same time. Reported per level:
+
+    p50 / p95 / p99 rerun latency   (time from widget change to the end of
+                                     the script run, per action and overall)
+    throughput                      reruns per second across all sessions
+    server RSS                      peak, and growth per session
+
+Train latency is the job time the user waits for, reported separately
+from the reruns. Results are written as JSON; --baseline compares p95
+latency and memory per session and exits non-zero on regressions.
+
+    python loadtest.py --sessions 1,2,4,8 --rows 10000 --out load.json
+    python loadtest.py --url http://localhost:8501 --server-pid 1234
+
+The client runs in this process; for capacity numbers of a real box,
+run it from another machine against --url.
+"""
+
+import argparse
+import ast
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+
+import numpy as np
+
+from benchmark import DEFAULT_TOLERANCE, environment, synthetic_students
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+DEFAULT_SESSIONS = "1,2,4,8"
+DEFAULT_ROWS = 10_000
+SLIDER_MOVES = 5
+TABLE_PAGES = 3
+
+# how long to wait for one script run / one training job
+RERUN_TIMEOUT = 120
+JOB_TIMEOUT = 900
+
+# latencies below this are reported but never flagged - timer noise
+NOISE_FLOOR_MS = 20.0
+
+ACTIONS = ["login", "navigate", "upload", "train_click", "insights", "table_page", "slider"]
+
+
+def app_users(path=APP_PATH):
+    """The USERS accounts of app.py, read without running the script."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "USERS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No USERS in {path}")
+
+
+# ------------------------------------------------
+# SERVER
+# ------------------------------------------------
+def process_rss_bytes(pid):
+    """Resident memory of another process (Linux /proc), 0 if unknown."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class ServerRss:
+    """Polls the server's RSS on a thread to catch the peak of one level."""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.start_bytes = process_rss_bytes(pid) if pid else 0
+        self.peak = self.start_bytes
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        if pid:
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, process_rss_bytes(self.pid))
+
+    def stop(self):
+        self._stop.set()
+        if self.pid:
+            self._thread.join()
+            self.end_bytes = process_rss_bytes(self.pid)
+            self.peak = max(self.peak, self.end_bytes)
+        else:
+            self.end_bytes = 0
+        return self.peak
+
+
+def start_server(port, artifacts_dir):
+    """`streamlit run app.py` on port with its own artifact dir -> Popen."""
+    env = dict(os.environ, STUDYTRACK_ARTIFACTS=artifacts_dir)
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            # the harness uploads without the browser's XSRF cookie
+            "--server.enableXsrfProtection", "false",
+            "--browser.gatherUsageStats", "false",
+        ],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://localhost:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server, url
+        except OSError:
+            time.sleep(0.2)
+        if server.poll() is not None:
+            break
+    server.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+# ------------------------------------------------
+# HEADLESS SESSION (WEBSOCKET CLIENT)
+# ------------------------------------------------
+# widget element kind -> WidgetState field carrying its value
+_VALUE_FIELDS = {
+    "text_input": "string_value",
+    "text_area": "string_value",
+    "radio": "string_value",
+    "selectbox": "string_value",
+    "checkbox": "bool_value",
+    "slider": "double_array_value",
+    "multiselect": "string_array_value",
+    "file_uploader": "file_uploader_state_value",
+}
+
+
+def value_field(kind, proto):
+    if kind == "number_input":
+        return "int_value" if proto.data_type == proto.INT else "double_value"
+    return _VALUE_FIELDS[kind]
+
+
+class Session:
+    """
+    One browser tab: keeps the widgets of the last script run and sends
+    their values with every rerun, like the frontend does.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.session_id = None
+        self.values = {}
+        self.elements = {}
+        self.fragment_of = {}
+        self.timers = {}
+        self.latencies = []
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(
+            self.url.replace("http", "ws", 1) + "/_stcore/stream", max_size=None
+        )
+        return await self.rerun("navigate")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    # ---------- ELEMENTS OF THE LAST RUN ----------
+    def widget(self, kind, label):
+        """(kind, proto) of the first widget of kind whose label contains label."""
+        for element in self.elements.values():
+            if element.WhichOneof("type") == kind and label in getattr(element, kind).label:
+                return kind, getattr(element, kind)
+        raise LookupError(f"No {kind} labelled {label!r} on the page")
+
+    def texts(self):
+        """Body text of every alert / markdown element."""
+        found = []
+        for element in self.elements.values():
+            kind = element.WhichOneof("type")
+            if kind in ("alert", "markdown"):
+                found.append(getattr(element, kind).body)
+        return found
+
+    def exceptions(self):
+        return [e.exception.message for e in self.elements.values() if e.WhichOneof("type") == "exception"]
+
+    # ---------- RERUNS ----------
+    def _state(self, widget_id, field, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        if field in ("double_array_value", "string_array_value"):
+            getattr(state, field).data.extend(value)
+        elif field == "file_uploader_state_value":
+            state.file_uploader_state_value.uploaded_file_info.add(**value)
+        else:
+            setattr(state, field, value)
+        return state
+
+    async def rerun(self, action, changes=(), trigger=None, fragment_id=""):
+        """
+        Send a rerun with the current widget values plus changes
+        [((kind, proto), value)] and an optional button (kind, proto) to
+        click; wait for the script to finish. A widget inside an
+        st.fragment reruns only that fragment, as in the browser.
+        Returns the latency in seconds.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        touched = list(changes) + ([(trigger, True)] if trigger is not None else [])
+        for (kind, proto), value in changes:
+            self.values[proto.id] = self._state(proto.id, value_field(kind, proto), value)
+        if touched and not fragment_id:
+            fragment_id = self.fragment_of.get(touched[0][0][1].id, "")
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(self._state(trigger[1].id, "trigger_value", True))
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+
+        deadline = started + RERUN_TIMEOUT
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), timeout=max(deadline - time.perf_counter(), 0.001))
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+
+            if kind == "new_session":
+                self.session_id = fwd.new_session.initialize.session_id or self.session_id
+                if not fwd.new_session.fragment_ids_this_run:
+                    # a full run replaces the page
+                    self.elements = {}
+                    self.fragment_of = {}
+                    self.timers = {}
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                self.elements[tuple(fwd.metadata.delta_path)] = element
+                widget_id = getattr(getattr(element, element.WhichOneof("type")), "id", "")
+                if widget_id and fwd.delta.fragment_id:
+                    self.fragment_of[widget_id] = fwd.delta.fragment_id
+            elif kind == "auto_rerun":
+                self.timers[fwd.auto_rerun.fragment_id] = fwd.auto_rerun.interval
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    # st.rerun() - the next run follows on its own
+                    continue
+                break
+
+        latency = time.perf_counter() - started
+        self.latencies.append((action, latency))
+
+        # only widgets still on the page keep a value
+        present = {
+            getattr(getattr(e, e.WhichOneof("type")), "id", None) for e in self.elements.values()
+        }
+        self.values = {wid: state for wid, state in self.values.items() if wid in present}
+        return latency
+
+    async def set(self, action, kind, label, value):
+        return await self.rerun(action, [(self.widget(kind, label), value)])
+
+    async def click(self, action, label):
+        return await self.rerun(action, trigger=self.widget("button", label))
+
+    async def upload(self, label, name, data):
+        """PUT a file to the uploader labelled label, then rerun with it."""
+        uploader = self.widget("file_uploader", label)
+        file_id = uuid.uuid4().hex
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+            f"Content-Type: text/csv\r\n\r\n"
+        ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+
+        started = time.perf_counter()
+        request = urllib.request.Request(
+            f"{self.url}/_stcore/upload_file/{self.session_id}/{file_id}", data=body, method="PUT",
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+        await asyncio.to_thread(lambda: urllib.request.urlopen(request, timeout=RERUN_TIMEOUT).close())
+        info = {"file_id": file_id, "name": name, "size": len(data)}
+        latency = await self.rerun("upload", [(uploader, info)])
+        self.latencies[-1] = ("upload", time.perf_counter() - started)
+        return latency
+
+    async def wait_for(self, text, timeout=JOB_TIMEOUT):
+        """Poll like the frontend's fragment timers until text shows up."""
+        deadline = time.perf_counter() + timeout
+        while not any(text in body for body in self.texts()):
+            errors = self.exceptions() + [b for b in self.texts() if b.startswith("❌")]
+            if errors:
+                raise RuntimeError(errors[0])
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"{text!r} did not show up in {timeout}s")
+            fragment_id, interval = next(iter(self.timers.items()), ("", 1.0))
+            await asyncio.sleep(interval)
+            await self.rerun("poll", fragment_id=fragment_id)
+
+
+# ------------------------------------------------
+# SCRIPTED SESSION
+# ------------------------------------------------
+def menu_label(session, page):
+    _, radio = session.widget("radio", "")
+    return next(option for option in radio.options if page in option)
+
+
+async def scripted_session(url, username, password, data, index, rng):
+    """One teacher's visit; returns the session's latencies and job times."""
+    session = Session(url)
+    result = {"user": username, "jobs": [], "error": None}
+    try:
+        await session.connect()
+
+        # ---------- LOGIN ----------
+        await session.rerun("login", [
+            (session.widget("text_input", "Username"), username),
+            (session.widget("text_input", "Password"), password),
+        ], trigger=session.widget("button", "Login"))
+
+        # ---------- UPLOAD + TRAIN ----------
+        await session.set("navigate", "radio", "", menu_label(session, "Model Training"))
+        await session.upload("Upload Student Dataset", f"students_{index}.csv", data)
+        started = time.perf_counter()
+        await session.click("train_click", "Train Model")
+        await session.wait_for("Model trained successfully")
+        result["jobs"].append(("train", time.perf_counter() - started))
+
+        # ---------- INSIGHTS ----------
+        await session.set("insights", "radio", "", menu_label(session, "Data Insights"))
+        page = session.widget("number_input", "Page")
+        for number in range(2, TABLE_PAGES + 1):
+            await session.rerun("table_page", [(page, number)])
+
+        # ---------- SLIDERS ----------
+        for page_name, sliders in (("Student", ["Study Hours", "Sleep Hours", "Attention Level"]),
+                                   ("Recommendation", ["Study Hours", "Play Hours", "Exercise"])):
+            await session.set("navigate", "radio", "", menu_label(session, page_name))
+            # live mode: every move rescores, like dragging in the browser
+            await session.set("navigate", "checkbox", "Live mode", True)
+            for _ in range(SLIDER_MOVES):
+                slider = session.widget("slider", sliders[int(rng.integers(len(sliders)))])
+                value = float(rng.integers(int(slider[1].min), int(slider[1].max) + 1))
+                await session.rerun("slider", [(slider, [value])])
+
+        if session.exceptions():
+            result["error"] = session.exceptions()[0]
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        await session.close()
+
+    result["latencies"] = [entry for entry in session.latencies if entry[0] != "poll"]
+    return result
+
+
+# ------------------------------------------------
+# RAMP
+# ------------------------------------------------
+def percentiles(seconds):
+    if not seconds:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ms = np.asarray(seconds) * 1000
+    return {
+        "count": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+async def run_level(url, sessions, datasets, users, seed):
+    accounts = list(users.items())
+    rng = np.random.default_rng(seed)
+    return await asyncio.gather(*[
+        scripted_session(url, *accounts[i % len(accounts)], datasets[i], i, np.random.default_rng(rng.integers(2**32)))
+        for i in range(sessions)
+    ])
+
+
+def summarize(results, seconds, rss, sessions):
+    latencies = [entry for result in results for entry in result["latencies"]]
+    jobs = [seconds_ for result in results for _, seconds_ in result["jobs"]]
+    by_action = {
+        action: percentiles([s for a, s in latencies if a == action])
+        for action in ACTIONS
+    }
+    growth = (rss.peak - rss.start_bytes) / 2**20
+    return {
+        "sessions": sessions,
+        "seconds": seconds,
+        "reruns": len(latencies),
+        "reruns_per_s": len(latencies) / seconds if seconds > 0 else None,
+        "rerun": percentiles([s for _, s in latencies]),
+        "actions": {action: stats for action, stats in by_action.items() if stats["count"]},
+        "train_job": percentiles(jobs),
+        "errors": [result["error"] for result in results if result["error"]],
+        "server_rss_start_mb": rss.start_bytes / 2**20,
+        "server_rss_peak_mb": rss.peak / 2**20,
+        "server_rss_end_mb": rss.end_bytes / 2**20,
+        "rss_per_session_mb": growth / sessions if rss.pid else None,
+    }
+
+
+# ------------------------------------------------
+# BASELINE COMPARISON
+# ------------------------------------------------
+def compare(results, baseline, tolerance):
+    """
+    Rows of (sessions, metric, baseline, current, ratio, regressed) for
+    the levels present in both runs.
+    """
+    rows = []
+    before_levels = {level["sessions"]: level for level in baseline.get("levels", [])}
+    for level in results["levels"]:
+        before = before_levels.get(level["sessions"])
+        if before is None:
+            continue
+        for metric, new, old, floor in (
+            ("rerun p95 ms", level["rerun"]["p95_ms"], before["rerun"]["p95_ms"], NOISE_FLOOR_MS),
+            ("train p95 ms", level["train_job"]["p95_ms"], before["train_job"]["p95_ms"], NOISE_FLOOR_MS),
+            ("MB / session", level["rss_per_session_mb"], before["rss_per_session_mb"], 1.0),
+        ):
+            if new is None or old is None:
+                continue
+            ratio = new / old if old > 0 else None
+            regressed = ratio is not None and ratio > 1 + tolerance and max(new, old) >= floor
+            rows.append((level["sessions"], metric, old, new, ratio, regressed))
+    return rows
+
+
+# ------------------------------------------------
+# MAIN
+# ------------------------------------------------
+def _ms(value):
+    return f"{value:>8.0f}" if value is not None else f"{'-':>8}"
+
+
+def report(results):
+    print()
+    print(f"{'sessions':>8} {'reruns':>7} {'rerun/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'train p95':>10} {'peak MB':>8} {'MB/sess':>8} {'errors':>6}")
+    print("-" * 91)
+    for level in results["levels"]:
+        rerun = level["rerun"]
+        per_session = level["rss_per_session_mb"]
+        print(f"{level['sessions']:>8} {level['reruns']:>7} {level['reruns_per_s'] or 0:>8.1f} "
+              f"{_ms(rerun['p50_ms'])} {_ms(rerun['p95_ms'])} {_ms(rerun['p99_ms'])} "
+              f"{_ms(level['train_job']['p95_ms']):>10} {level['server_rss_peak_mb']:>8.0f} "
+              f"{per_session if per_session is not None else float('nan'):>8.1f} {len(level['errors']):>6}")
+    print("-" * 91)
+
+    print()
+    print(f"{'sessions':>8} {'action':<12} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for level in results["levels"]:
+        for action, stats in level["actions"].items():
+            print(f"{level['sessions']:>8} {action:<12} {stats['count']:>6} "
+                  f"{_ms(stats['p50_ms'])} {_ms(stats['p95_ms'])} {_ms(stats['p99_ms'])}")
+
+    for level in results["levels"]:
+        for error in level["errors"][:3]:
+            print(f"\n{level['sessions']} sessions - error: {error}")
+
+
+def report_comparison(rows, tolerance):
+    print()
+    print(f"vs baseline (tolerance {tolerance:.0%})")
+    print(f"{'sessions':>8} {'metric':<13} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    print("-" * 52)
+    for sessions, metric, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{sessions:>8} {metric:<13} {old:>10.1f} {new:>10.1f} {ratio_text}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a StudyTrack AI server with concurrent sessions.")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS,
+                        help=f"comma-separated concurrency levels (default {DEFAULT_SESSIONS})")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="students per uploaded CSV")
+    parser.add_argument("--shared-data", action="store_true",
+                        help="every session uploads the same CSV (exercises the shared dataset cache)")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data / slider seed")
+    parser.add_argument("--url", help="existing server to test instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="pid of the --url server, for its memory")
+    parser.add_argument("--port", type=int, default=8599, help="port of the started server")
+    parser.add_argument("--out", default="loadtest_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed growth of p95 latency / memory per session before it counts as a regression")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = [int(s) for s in args.sessions.split(",") if s.strip()]
+    except ValueError:
+        parser.error(f"--sessions must be numbers: {args.sessions}")
+    if importlib.util.find_spec("websockets") is None:
+        parser.error("the load test needs the websockets package (pip install websockets)")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    users = app_users()
+    print(f"generating {max(levels)} x {args.rows:,}-row CSVs...", flush=True)
+    datasets = [
+        synthetic_students(args.rows, args.seed if args.shared_data else args.seed + i,
+                           0 if args.shared_data else i * args.rows).to_csv(index=False).encode("utf-8")
+        for i in range(1 if args.shared_data else max(levels))
+    ]
+    datasets = datasets * max(levels) if args.shared_data else datasets
+
+    server, workdir = None, None
+    url, pid = args.url, args.server_pid
+    if url is None:
+        workdir = tempfile.mkdtemp(prefix="studytrack-load-")
+        server, url = start_server(args.port, os.path.join(workdir, "artifacts"))
+        pid = server.pid
+        print(f"server started on {url} (pid {pid})", flush=True)
+
+    results = {
+        "environment": environment(),
+        "rows": args.rows,
+        "shared_data": args.shared_data,
+        "seed": args.seed,
+        "levels": [],
+    }
+    try:
+        # one uncounted visit first: the server's imports and first-run
+        # caches are not per-session memory
+        print("warming up...", flush=True)
+        warmup = synthetic_students(min(args.rows, 1000), args.seed + max(levels) + 1).to_csv(index=False)
+        asyncio.run(run_level(url, 1, [warmup.encode("utf-8")], users, args.seed))
+
+        for sessions in levels:
+            print(f"{sessions} concurrent session(s)...", flush=True)
+            rss = ServerRss(pid)
+            started = time.perf_counter()
+            level = asyncio.run(run_level(url, sessions, datasets, users, args.seed))
+            seconds = time.perf_counter() - started
+            rss.stop()
+            results["levels"].append(summarize(level, seconds, rss, sessions))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    report(results)
+    print(f"\nResults written to {args.out}")
+
+    failed = any(level["errors"] for level in results["levels"])
+    if baseline is None:
+        return 1 if failed else 0
+
+    rows = compare(results, baseline, args.tolerance)
+    report_comparison(rows, args.tolerance)
+    regressions = [r for r in rows if r[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    print("\nNo regressions.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+StudyTrack AI - lightweight timing and memory spans for the hot paths.
+
+    with span("score") as s:
+        df = score(df, formula)
+        s.rows = len(df)
+
+Each span records wall time, rows processed and the change in resident
+memory. Spans opened during a Streamlit rerun are grouped under that rerun
+(see start_run / end_run) for the admin panel; all spans also feed
+per-name totals that can be exported in Prometheus text format, to a file
+(STUDYTRACK_METRICS_FILE) and/or an HTTP endpoint (STUDYTRACK_METRICS_PORT).
+
+Set STUDYTRACK_METRICS=0 to turn recording off; span() then hands back a
+shared no-op object and costs one function call. The switch (and the
+admin toggle for it, set_enabled) applies to the whole server process.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# reruns kept for the admin panel
+KEEP_RUNS = 20
+
+_enabled = os.environ.get("STUDYTRACK_METRICS", "1") != "0"
+_lock = threading.Lock()
+_local = threading.local()
+_runs = deque(maxlen=KEEP_RUNS)
+
+# span name -> {"count", "seconds", "rows", "mem_bytes", "max_seconds"}
+_totals = {}
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(on):
+    """Turn recording on or off for every session of this process."""
+    global _enabled
+    _enabled = bool(on)
+
+
+# ------------------------------------------------
+# MEMORY
+# ------------------------------------------------
+def peak_rss_bytes():
+    """Lifetime peak resident set size of this process."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_bytes():
+    """Current resident set size (falls back to the peak without procfs)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_bytes()
+
+
+# ------------------------------------------------
+# SPANS
+# ------------------------------------------------
+class _Span:
+    __slots__ = ("name", "rows", "_start", "_mem")
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._mem = rss_bytes()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter() - self._start, self.rows, rss_bytes() - self._mem)
+        return False
+
+
+class _NoSpan:
+    """Stand-in while recording is off; attribute writes are dropped."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, rows=None):
+    """Context manager timing one stage; set .rows inside if not known yet."""
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, rows)
+
+
+def _record(name, seconds, rows, mem_bytes):
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run["spans"].append({"name": name, "seconds": seconds, "rows": rows, "mem_bytes": mem_bytes})
+
+    with _lock:
+        total = _totals.get(name)
+        if total is None:
+            total = _totals[name] = {"count": 0, "seconds": 0.0, "rows": 0, "mem_bytes": 0, "max_seconds": 0.0}
+        total["count"] += 1
+        total["seconds"] += seconds
+        total["rows"] += rows or 0
+        total["mem_bytes"] += mem_bytes
+        total["max_seconds"] = max(total["max_seconds"], seconds)
+
+
+# ------------------------------------------------
+# RERUNS
+# ------------------------------------------------
+def start_run(page, user=None):
+    """Group the spans of this thread's script run until end_run()."""
+    if not _enabled:
+        _local.run = None
+        return
+    _local.run = {
+        "page": page,
+        "user": user,
+        "started": time.time(),
+        "_start": time.perf_counter(),
+        "spans": [],
+    }
+
+
+def end_run():
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if run is None:
+        return
+    run["seconds"] = time.perf_counter() - run.pop("_start")
+    with _lock:
+        _runs.append(run)
+    if EXPORT_FILE:
+        write_prometheus(EXPORT_FILE)
+
+
+def recent_runs(n=KEEP_RUNS):
+    """Last n finished reruns, newest first."""
+    with _lock:
+        return list(_runs)[-n:][::-1]
+
+
+def totals():
+    with _lock:
+        return {name: dict(total) for name, total in _totals.items()}
+
+
+def reset():
+    with _lock:
+        _runs.clear()
+        _totals.clear()
+
+
+# ------------------------------------------------
+# PROMETHEUS EXPORT
+# ------------------------------------------------
+EXPORT_FILE = os.environ.get("STUDYTRACK_METRICS_FILE")
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """Per-span totals in the Prometheus text exposition format."""
+    series = [
+        ("studytrack_span_calls_total", "counter", "Spans recorded.", "count"),
+        ("studytrack_span_seconds_total", "counter", "Wall time spent in the span.", "seconds"),
+        ("studytrack_span_seconds_max", "gauge", "Slowest single span.", "max_seconds"),
+        ("studytrack_span_rows_total", "counter", "Rows processed in the span.", "rows"),
+        ("studytrack_span_memory_bytes_total", "counter", "Resident memory change over the span.", "mem_bytes"),
+    ]
+    current = totals()
+
+    lines = []
+    for metric, kind, help_text, field in series:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name in sorted(current):
+            lines.append(f'{metric}{{span="{_label(name)}"}} {current[name][field]}')
+
+    lines.append("# HELP studytrack_process_resident_memory_bytes Resident memory of the app process.")
+    lines.append("# TYPE studytrack_process_resident_memory_bytes gauge")
+    lines.append(f"studytrack_process_resident_memory_bytes {rss_bytes()}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Write prometheus_text() atomically, e.g. for node_exporter's textfile collector."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+_server = None
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread (once per process)."""
+    global _server
+    if _server is not None:
+        return _server
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    _server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+if os.environ.get("STUDYTRACK_METRICS_PORT"):
+    try:
+        serve(int(os.environ["STUDYTRACK_METRICS_PORT"]))
+    except OSError:
+        # another process already serves the port
+        pass
@@ -0,0 +1,22 @@
+"""
+StudyTrack AI - Documentation page.
+"""
+
+import streamlit as st
+
+from assets import image
+
+
+# ------------------------------------------------
+# DOCUMENTATION PAGE (FULL WORKFLOW)
+# ------------------------------------------------
+def render():
+    st.title("📄 Model Workflow Documentation")
+
+    st.markdown("### StudyTrack AI – Workflow")
+
+    # OPTION 1: Local image (recommended)
+    st.image(
+        image("image2.png", 600),   # resized copy of Image2.png, see assets.py
+        width=600
+    )
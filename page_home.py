@@ -0,0 +1,49 @@
+"""
+StudyTrack AI - Home page.
+"""
+
+import streamlit as st
+
+from assets import image
+
+
+# ------------------------------------------------
+# HOME PAGE (UNCHANGED)
+# ------------------------------------------------
+def render():
+
+    col1, col2 = st.columns([0.7, 9.3])
+
+    with col2:
+        st.markdown("<div class='main-title'> 🚀StudyTrack AI </div>", unsafe_allow_html=True)
+        st.markdown(
+            "<div class='sub-title'>Tracking, Predicting, and Improving Student Performance</div>",
+            unsafe_allow_html=True
+        )
+
+    st.divider()
+
+    st.markdown("<div class='section-title'>Project Overview</div>", unsafe_allow_html=True)
+
+    st.write("""
+    **StudyTrack AI – Personal Dashboard** analyzes student academic data using multiple
+    behavioral and lifestyle parameters to generate insights, predictions, and
+    personalized recommendations.
+    The system supports CSV uploads, interactive dashboards, and AI-based performance prediction to help students
+     make data-driven decisions.
+    """)
+
+    st.image(
+        image("images.png"),
+        use_container_width=True
+    )
+
+    st.markdown("<div class='section-title'>Project Objectives</div>", unsafe_allow_html=True)
+
+    st.markdown("""
+    - Analyze student performance using multiple parameters  
+    - Predict academic outcomes  
+    - Provide personalized recommendations  
+    - Visualize academic trends  
+    - Enable data-driven decision making  
+    """)
@@ -0,0 +1,223 @@
+"""
+StudyTrack AI - Data Insights page.
+"""
+
+import os
+
+import plotly.express as px
+import streamlit as st
+
+from charts import actual_vs_predicted, density_figure, is_large, study_scatter
+from datasets import EXPORT_FORMATS, EXPORT_TYPES, encode_dataset
+from engine import DATA_ROOT, ENGINES, preview_rows, scan_density, scan_insights, scored_sources
+from insights import average_marks_by_study, column_mean, correlation, level_distribution, top_student
+from metrics import span
+from state import trained_chart, trained_frame, trained_insights, trained_view
+from tables import paged_table
+
+
+# ------------------------------------------------
+# DATA INSIGHTS
+# ------------------------------------------------
+def render():
+    st.title("📊 Data Insights Dashboard")
+
+    # scored datasets too large for memory are aggregated on disk
+    sources = scored_sources() if ENGINES else []
+    if sources:
+        source = st.radio(
+            "Data source", ["Trained model", "Scored files on disk"],
+            horizontal=True, key="insights_source"
+        )
+        if source == "Scored files on disk":
+            render_scanned(sources)
+            return
+
+    # CHECK IF MODEL IS TRAINED (OR SAVED FROM AN EARLIER SESSION)
+    df = trained_frame()
+    if df is None:
+        st.warning("⚠️ Please upload data and train the model first.")
+    else:
+        meta = st.session_state.get("artifact_meta")
+        if meta:
+            st.info(f"📦 Loaded saved model {meta['version']} ({meta['rows']:,} rows, trained {meta['created']}).")
+
+        # bundle is built at training time; rebuilt here only if the frame
+        # was spilled out of memory since
+        bundle = trained_insights(df)
+
+        st.success("✅ Data loaded successfully for insights!")
+
+        # -----------------------------
+        # DATA PREVIEW
+        # -----------------------------
+        st.subheader("📄 Trained Data")
+        paged_table(df, "insights_table")
+        st.subheader("⬇️ Download Trained Model Data")
+
+        export_format = st.selectbox("Format", EXPORT_FORMATS, key="insights_export_format")
+        export_ext, export_mime = EXPORT_TYPES[export_format]
+
+        # encoded only when the button is clicked, never kept in the bundle
+        st.download_button(
+           label=f"📥 Download Trained Dataset ({export_format})",
+           data=lambda: encode_dataset(df, export_format),
+           file_name=f"studytrack_trained_data.{export_ext}",
+           mime=export_mime
+        )
+
+        # -----------------------------
+        # 1️⃣ Study Hours vs Predicted Marks (FIXED)
+        # -----------------------------
+        st.subheader("🎯 Study Hours vs Predicted Marks")
+
+        # large datasets: WebGL + density grid or outlier-preserving sample
+        scatter_mode = "Sample"
+        if is_large(df):
+            scatter_mode = st.radio(
+                f"Large dataset ({len(df):,} students) - show",
+                ["Sample", "Density"],
+                horizontal=True,
+                key="insights_scatter_mode"
+            )
+
+        def build_scatter():
+            with span(f"chart.scatter.{scatter_mode.lower()}", rows=len(df)):
+                return study_scatter(df, scatter_mode)
+
+        fig1 = trained_chart(("scatter", scatter_mode), build_scatter)
+        with span("chart.render.scatter"):
+            st.plotly_chart(fig1, use_container_width=True)
+
+        bundle_charts(bundle)
+
+        # -----------------------------
+        # 5️⃣ Actual vs Predicted Marks
+        # -----------------------------
+        st.subheader("📈 Actual vs Predicted Marks")
+
+        # Check required columns
+        required_cols = ["Final_Marks", "Predicted_Marks"]
+        missing = [c for c in required_cols if c not in df.columns]
+
+        if missing:
+           st.warning("⚠️ Actual marks not available to compare.")
+        else:
+           # a renamed view (the columns are shared with df, not copied),
+           # built once so the table's sort and query caches keep hitting
+           compare_df = trained_view("compare", lambda: df[required_cols].rename(
+               columns={"Final_Marks": "Actual Marks", "Predicted_Marks": "Predicted Marks"}
+           ))
+
+        # Show table
+           paged_table(compare_df, "compare_table")
+
+        # Line chart (LTTB-downsampled for large datasets)
+           def build_compare():
+               with span("chart.compare", rows=len(compare_df)):
+                   return actual_vs_predicted(compare_df)
+
+           fig5 = trained_chart("compare", build_compare)
+           with span("chart.render.compare"):
+               st.plotly_chart(fig5, use_container_width=True)
+
+        st.divider()
+        key_insights(bundle)
+
+
+def render_scanned(sources):
+    """Insights for scored files under DATA_ROOT; only aggregates are loaded."""
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        name = st.selectbox("Scored dataset", sources, key="insights_scan_source")
+    with c2:
+        engine = st.selectbox("Engine", ENGINES, key="insights_scan_engine")
+    path = os.path.join(DATA_ROOT, name)
+
+    with st.spinner(f"Aggregating {name} with {engine}..."):
+        bundle = scan_insights(path, engine)
+    st.success(f"✅ {bundle['rows']:,} rows aggregated on disk ({engine} engine).")
+
+    st.subheader("📄 First Rows")
+    paged_table(preview_rows(path), "scan_preview_table")
+
+    st.subheader("🎯 Study Hours vs Predicted Marks")
+    density = scan_density(path, bundle, engine)
+    if density is None:
+        st.warning("⚠️ Study_Hours / Predicted_Marks not available.")
+    else:
+        with span("chart.render.scatter"):
+            st.plotly_chart(density_figure(*density), use_container_width=True)
+
+    bundle_charts(bundle)
+
+    st.divider()
+    key_insights(bundle)
+
+
+def bundle_charts(bundle):
+    """Bar, pie and correlation charts, drawn from the insights bundle only."""
+    # -----------------------------
+    # 2️⃣ Average Predicted Marks by Study Hours
+    # -----------------------------
+    st.subheader("📊 Average Predicted Marks by Study Hours")
+
+    avg_df = average_marks_by_study(bundle)
+
+    with span("chart.bar", rows=len(avg_df)):
+        fig2 = px.bar(
+            avg_df,
+            x="Study_Hours",
+            y="Predicted_Marks",
+            color="Predicted_Marks"
+        )
+        st.plotly_chart(fig2, use_container_width=True)
+
+    # -----------------------------
+    # 3️⃣ Performance Level Distribution (PIE CHART)
+    # -----------------------------
+    st.subheader("🥧 Performance Level Distribution")
+
+    perf_df = level_distribution(bundle)
+
+    with span("chart.pie", rows=len(perf_df)):
+        fig3 = px.pie(
+            perf_df,
+            names="Performance_Level",
+            values="Count",
+            title="Distribution of Student Performance Levels"
+        )
+        st.plotly_chart(fig3, use_container_width=True)
+
+    # -----------------------------
+    # 4️⃣ Correlation Heatmap
+    # -----------------------------
+    st.subheader("🔥 Correlation Heatmap")
+
+    corr = correlation(bundle)
+
+    with span("chart.heatmap", rows=len(corr)):
+        fig4 = px.imshow(
+            corr,
+            text_auto=True,
+            color_continuous_scale="RdBu"
+        )
+        st.plotly_chart(fig4, use_container_width=True)
+
+
+def key_insights(bundle):
+    """Summary bullets from the bundle."""
+    st.subheader("💡 Key Insights Summary")
+
+    avg_study = column_mean(bundle, "Study_Hours")
+    avg_marks = column_mean(bundle, "Predicted_Marks")
+    avg_attention = column_mean(bundle, "Attention_Level")
+
+    topper = top_student(bundle) or "N/A"
+
+    st.markdown(f"""
+    - 📘 **Average Study Hours:** {avg_study:.2f} hrs/day  
+    - 🎯 **Average Predicted Marks:** {avg_marks:.2f}%  
+    - 🏆 **Top Performing Student:** {topper}  
+    - 🧠 **Average Attention Level:** {avg_attention:.2f}  
+    """)
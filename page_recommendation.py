@@ -0,0 +1,151 @@
+"""
+StudyTrack AI - Recommendation page.
+"""
+
+import streamlit as st
+
+from ranking import ranking_panel
+from scoring import score_one
+from state import trained_frame, trained_ranking
+from tables import paged_table
+from whatif import explorer_panel
+
+
+# ------------------------------------------------
+# RECOMMENDATION PAGE (LOGIC BASED ON PARAMETERS)
+
+# RECOMMENDATION PAGE (COMBINED)
+# ------------------------------------------------
+@st.fragment
+def single_recommendation():
+    """Slider panel, rerun on its own so the trained table below is not re-run."""
+    st.subheader("🧍 Single Student Recommendation")
+
+    student_name = st.text_input("Student Name", key="recommendation_student_name")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        study_hours = st.slider("📘 Study Hours", 0, 12, 5)
+        play_hours = st.slider("🎮 Play Hours", 0, 6, 2)
+
+    with col2:
+        sleep_hours = st.slider("😴 Sleep Hours", 0, 10, 7)
+        social_media = st.slider("📱 Social Media Hours", 0, 6, 2)
+
+    with col3:
+        exercise = st.slider("🏃 Exercise (hrs/week)", 0, 7, 3)
+        attention = st.slider("🧠 Attention Level", 0, 10, 7)
+
+    # live mode: every slider move rescores (only this fragment reruns)
+    live = st.toggle("⚡ Live mode", key="recommendation_live_mode", help="Update the result as the sliders move.")
+    if live or st.button("Generate Recommendation"):
+
+        # ---------- Prediction Logic ----------
+        predicted_marks, _ = score_one(
+            "recommendation",
+            Study_Hours=study_hours,
+            Sleep_Hours=sleep_hours,
+            Attention_Level=attention,
+            Exercise=exercise,
+            Play_Hours=play_hours,
+            Social_Media_Hours=social_media
+        )
+
+        # ---------- Recommendation Logic ----------
+        rec = []
+
+        if predicted_marks >= 85:
+            rec.append("Maintain current study routine")
+            if attention < 7:
+                rec.append("Improve focus consistency")
+            if sleep_hours < 7:
+                rec.append("Ensure adequate sleep")
+            if social_media > 3:
+                rec.append("Limit social media usage")
+
+        elif predicted_marks >= 55:
+            rec.append("Increase academic consistency")
+            if study_hours < 6:
+                rec.append("Increase study hours")
+            if attention < 6:
+                rec.append("Reduce distractions and improve focus")
+            if play_hours > 3:
+                rec.append("Balance play time with study")
+            if sleep_hours < 7:
+                rec.append("Improve sleep routine")
+
+        else:
+            rec.append("Immediate academic improvement required")
+            if study_hours < 6:
+                rec.append("Significantly increase study hours")
+            if sleep_hours < 7:
+                rec.append("Improve sleep routine")
+            if attention < 6:
+                rec.append("Work on concentration techniques")
+            if social_media > 3:
+                rec.append("Reduce social media usage")
+            if play_hours > 3:
+                rec.append("Reduce play hours and focus on academics")
+
+        # ---------- OUTPUT ----------
+        st.success(f"Recommendation generated for {student_name}")
+        st.write(f"**Predicted Marks:** {predicted_marks:.2f}")
+        st.info(" | ".join(rec))
+
+    explorer_panel("recommendation", {
+        "Study_Hours": study_hours,
+        "Sleep_Hours": sleep_hours,
+        "Attention_Level": attention,
+        "Exercise": exercise,
+        "Play_Hours": play_hours,
+        "Social_Media_Hours": social_media,
+    }, key="recommendation_whatif")
+
+
+@st.fragment
+def student_rankings():
+    """Lookup / leaderboard / at-risk panel, rerun on its own."""
+    df = trained_frame()
+    if df is None or "Predicted_Marks" not in df.columns:
+        return
+    ranking_panel(df, trained_ranking(df), key="recommendation_ranking")
+
+
+def render():
+    st.title("📈 AI-Based Student Recommendations")
+
+    # =====================================================
+    # 🔹 PART 1: SINGLE STUDENT RECOMMENDATION
+    # =====================================================
+    single_recommendation()
+
+    # =====================================================
+    # 🔹 PART 2: TRAINED MODEL RECOMMENDATIONS (NO PERFORMANCE)
+    # =====================================================
+    st.divider()
+    st.subheader("📄 Trained Model – Student Recommendations")
+
+    df = trained_frame()
+    if df is None:
+        st.warning("⚠️ Please upload data and train the model first.")
+    else:
+        show_cols = [
+            "Student_Name",
+            "Predicted_Marks",
+            "Recommendation"
+        ]
+
+        for col in show_cols:
+            if col not in df.columns:
+                st.error(f"❌ Missing column: {col}")
+                st.stop()
+
+        paged_table(df, "recommendation_table", show_cols)
+
+    # =====================================================
+    # 🔹 PART 3: RANKINGS / AT-RISK STUDENTS
+    # =====================================================
+    if df is not None:
+        st.divider()
+        student_rankings()
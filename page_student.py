@@ -0,0 +1,299 @@
+"""
+StudyTrack AI - Student page.
+"""
+
+import io
+
+import plotly.express as px
+import streamlit as st
+import pandas as pd
+
+from bulk import DEFAULT_CHUNK_ROWS, read_result, stream_predictions
+from cache import CACHE
+from datasets import EXPORT_FORMATS, EXPORT_TYPES, STUDENT_COLUMNS, UPLOAD_TYPES, dataset_format, encode_dataset, read_dataset
+from history import student_history
+from pipeline import BULK_REQUIRED, missing_columns, predict_bulk
+from scoring import formula_version, score_one
+from state import active_job, finished_job, job_progress, show_job_outcome, start_job, upload_key
+from tables import paged_table
+from whatif import explorer_panel
+
+# head of a streamed upload parsed for its preview
+PREVIEW_BYTES = 64 * 1024
+
+
+# ------------------------------------------------
+# BULK PREDICTION JOBS (WORKER THREAD - NO STREAMLIT CALLS)
+# ------------------------------------------------
+def run_bulk(job, username, bulk_df, bulk_key, name):
+    """Score an upload against the user's history store (see jobs.py)."""
+    # ---------- PREDICT MARKS (NO PREVIOUS MARKS) + PERFORMANCE LEVEL ----------
+    # only students that are new or whose numbers changed since the
+    # last upload are scored; every run is added to their history
+    job.update(0.1, "Scoring new and changed students")
+    result_df, run = student_history(username).rescore(
+        bulk_df, "bulk", source=name, source_key=bulk_key
+    )
+    CACHE.put(("bulk", bulk_key, formula_version("bulk")), result_df)
+
+    # remember which upload was scored so paging / sorting the table
+    # doesn't lose it; the frame itself stays in the shared store
+    return {"session": {"bulk_result": bulk_key}, "run": run}
+
+
+def run_bulk_stream(job, source, chunk_rows):
+    """Score a CSV chunk by chunk; every chunk reports progress and can cancel."""
+    size = max(source.size, 1)
+    source.seek(0)
+
+    def show_progress(summary, preview):
+        job.update(
+            min(source.tell() / size, 1.0),
+            f"Scored {summary['rows']:,} students in {summary['chunks']} chunks",
+            levels=dict(summary["levels"])
+        )
+
+    result_file, summary = stream_predictions(
+        source, BULK_REQUIRED, "bulk", chunksize=chunk_rows, on_chunk=show_progress
+    )
+    # keep the spooled result for the download button across reruns
+    return {"session": {"bulk_stream_result": result_file}, "summary": summary}
+
+
+def level_counts(levels):
+    st.dataframe(
+        pd.DataFrame({
+            "Performance_Level": list(levels),
+            "Count": list(levels.values())
+        }),
+        hide_index=True
+    )
+
+
+def running_level_counts(details):
+    # per-level counts so far, refreshed with the progress bar
+    if "levels" in details:
+        level_counts(details["levels"])
+
+
+def bulk_job_status():
+    """Progress of the running bulk job, or the outcome of the finished one."""
+    if active_job("bulk") is not None:
+        job_progress("bulk", running_level_counts)
+        return
+
+    job = finished_job("bulk")
+    if job is None or not show_job_outcome(job):
+        return
+
+    if "summary" in job.result:
+        summary = job.result["summary"]
+        st.success(f"✅ Bulk prediction completed for {summary['rows']:,} students")
+        if summary["rows"]:
+            st.write(f"**Average Predicted Marks:** {summary['marks_sum'] / summary['rows']:.2f}")
+        level_counts(summary["levels"])
+    else:
+        run = job.result["run"]
+        st.success("✅ Bulk prediction completed successfully")
+        st.caption(
+            f"{run['rescored']:,} of {run['rows']:,} students scored "
+            f"({run['new']:,} new, {run['reused']:,} unchanged since the last upload)."
+        )
+
+
+# ------------------------------------------------
+# STUDENT PAGE (MULTI-PARAMETERS ADDED HERE)
+# ------------------------------------------------
+@st.fragment
+def individual_prediction():
+    """Slider panel, rerun on its own so the bulk section below is not re-run."""
+    st.subheader("🧍 Individual Student Prediction")
+
+    name = st.text_input("Student Name", key="student_name_input")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        study_hours = st.slider("📘 Study Hours", 0, 12, 5)
+        play_hours = st.slider("🎮 Play Hours", 0, 6, 2)
+
+    with col2:
+        sleep_hours = st.slider("😴 Sleep Hours", 0, 10, 7)
+        social_media = st.slider("📱 Social Media Hours", 0, 6, 2)
+
+    with col3:
+        exercise = st.slider("🏃 Exercise (hrs/week)", 0, 7, 3)
+        attention = st.slider("🧠 Attention Level", 0, 10, 7)
+
+    # live mode: every slider move rescores (only this fragment reruns)
+    live = st.toggle("⚡ Live mode", key="student_live_mode", help="Update the result as the sliders move.")
+    if live or st.button("Analyze Individual Student"):
+        # -------- Prediction Logic + Performance Level --------
+        predicted_marks, performance = score_one(
+            "individual",
+            Study_Hours=study_hours,
+            Sleep_Hours=sleep_hours,
+            Social_Media_Hours=social_media,
+            Attention_Level=attention,
+            Exercise=exercise
+        )
+
+        # -------- OUTPUT (NO RECOMMENDATION HERE) --------
+        st.success(f"Analysis completed for {name}")
+        st.markdown("### 📊 Prediction Result")
+        st.write(f"**Predicted Marks:** {predicted_marks:.2f}")
+        st.write(f"**Performance Level:** {performance}")
+
+        st.markdown("### 📥 Parameters Used")
+        st.write(f"""
+        - Study Hours: {study_hours}  
+        - Play Hours: {play_hours}  
+        - Sleep Hours: {sleep_hours}  
+        - Social Media Usage: {social_media}  
+        - Exercise: {exercise}  
+        - Attention Level: {attention}  
+        """)
+
+    explorer_panel("individual", {
+        "Study_Hours": study_hours,
+        "Sleep_Hours": sleep_hours,
+        "Social_Media_Hours": social_media,
+        "Attention_Level": attention,
+        "Exercise": exercise,
+    }, key="student_whatif")
+
+
+@st.fragment
+def student_trend():
+    """Predicted marks of one student across the bulk uploads."""
+    store = student_history(st.session_state.username)
+    if not store.runs:
+        return
+
+    st.divider()
+    st.subheader("📈 Student Trend")
+
+    with st.expander("Upload history"):
+        st.dataframe(store.runs_frame(), hide_index=True)
+
+    student_id = st.text_input("Student ID", key="trend_student_id")
+    if not student_id:
+        return
+
+    history = store.history(student_id)
+    if history.empty:
+        st.warning(f"No predictions recorded for Student ID {student_id}.")
+        return
+
+    # an entry is only logged when the marks are re-scored, so the line
+    # holds each value until the next change
+    fig = px.line(
+        history, x="Date", y="Predicted_Marks", markers=True, line_shape="hv",
+        hover_data=["Run", "Performance_Level"]
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(history, hide_index=True)
+
+
+def render():
+    st.title("🎓 Student Analysis")
+
+    # =====================================================
+    # 🔹 PART 1: INDIVIDUAL STUDENT PREDICTION (NO RECOMMENDATION)
+    # =====================================================
+    individual_prediction()
+
+# =====================================================
+# 🔹 PART 2: BULK STUDENT PREDICTION (UPDATED)
+# =====================================================
+    st.divider()
+    st.subheader("📂 Bulk Student Prediction (CSV Upload)")
+
+    bulk_file = st.file_uploader(
+        "Upload Student CSV (or Parquet / Feather) for Bulk Prediction",
+        type=UPLOAD_TYPES
+    )
+
+    stream_mode = st.checkbox(
+        "⚡ Streaming mode (large files)",
+        help="Reads and scores the CSV in chunks so memory stays bounded. "
+             "Only a preview and summary counts are shown."
+    )
+
+    if bulk_file and stream_mode and dataset_format(bulk_file.name) == "csv":
+        # read the head through its own view: the running job owns the cursor
+        preview_df = pd.read_csv(io.BytesIO(bulk_file.getbuffer()[:PREVIEW_BYTES]), nrows=5)
+
+        st.subheader("📄 Uploaded Data Preview")
+        st.dataframe(preview_df)
+
+        chunk_rows = st.number_input(
+            "Rows per chunk", min_value=1_000, max_value=1_000_000,
+            value=DEFAULT_CHUNK_ROWS, step=10_000
+        )
+
+        if st.button("Predict Bulk Data", disabled=active_job("bulk") is not None):
+            # the upload itself is the reader - no second copy of the file
+            start_job("bulk", run_bulk_stream, bulk_file, int(chunk_rows), label="Bulk Prediction")
+
+        bulk_job_status()
+
+        if "bulk_stream_result" in st.session_state:
+            result_file = st.session_state["bulk_stream_result"]
+
+            # served from the spooled file, and only when the button is clicked
+            st.download_button(
+                "⬇️ Download Bulk Prediction Result",
+                lambda: read_result(result_file),
+                "bulk_student_predictions.csv",
+                "text/csv"
+            )
+
+    elif bulk_file:
+        bulk_key = upload_key(bulk_file)
+        bulk_df = CACHE.get_or_compute(
+            ("parsed", bulk_key),
+            lambda: read_dataset(bulk_file, columns=STUDENT_COLUMNS)
+        )
+
+        st.subheader("📄 Uploaded Data Preview")
+        st.dataframe(bulk_df.head())
+
+        export_format = st.selectbox("Download format", EXPORT_FORMATS, key="bulk_export_format")
+
+        if st.button("Predict Bulk Data", disabled=active_job("bulk") is not None):
+
+            if missing_columns(bulk_df, BULK_REQUIRED):
+                st.error("❌ CSV missing required columns!")
+                st.stop()
+
+            # runs on a worker thread: reruns and page switches don't stop it
+            start_job("bulk", run_bulk, st.session_state.username, bulk_df, bulk_key, bulk_file.name,
+                      label="Bulk Prediction")
+
+        bulk_job_status()
+
+        if st.session_state.get("bulk_result") == bulk_key:
+            result_df = CACHE.get_or_compute(
+                ("bulk", bulk_key, formula_version("bulk")),
+                lambda: predict_bulk(bulk_df)
+            )
+
+            # ---------- SHOW RESULT (ONE PAGE AT A TIME) ----------
+            st.subheader("📊 Bulk Prediction Results")
+            paged_table(result_df, "bulk_table")
+
+            # ---------- DOWNLOAD (CSV / PARQUET / FEATHER) ----------
+            # encoded only when the button is clicked, not on every table rerun
+            export_ext, export_mime = EXPORT_TYPES[export_format]
+            st.download_button(
+                "⬇️ Download Bulk Prediction Result",
+                lambda: encode_dataset(result_df, export_format),
+                f"bulk_student_predictions.{export_ext}",
+                export_mime
+            )
+
+    # =====================================================
+    # 🔹 PART 3: STUDENT TREND (PREDICTIONS PER BULK UPLOAD)
+    # =====================================================
+    student_trend()
@@ -0,0 +1,188 @@
+"""
+StudyTrack AI - Model Training page.
+"""
+
+import copy
+import os
+
+import streamlit as st
+import pandas as pd
+
+from artifacts import save_artifact
+from cache import CACHE
+from datasets import STUDENT_COLUMNS, UPLOAD_TYPES, apply_schema, read_dataset
+from insights import build_insights, update_insights
+from pipeline import TRAINING_REQUIRED, missing_columns, train_dataset
+from scoring import FORMULAS, formula_version
+from state import (
+    active_job, finished_job, job_progress, show_job_outcome, start_job, trained_frame,
+    trained_insights_for, trained_ranking_for, upload_key
+)
+from trainer import TARGET, LeastSquaresTrainer, fit_cached
+
+
+# ------------------------------------------------
+# TRAINING JOB (WORKER THREAD - NO STREAMLIT CALLS)
+# ------------------------------------------------
+def run_training(job, username, df, file_key, fit_weights, previous=None):
+    """
+    The Train Model pipeline as a background job (see jobs.py).
+
+    previous: None, or (trained_key, frame, formula, trainer) of the
+              session's trained data when the rows are appended to it.
+    Returns the session keys to set, the saved artifact and the fit.
+    """
+    appending = previous is not None
+    if appending:
+        previous_key, previous_df, previous_formula, previous_trainer = previous
+
+    # ---------- WEIGHTS: FIXED OR FITTED ----------
+    # fixed weights live in scoring.FORMULAS["training"]
+    formula = "training"
+    if appending and previous_formula in FORMULAS:
+        formula = previous_formula
+
+    trainer = None
+    if fit_weights:
+        job.update(0.05, "Fitting weights")
+        if appending and previous_trainer is not None:
+            # fold only the new rows into the stored normal equations
+            trainer = copy.deepcopy(previous_trainer).fit(df)
+        elif appending:
+            trainer = LeastSquaresTrainer(TRAINING_REQUIRED).fit(previous_df).fit(df)
+        else:
+            trainer = fit_cached(file_key, df, TRAINING_REQUIRED)
+        formula = trainer.register()
+
+    # ---------- PREDICTION + PERFORMANCE LEVEL + RECOMMENDATION ----------
+    # thresholds live in recommendations.RECOMMENDATION_RULES
+    # keys are built from the upload hashes, so users appending the
+    # same files end up sharing one stored frame
+    job.update(0.2, "Scoring and recommendations")
+    if appending and fit_weights:
+        # new weights - rescore the old rows too
+        key = ("appended", previous_key, file_key, formula_version(formula))
+        df = CACHE.get_or_compute(key, lambda: train_dataset(
+            apply_schema(pd.concat([previous_df, df], ignore_index=True)), formula
+        ))
+        job.update(0.6, "Building insights")
+        insights = trained_insights_for(key, lambda: build_insights(df))
+    elif appending:
+        new_rows = CACHE.get_or_compute(
+            ("trained", file_key, formula_version(formula)),
+            lambda: train_dataset(df, formula)
+        )
+        old_bundle = trained_insights_for(previous_key, lambda: build_insights(previous_df))
+        key = ("appended", previous_key, file_key, formula_version(formula))
+        df = CACHE.get_or_compute(
+            key, lambda: apply_schema(pd.concat([previous_df, new_rows], ignore_index=True))
+        )
+        job.update(0.6, "Building insights")
+        insights = trained_insights_for(key, lambda: update_insights(old_bundle, new_rows, df))
+    else:
+        key = ("trained", file_key, formula_version(formula))
+        df = CACHE.get_or_compute(key, lambda: train_dataset(df, formula))
+        job.update(0.6, "Building insights")
+        insights = trained_insights_for(key, lambda: build_insights(df))
+
+    # ---------- RANKING INDEX (SORTED MARKS + ID / NAME LOOKUP) ----------
+    job.update(0.75, "Ranking students")
+    trained_ranking_for(key, df)
+
+    # ---------- PERSIST FOR FUTURE SESSIONS ----------
+    job.update(0.85, "Saving")
+    saved = save_artifact(username, df, insights, formula, key)
+
+    # ---------- TRAINED DATA FOR THE SESSION ----------
+    session = {"trained_key": key, "formula": formula, "artifact_meta": None}
+    if fit_weights:
+        session["trainer"] = trainer
+    elif not appending:
+        session["trainer"] = None
+
+    fit = None
+    if fit_weights:
+        intercept, weights = trainer.coefficients()
+        fit = {"metrics": trainer.metrics(), "features": trainer.features,
+               "intercept": intercept, "weights": weights}
+    return {"session": session, "saved": saved, "fit": fit}
+
+
+def show_training_result(result):
+    fit = result["fit"]
+    if fit is not None:
+        metrics = fit["metrics"]
+        st.subheader("📐 Fitted Weights")
+        st.write(
+            f"Fitted on **{metrics['rows']:,}** rows in **{metrics['fit_seconds'] * 1000:.1f} ms** — "
+            f"RMSE **{metrics['rmse']:.2f}**, R² **{metrics['r2']:.3f}**"
+        )
+        st.dataframe(pd.DataFrame({
+            "Feature": ["(intercept)"] + fit["features"],
+            "Fixed Weight": [0.0] + FORMULAS["training"]["weights"].tolist(),
+            "Fitted Weight": [fit["intercept"]] + fit["weights"].tolist()
+        }), hide_index=True)
+
+    st.success("✅ Model trained successfully using multiple parameters!")
+    if result["saved"]:
+        st.caption(f"💾 Saved as {os.path.basename(result['saved'])} — available after logout or restart.")
+
+
+# ------------------------------------------------
+# MODEL TRAINING (ONLY TEXT CLARIFIED)
+# ------------------------------------------------
+def render():
+    st.title("🧠 Model Training")
+    previous_df = trained_frame()
+
+    file = st.file_uploader("Upload Student Dataset (CSV, Parquet or Feather)", type=UPLOAD_TYPES)
+
+    if file:
+        file_key = upload_key(file)
+        df = CACHE.get_or_compute(
+            ("parsed", file_key),
+            lambda: read_dataset(file, columns=STUDENT_COLUMNS)
+        )
+
+        st.subheader("📄 Data Preview")
+        st.dataframe(df.head())
+
+        append_rows = False
+        if previous_df is not None:
+            append_rows = st.checkbox(
+                "➕ Append these rows to the current trained data",
+                help="Insights are updated from the new rows only."
+            )
+
+        fit_weights = False
+        if TARGET in df.columns:
+            fit_weights = st.checkbox(
+                f"📐 Fit the weights to {TARGET} (least squares)",
+                help="Replaces the fixed 0.35/0.20/0.20/0.15/0.10 weights with weights fitted in one pass over the data."
+            )
+
+        # one training job per session at a time
+        if st.button("Train Model", disabled=active_job("train") is not None):
+
+            # ---------- FEATURE SELECTION ----------
+            if missing_columns(df, TRAINING_REQUIRED):
+                st.error("❌ Dataset missing required columns!")
+                st.stop()
+
+            # runs on a worker thread: reruns and page switches don't stop it
+            previous = None
+            if append_rows and previous_df is not None:
+                previous = (
+                    st.session_state["trained_key"], previous_df,
+                    st.session_state.get("formula"), st.session_state.get("trainer")
+                )
+            start_job("train", run_training, st.session_state.username, df, file_key, fit_weights,
+                      previous, label="Train Model")
+
+    # ---------- PROGRESS / RESULT OF THE TRAINING JOB ----------
+    if active_job("train") is not None:
+        job_progress("train")
+    else:
+        job = finished_job("train")
+        if job is not None and show_job_outcome(job):
+            show_training_result(job.result)
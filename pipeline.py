@@ -0,0 +1,47 @@
+"""
+StudyTrack AI - the Train Model and Bulk Prediction pipelines.
+
+Plain functions with no Streamlit dependency, so the pages, the cache
+layer and batch jobs all run exactly the same steps.
+"""
+
+from metrics import span
+from recommendations import generate_recommendations
+from scoring import score
+
+# ---------- REQUIRED COLUMNS ----------
+TRAINING_REQUIRED = [
+    "Study_Hours",
+    "Sleep_Hours",
+    "Attendance_Percentage",
+    "Attention_Level",
+    "Previous_Marks"
+]
+
+BULK_REQUIRED = [
+    "Student_ID",
+    "Student_Name",
+    "Study_Hours",
+    "Sleep_Hours",
+    "Play_Hours",
+    "Exercise",
+    "Attendance_Percentage",
+    "Attention_Level"
+]
+
+
+def missing_columns(df, required):
+    return [col for col in required if col not in df.columns]
+
+
+def train_dataset(df, formula="training"):
+    """Predicted marks, performance level and recommendation for every row."""
+    df = score(df, formula)
+    with span("recommend", rows=len(df)):
+        recommendations = generate_recommendations(df)
+    return df.assign(Recommendation=recommendations)
+
+
+def predict_bulk(df, formula="bulk"):
+    """Predicted marks and performance level (no recommendations)."""
+    return score(df, formula)
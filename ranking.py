@@ -0,0 +1,287 @@
+"""
+StudyTrack AI - ranking index over the trained students.
+
+Built once per trained frame (next to the insights bundle), so rank,
+percentile, leaderboards and at-risk lists never scan or sort the rows
+again:
+
+    order      row positions by Predicted_Marks, highest first (ties keep
+               row order, like idxmax); unscored rows are left out
+    ascending  the scored marks sorted low to high, for binary searches
+    lookup     Student_ID (keyed like history.py) and Student_Name ->
+               row positions, through a hash index on the distinct values
+
+    rank / percentile of any marks         O(log n)
+    student by ID or name                  O(1) hash lookup
+    top / bottom k                         a slice of order
+    cohort leaderboard (any categorical)   grouped once per column, then a slice
+    at-risk students (below a mark)        O(log n + count)
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from history import ID_COLUMN, student_key, student_keys
+from scoring import PERFORMANCE_BANDS
+
+RANK_COLUMN = "Predicted_Marks"
+NAME_COLUMN = "Student_Name"
+LEVEL_COLUMN = "Performance_Level"
+
+# below the lowest band bound a student "Needs Improvement"
+AT_RISK_MARKS = PERFORMANCE_BANDS[-1][0]
+
+# label columns that are never cohorts
+_NOT_COHORTS = (ID_COLUMN, NAME_COLUMN)
+
+
+def _hash_index(uniques):
+    index = pd.Index(uniques)
+    # build the hash table now rather than on the first lookup
+    index.get_indexer(index[:1])
+    return index
+
+
+def _grouped(codes, groups):
+    # positions grouped by code: group g owns order[starts[g]:starts[g + 1]]
+    # (code -1, missing, is left out)
+    order = np.argsort(codes, kind="stable")
+    starts = np.searchsorted(codes[order], np.arange(groups + 1))
+    return order, starts
+
+
+def cohort_columns(df):
+    """Categorical columns a leaderboard can be split by."""
+    return [
+        col for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and col not in _NOT_COHORTS
+    ]
+
+
+class RankingIndex:
+    """Sorted order and hash lookups over one trained frame (see module docstring)."""
+
+    def __init__(self, df, column=RANK_COLUMN):
+        self.marks = df[column].to_numpy(dtype="float64", na_value=np.nan)
+        scored = ~np.isnan(self.marks)
+        self.scored = int(scored.sum())
+
+        # stable sort of -marks: highest first, NaN last, ties in row order
+        self.order = np.argsort(-self.marks, kind="stable")[:self.scored]
+        self.ascending = self.marks[self.order[::-1]]
+
+        self._lookups = {}
+        if ID_COLUMN in df.columns:
+            codes, uniques = pd.factorize(student_keys(df[ID_COLUMN]))
+            self._lookups[ID_COLUMN] = (_hash_index(uniques), *_grouped(codes, len(uniques)))
+        if NAME_COLUMN in df.columns:
+            names = df[NAME_COLUMN]
+            if isinstance(names.dtype, pd.CategoricalDtype):
+                codes, uniques = names.cat.codes.to_numpy(), names.cat.categories.astype(str)
+            else:
+                codes, uniques = pd.factorize(names.astype(str))
+            self._lookups[NAME_COLUMN] = (_hash_index(uniques), *_grouped(codes, len(uniques)))
+
+        # column -> (labels, positions by label and marks, starts, -marks
+        # in the same order for binary searches within a cohort)
+        self._cohorts = {}
+        self._cohort_source = {
+            col: (df[col].cat.codes.to_numpy(), df[col].cat.categories) for col in cohort_columns(df)
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.marks)
+
+    @property
+    def nbytes(self):
+        """Memory held, counting the cohort arrays built on first use too."""
+        size = self.marks.nbytes + self.order.nbytes + self.ascending.nbytes
+        for index, order, starts in self._lookups.values():
+            size += int(index.memory_usage(deep=True)) + order.nbytes + starts.nbytes
+        for codes, categories in self._cohort_source.values():
+            size += codes.nbytes + int(categories.memory_usage(deep=True))
+            # positions, -marks and starts of _cohort()
+            size += self.scored * (self.order.itemsize + self.marks.itemsize) + (len(categories) + 1) * 8
+        return size
+
+    # ------------------------------------------------
+    # RANK / PERCENTILE
+    # ------------------------------------------------
+    def rank_of(self, marks):
+        """1 + number of scored students with higher marks (ties share a rank)."""
+        return self.scored - int(np.searchsorted(self.ascending, marks, side="right")) + 1
+
+    def percentile_of(self, marks):
+        """Share of scored students at or below marks, 0-100."""
+        if not self.scored:
+            return float("nan")
+        return 100.0 * int(np.searchsorted(self.ascending, marks, side="right")) / self.scored
+
+    # ------------------------------------------------
+    # LOOKUP
+    # ------------------------------------------------
+    def _lookup(self, column, key):
+        index, order, starts = self._lookups[column]
+        try:
+            code = index.get_loc(key)
+        except KeyError:
+            return np.zeros(0, dtype="intp")
+        return order[starts[code]:starts[code + 1]]
+
+    def find(self, text):
+        """Row positions of the students with this Student_ID, else this exact name."""
+        text = str(text).strip()
+        if not text:
+            return np.zeros(0, dtype="intp")
+        if ID_COLUMN in self._lookups:
+            hits = self._lookup(ID_COLUMN, student_key(text))
+            if len(hits):
+                return hits
+        if NAME_COLUMN in self._lookups:
+            return self._lookup(NAME_COLUMN, text)
+        return np.zeros(0, dtype="intp")
+
+    # ------------------------------------------------
+    # TOP / BOTTOM K
+    # ------------------------------------------------
+    def top(self, k, positions=None):
+        """k best row positions, best first - of everyone or of positions."""
+        if positions is None:
+            return self.order[:k]
+        return self._select(np.asarray(positions), k, best=True)
+
+    def bottom(self, k, positions=None):
+        """k lowest-scored row positions, lowest first."""
+        if positions is None:
+            return self.order[::-1][:k]
+        return self._select(np.asarray(positions), k, best=False)
+
+    def _select(self, positions, k, best):
+        # partial selection over an arbitrary subset: O(len + k log k);
+        # ties in the same order as order / order[::-1]
+        positions = positions[~np.isnan(self.marks[positions])]
+        values = -self.marks[positions] if best else self.marks[positions]
+        if k < len(positions):
+            # every row tied with the k-th stays a candidate
+            kth = np.partition(values, k - 1)[k - 1]
+            keep = values <= kth
+            positions, values = positions[keep], values[keep]
+        ties = positions if best else -positions
+        return positions[np.lexsort((ties, values))][:k]
+
+    # ------------------------------------------------
+    # COHORTS
+    # ------------------------------------------------
+    def _cohort(self, column):
+        with self._lock:
+            if column not in self._cohorts:
+                codes, categories = self._cohort_source[column]
+                # scored rows grouped by label, each group highest first
+                grouped, starts = _grouped(codes[self.order], len(categories))
+                positions = self.order[grouped]
+                self._cohorts[column] = (pd.Index(categories), positions, starts, -self.marks[positions])
+            return self._cohorts[column]
+
+    def cohorts(self, column):
+        """Labels of column with at least one scored student."""
+        labels, _, starts, _ = self._cohort(column)
+        return list(labels[np.diff(starts) > 0])
+
+    def _members(self, column, label):
+        # (positions, -marks) of one cohort, highest marks first
+        labels, positions, starts, negated = self._cohort(column)
+        try:
+            code = labels.get_loc(label)
+        except KeyError:
+            return positions[:0], negated[:0]
+        members = slice(starts[code], starts[code + 1])
+        return positions[members], negated[members]
+
+    def leaderboard(self, k, column=None, label=None, bottom=False):
+        """Top (or bottom) k of one cohort - or of everyone without a column."""
+        if column is None:
+            return self.bottom(k) if bottom else self.top(k)
+        members, _ = self._members(column, label)
+        return members[::-1][:k] if bottom else members[:k]
+
+    def cohort_rank(self, column, position):
+        """Rank of the student at row position within their own cohort."""
+        codes, categories = self._cohort_source[column]
+        if codes[position] < 0 or np.isnan(self.marks[position]):
+            return None
+        _, negated = self._members(column, categories[codes[position]])
+        return int(np.searchsorted(negated, -self.marks[position], side="left")) + 1
+
+    # ------------------------------------------------
+    # AT RISK
+    # ------------------------------------------------
+    def at_risk(self, below=AT_RISK_MARKS):
+        """Row positions of the students scored under below, lowest first."""
+        count = int(np.searchsorted(self.ascending, below, side="left"))
+        return self.order[self.scored - count:][::-1]
+
+
+# ------------------------------------------------
+# RANKING PANEL
+# ------------------------------------------------
+def ranked_frame(df, ranking, positions):
+    """Rows at positions with their overall rank and percentile."""
+    from tables import page_frame
+
+    columns = [col for col in (ID_COLUMN, NAME_COLUMN, RANK_COLUMN, LEVEL_COLUMN) if col in df.columns]
+    frame = page_frame(df, positions, columns).reset_index(drop=True)
+    marks = ranking.marks[positions]
+    frame.insert(0, "Rank", [ranking.rank_of(m) if m == m else None for m in marks])
+    frame["Percentile"] = [round(ranking.percentile_of(m), 1) if m == m else None for m in marks]
+    return frame
+
+
+def ranking_panel(df, ranking, key):
+    """Lookup, leaderboard and at-risk list for a trained frame."""
+    import streamlit as st
+
+    st.subheader("🏅 Student Rankings")
+    st.caption(f"{ranking.scored:,} scored students")
+    choices = cohort_columns(df)
+
+    # ---------- Lookup ----------
+    text = st.text_input("🔍 Student ID or exact name", key=f"{key}_find")
+    if text.strip():
+        hits = ranking.find(text)
+        if not len(hits):
+            st.warning(f"No student with ID or name {text.strip()!r}.")
+        else:
+            found = ranked_frame(df, ranking, hits)
+            if LEVEL_COLUMN in choices:
+                found["Rank in Level"] = [ranking.cohort_rank(LEVEL_COLUMN, p) for p in hits]
+            st.dataframe(found, hide_index=True, use_container_width=True)
+
+    # ---------- Leaderboard ----------
+    col1, col2, col3 = st.columns([2, 2, 1])
+    column = col1.selectbox("Leaderboard of", ["All students"] + choices, key=f"{key}_cohort")
+    label = None
+    if column != "All students":
+        label = col2.selectbox(column.replace("_", " "), ranking.cohorts(column), key=f"{key}_label")
+    end = col3.radio("Show", ["Top", "Bottom"], horizontal=True, key=f"{key}_end")
+    k = st.slider("Students shown", 5, 100, 10, key=f"{key}_k")
+
+    board = ranking.leaderboard(
+        k, None if column == "All students" else column, label, bottom=end == "Bottom"
+    )
+    st.dataframe(ranked_frame(df, ranking, board), hide_index=True, use_container_width=True)
+
+    # ---------- At risk ----------
+    below = st.number_input(
+        "⚠️ At risk below marks", 0.0, 100.0, float(AT_RISK_MARKS), 1.0, key=f"{key}_risk",
+        help=f"Default: under {AT_RISK_MARKS}, the Needs Improvement band."
+    )
+    risk = ranking.at_risk(below)
+    share = len(risk) / ranking.scored if ranking.scored else 0.0
+    st.metric("At-risk students", f"{len(risk):,}", f"{share:.1%} of scored", delta_color="off")
+    if len(risk):
+        st.dataframe(ranked_frame(df, ranking, risk[:k]), hide_index=True, use_container_width=True)
+        if len(risk) > k:
+            st.caption(f"Lowest {k} of {len(risk):,} shown.")
@@ -0,0 +1,194 @@
+"""
+StudyTrack AI - rule based recommendation engine.
+
+The thresholds used by the "Train Model" step live in the tables below and
+are evaluated as boolean column masks over the whole DataFrame, so a large
+dataset is scored in a handful of NumPy operations instead of one Python
+call per student.
+
+Recommendations are stored as a uint16 bitmask over the fixed ADVICE
+catalog (2 bytes per student) and only turned into " | " joined text for
+the rows that are displayed or exported. "Everyone told to improve
+attendance" is a bitwise AND over the column.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------
+# RECOMMENDATION RULES
+# ------------------------------------------------
+# Each entry: performance level -> (headline, [(column, below, advice), ...]).
+# An advice is added when row[column] < below. Levels not listed here
+# (Good Performer, Needs Improvement) fall back to DEFAULT_RULE. The level
+# labels come from scoring.PERFORMANCE_BANDS.
+RECOMMENDATION_RULES = {
+    "Excellent Performer": (
+        "Maintain current study routine",
+        [
+            ("Attention_Level", 70, "Improve focus consistency"),
+            ("Sleep_Hours", 7, "Ensure adequate sleep"),
+        ],
+    ),
+    "Average Performer": (
+        "Increase academic consistency",
+        [
+            ("Study_Hours", 6, "Increase study hours"),
+            ("Attention_Level", 65, "Reduce distractions and improve focus"),
+            ("Attendance_Percentage", 80, "Improve class attendance"),
+        ],
+    ),
+}
+
+DEFAULT_RULE = (
+    "Immediate academic intervention required",
+    [
+        ("Study_Hours", 6, "Significantly increase study hours"),
+        ("Sleep_Hours", 7, "Improve sleep routine"),
+        ("Attention_Level", 60, "Work on concentration techniques"),
+        ("Attendance_Percentage", 75, "Attend classes regularly"),
+    ],
+)
+
+
+# ------------------------------------------------
+# ADVICE CATALOG (BIT FLAGS)
+# ------------------------------------------------
+# bit i of a Recommendation value = ADVICE[i] given. The bits are saved in
+# artifacts, so only ever append. Decoded text lists the messages in
+# catalog order: each rule's headline first, then its advice in rule order.
+ADVICE = [
+    "Maintain current study routine",
+    "Increase academic consistency",
+    "Immediate academic intervention required",
+    "Improve focus consistency",
+    "Ensure adequate sleep",
+    "Increase study hours",
+    "Reduce distractions and improve focus",
+    "Improve class attendance",
+    "Significantly increase study hours",
+    "Improve sleep routine",
+    "Work on concentration techniques",
+    "Attend classes regularly",
+]
+ADVICE_BITS = {text: 1 << bit for bit, text in enumerate(ADVICE)}
+
+RECOMMENDATION_COLUMN = "Recommendation"
+FLAG_DTYPE = np.uint16
+SEPARATOR = " | "
+
+
+def _below(df, column, threshold):
+    # NaN compares as False, same as the old row-by-row "<" check
+    return (df[column] < threshold).to_numpy(dtype=bool, na_value=False)
+
+
+def generate_recommendations(df):
+    """Return a Series with the advice bitmask for every row of df."""
+    level = pd.Categorical(df["Performance_Level"])
+    rules = list(RECOMMENDATION_RULES.items()) + [(None, DEFAULT_RULE)]
+
+    flags = np.zeros(len(df), dtype=FLAG_DTYPE)
+    matched = np.zeros(len(df), dtype=bool)
+
+    for name, (headline, checks) in rules:
+        if name is None:
+            mask = ~matched
+        elif name in level.categories:
+            mask = level.codes == level.categories.get_loc(name)
+        else:
+            mask = np.zeros(len(df), dtype=bool)
+        matched |= mask
+
+        bits = np.full(len(df), ADVICE_BITS[headline], dtype=FLAG_DTYPE)
+        for column, threshold, advice in checks:
+            bits[_below(df, column, threshold)] |= FLAG_DTYPE(ADVICE_BITS[advice])
+
+        flags[mask] = bits[mask]
+
+    return pd.Series(flags, index=df.index, name=RECOMMENDATION_COLUMN)
+
+
+# ------------------------------------------------
+# DECODE / ENCODE
+# ------------------------------------------------
+def is_flags(values):
+    """True for a bitmask Recommendation column (False for stored text)."""
+    return values.dtype.kind in "iu"
+
+
+def advice_text(flags):
+    """The " | " joined advice of one bitmask."""
+    return SEPARATOR.join(text for text, bit in ADVICE_BITS.items() if int(flags) & bit)
+
+
+def decode_recommendations(flags):
+    """
+    Categorical advice text per bitmask. Each distinct mask is decoded
+    once; categories are sorted by text, so sorting the result sorts
+    alphabetically.
+    """
+    flags = np.asarray(flags, dtype=FLAG_DTYPE)
+    masks = np.flatnonzero(np.bincount(flags, minlength=1 << 16))
+    texts = np.array([advice_text(mask) for mask in masks], dtype=object)
+    order = np.argsort(texts, kind="stable")
+
+    # mask -> category code, via a lookup table over every 16-bit value
+    lookup = np.zeros(1 << 16, dtype=np.int8 if len(masks) < 128 else np.int32)
+    lookup[masks[order]] = np.arange(len(masks))
+    return pd.Categorical.from_codes(lookup[flags], categories=texts[order])
+
+
+def readable(df):
+    """df with its Recommendation bitmasks decoded to text (display / export)."""
+    if RECOMMENDATION_COLUMN not in df.columns or not is_flags(df[RECOMMENDATION_COLUMN]):
+        return df
+    text = decode_recommendations(df[RECOMMENDATION_COLUMN].to_numpy())
+    return df.assign(**{RECOMMENDATION_COLUMN: pd.Series(text, index=df.index)})
+
+
+def encode_recommendations(values):
+    """
+    Bitmasks for a column of advice text (e.g. a re-uploaded export);
+    missing text is 0. None if any message is not in ADVICE.
+    """
+    if is_flags(values):
+        return np.asarray(values, dtype=FLAG_DTYPE)
+
+    values = pd.Categorical(values)
+    lookup = np.zeros(len(values.categories) + 1, dtype=FLAG_DTYPE)
+    for code, text in enumerate(values.categories):
+        for advice in str(text).split(SEPARATOR):
+            if advice not in ADVICE_BITS:
+                return None
+            lookup[code] |= FLAG_DTYPE(ADVICE_BITS[advice])
+    # code -1 (missing) picks the trailing 0
+    return lookup[values.codes]
+
+
+# ------------------------------------------------
+# BITWISE QUERIES
+# ------------------------------------------------
+def advice_mask(advice):
+    """Bitmask of the given ADVICE messages."""
+    bits = 0
+    for text in advice:
+        bits |= ADVICE_BITS[text]
+    return FLAG_DTYPE(bits)
+
+
+def given_advice(flags, advice, match="all"):
+    """Boolean mask of rows given every message in advice (match="any": at least one)."""
+    bits = advice_mask(advice)
+    flags = np.asarray(flags, dtype=FLAG_DTYPE)
+    if match == "any":
+        return (flags & bits) != 0
+    return (flags & bits) == bits
+
+
+def advice_counts(flags):
+    """Students given each ADVICE message -> Series (catalog order)."""
+    per_mask = np.bincount(np.asarray(flags, dtype=FLAG_DTYPE), minlength=1 << 16)
+    masks = np.arange(1 << 16)
+    counts = [int(per_mask[(masks & bit) != 0].sum()) for bit in ADVICE_BITS.values()]
+    return pd.Series(counts, index=ADVICE, name="Students")
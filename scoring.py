@@ -0,0 +1,216 @@
+"""
+StudyTrack AI - shared scoring engine.
+
+Every page predicts marks with a weighted sum of student parameters. The
+formulas are registered here by name, scored for any number of rows one
+whole column per term, and bucketed into performance levels with a
+vectorized bin lookup. The single-student sliders use the same code path
+with a batch of one.
+
+Each term is evaluated as written (0.35 * hours * 10, not hours * 3.5)
+and the terms are added left to right, so the marks are bit-for-bit the
+ones the original per-page formulas gave - including the rows that sit
+exactly on a band bound or on a rounding tie.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from metrics import span
+
+# ------------------------------------------------
+# PERFORMANCE LEVEL BANDS
+# ------------------------------------------------
+# (lower bound on Predicted_Marks, label) - checked from the top down,
+# anything below the last bound (or missing) is "Needs Improvement".
+PERFORMANCE_BANDS = [
+    (85, "Excellent Performer"),
+    (70, "Good Performer"),
+    (55, "Average Performer"),
+]
+DEFAULT_LEVEL = "Needs Improvement"
+
+# category order of Performance_Level, lowest band first
+LEVELS = [DEFAULT_LEVEL] + [label for _, label in reversed(PERFORMANCE_BANDS)]
+
+# ------------------------------------------------
+# FORMULA REGISTRY
+# ------------------------------------------------
+FORMULAS = {}
+
+
+def register_formula(name, terms, intercept=0.0, clip=None, decimals=None):
+    """
+    Register a weighted-sum formula.
+
+    terms: list of (column, weight) or (column, weight, cap). A term with a
+           cap scores the hours left under the cap, max(cap - value, 0),
+           e.g. less play time scores higher; a (cap, unit) cap scores
+           max(cap - value * unit, 0). weight may also be written
+           (factor, "*" or "/", scale), applied in that order:
+           (0.20, "/", 10) scores 0.20 * value / 10.
+    intercept: constant added to every score (fitted formulas).
+    clip:  optional (low, high) applied to the final marks.
+    decimals: optional rounding applied after clipping.
+    """
+    columns = [term[0] for term in terms]
+    factors = [term[1] if isinstance(term[1], tuple) else (term[1], "*", 1.0) for term in terms]
+    caps = [term[2] if len(term) > 2 else np.nan for term in terms]
+    units = np.array([cap[1] if isinstance(cap, tuple) else 1.0 for cap in caps], dtype="float64")
+    caps = np.array([cap[0] if isinstance(cap, tuple) else cap for cap in caps], dtype="float64")
+    # effective weight of every term, for fitting and reporting
+    weights = np.array(
+        [factor * scale if op == "*" else factor / scale for factor, op, scale in factors],
+        dtype="float64"
+    )
+
+    # changes whenever the formula does - used in cache keys
+    version = hashlib.sha1(
+        repr((columns, factors, caps.tolist(), units.tolist(), float(intercept), clip, decimals)).encode()
+    ).hexdigest()[:12]
+
+    FORMULAS[name] = {
+        "columns": columns,
+        "factors": factors,
+        "weights": weights,
+        "caps": caps,
+        "units": units,
+        "intercept": float(intercept),
+        "clip": clip,
+        "decimals": decimals,
+        "version": version,
+    }
+    return FORMULAS[name]
+
+
+def formula_version(name):
+    return FORMULAS[name]["version"]
+
+
+# Model Training - uses previous marks
+register_formula("training", [
+    ("Study_Hours", (0.35, "*", 10)),
+    ("Sleep_Hours", (0.20, "*", 10)),
+    ("Attendance_Percentage", (0.20, "/", 10)),
+    ("Attention_Level", 0.15),
+    ("Previous_Marks", 0.10),
+])
+
+# Student page - individual sliders (attention on a 0-10 scale)
+register_formula("individual", [
+    ("Study_Hours", (0.35, "*", 10)),
+    ("Sleep_Hours", (0.20, "*", 10)),
+    ("Social_Media_Hours", (0.20, "/", 10), (100, 10)),
+    ("Attention_Level", (0.15, "*", 10)),
+    ("Exercise", (0.10, "*", 10)),
+])
+
+# Student page - bulk CSV prediction (no previous marks)
+register_formula("bulk", [
+    ("Study_Hours", (0.25, "*", 5)),
+    ("Sleep_Hours", (0.15, "*", 4)),
+    ("Play_Hours", (0.10, "*", 3), 6),
+    ("Exercise", (0.10, "*", 3)),
+    ("Attendance_Percentage", (0.25, "*", 0.3)),
+    ("Attention_Level", (0.15, "*", 4)),
+], clip=(0, 100), decimals=2)
+
+# Recommendation page - single student sliders
+register_formula("recommendation", [
+    ("Study_Hours", (0.30, "*", 10)),
+    ("Sleep_Hours", (0.20, "*", 10)),
+    ("Attention_Level", (0.15, "*", 10)),
+    ("Exercise", (0.15, "*", 10)),
+    ("Play_Hours", (0.10, "*", 10), 6),
+    ("Social_Media_Hours", (0.10, "*", 10), 6),
+])
+
+
+# ------------------------------------------------
+# SCORING
+# ------------------------------------------------
+def _as_float64(values):
+    values = np.atleast_1d(np.asarray(values))
+    if values.dtype == np.float32:
+        # compact float32 columns carry at most a few decimals - drop the
+        # float32 representation error so 7.3 scores as 7.3, not 7.3000002
+        return np.round(values.astype("float64"), 4)
+    return values.astype("float64")
+
+
+def column_matrix(data, columns):
+    """Stack raw input columns into an (n, k) float64 matrix."""
+    return np.column_stack([_as_float64(data[col]) for col in columns])
+
+
+def _term(values, factors, cap, unit):
+    # one term in the written order: factor * value, then * or / scale
+    factor, op, scale = factors
+    if not np.isnan(cap):
+        values = np.maximum(cap - (values if unit == 1 else values * unit), 0)
+    values = factor * values
+    if op == "/":
+        return values / scale
+    return values if scale == 1 else values * scale
+
+
+def add_terms(formula, inputs):
+    """
+    Sum of the formula's terms over inputs (column -> array-like; arrays
+    broadcast), added left to right in formula order, plus the intercept.
+    """
+    spec = FORMULAS[formula]
+    marks = None
+    for col, factors, cap, unit in zip(spec["columns"], spec["factors"], spec["caps"], spec["units"]):
+        term = _term(np.asarray(inputs[col], dtype="float64"), factors, cap, unit)
+        marks = term if marks is None else marks + term
+    return marks + spec["intercept"] if spec["intercept"] else marks
+
+
+def finish_marks(marks, formula):
+    """Apply the formula's clip and rounding to raw weighted sums."""
+    spec = FORMULAS[formula]
+    if spec["clip"] is not None:
+        marks = np.clip(marks, *spec["clip"])
+    if spec["decimals"] is not None:
+        marks = np.round(marks, spec["decimals"])
+    return marks
+
+
+def predict_marks(data, formula):
+    """Predicted marks for every row of data (DataFrame or dict of columns)."""
+    spec = FORMULAS[formula]
+
+    with span(f"predict.{formula}") as s:
+        marks = add_terms(formula, {col: _as_float64(data[col]) for col in spec["columns"]})
+        marks = finish_marks(marks, formula)
+        s.rows = len(marks)
+    return marks
+
+
+def performance_levels(marks):
+    """Bucket predicted marks into performance labels (ordered categorical, lowest band first)."""
+    marks = np.asarray(marks, dtype="float64")
+
+    with span("bucket", rows=len(marks)):
+        bounds = np.array([bound for bound, _ in reversed(PERFORMANCE_BANDS)], dtype="float64")
+        codes = np.searchsorted(bounds, marks, side="right")
+        codes[np.isnan(marks)] = 0
+        return pd.Categorical.from_codes(codes, categories=LEVELS, ordered=True)
+
+
+def score(df, formula):
+    """Return df with Predicted_Marks and Performance_Level columns added."""
+    marks = predict_marks(df, formula)
+    return df.assign(
+        Predicted_Marks=marks,
+        Performance_Level=performance_levels(marks),
+    )
+
+
+def score_one(formula, **values):
+    """Score a single student (batch of one) -> (predicted_marks, level)."""
+    marks = predict_marks(values, formula)
+    return float(marks[0]), performance_levels(marks)[0]
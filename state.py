@@ -0,0 +1,207 @@
+"""
+StudyTrack AI - per-session helpers shared by the pages.
+
+Upload hashing, access to the session's trained dataset, which lives
+in the shared CACHE (or the user's saved artifact) rather than in
+st.session_state, and the session's background jobs.
+"""
+
+import streamlit as st
+
+from artifacts import latest_version, load_artifact
+from cache import CACHE, content_hash
+from insights import build_insights
+from jobs import DONE, FAILED, JOBS, QUEUED
+from metrics import span
+from ranking import RankingIndex
+
+# seconds between progress refreshes of a running job
+JOB_POLL_SECONDS = 1.0
+
+
+# ------------------------------------------------
+# UPLOAD CACHE KEYS
+# ------------------------------------------------
+def upload_key(uploaded):
+    # hash each upload once per session; Streamlit gives every upload a file_id
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    if uploaded.file_id not in hashes:
+        hashes[uploaded.file_id] = content_hash(uploaded.getvalue())
+    return hashes[uploaded.file_id]
+
+
+# ------------------------------------------------
+# TRAINED DATA (SHARED STORE + WARM START)
+# ------------------------------------------------
+# sessions keep only the CACHE key of their trained frame; the frame and
+# its insights bundle live once in the process-wide store
+def restore_trained_data():
+    # new session: memory-map the user's last trained artifact once,
+    # instead of asking for a re-upload and a retrain
+    if "trained_key" in st.session_state or st.session_state.get("artifact_checked"):
+        return
+    st.session_state["artifact_checked"] = True
+
+    path = latest_version(st.session_state.username)
+    if path is None:
+        return
+
+    # another session may already hold the same data - then only the
+    # formula is needed from disk
+    _, _, formula, meta = load_artifact(path, data=False)
+    key = meta["dataset_key"] or ("artifact", path)
+    if CACHE.get(key) is None:
+        df, bundle, formula, meta = load_artifact(path)
+        CACHE.put(key, df)
+        CACHE.extra(key, "insights", lambda: bundle)
+
+    st.session_state["trained_key"] = key
+    st.session_state["formula"] = formula
+    st.session_state["artifact_meta"] = meta
+
+
+def trained_frame():
+    """The session's trained dataset from the shared store, or None."""
+    key = st.session_state.get("trained_key")
+    df = CACHE.get(key) if key is not None else None
+    if df is None and key is not None:
+        # dropped from the store (no spill space) - fall back to the artifact
+        del st.session_state["trained_key"]
+        st.session_state.pop("artifact_checked", None)
+
+    if df is None:
+        restore_trained_data()
+        key = st.session_state.get("trained_key")
+        df = CACHE.get(key) if key is not None else None
+    return df
+
+
+def trained_insights_for(key, build):
+    # one insights bundle per stored frame, shared like the frame itself
+    def build_bundle():
+        with span("insights.build"):
+            return build()
+
+    return CACHE.extra(key, "insights", build_bundle)
+
+
+def trained_insights(df):
+    return trained_insights_for(st.session_state["trained_key"], lambda: build_insights(df))
+
+
+def trained_ranking_for(key, df):
+    # ranking index of a stored frame, shared like its insights bundle
+    def build_ranking():
+        with span("ranking.build", rows=len(df)):
+            return RankingIndex(df)
+
+    return CACHE.extra(key, "ranking", build_ranking)
+
+
+def trained_ranking(df):
+    return trained_ranking_for(st.session_state["trained_key"], df)
+
+
+def trained_chart(name, build):
+    """Chart (or other derived object) of the trained frame, kept with it in the store."""
+    return CACHE.extra(st.session_state["trained_key"], ("chart", name), build)
+
+
+def trained_view(name, build):
+    """
+    Frame derived from the trained one (e.g. renamed columns), kept with it
+    in the store: the same object every rerun, so the sort orders and query
+    results tables.py caches per frame are reused.
+    """
+    return CACHE.extra(st.session_state["trained_key"], ("view", name), build)
+
+
+# ------------------------------------------------
+# BACKGROUND JOBS
+# ------------------------------------------------
+# st.session_state["jobs"]:          kind -> id of the session's active job
+# st.session_state["finished_jobs"]: kind -> id of a finished job whose
+#                                    outcome the page has not shown yet
+def start_job(kind, fn, *args, label=None, **kwargs):
+    """Submit fn(job, *args, **kwargs) for this session's user (see jobs.py)."""
+    job = JOBS.submit(st.session_state.username, kind, fn, *args, label=label, **kwargs)
+    st.session_state.setdefault("jobs", {})[kind] = job.id
+    st.session_state.setdefault("finished_jobs", {}).pop(kind, None)
+    return job
+
+
+def collect_jobs():
+    """
+    Pick up the session's finished jobs (every rerun, on any page) and list
+    the running ones in the sidebar. A job returns {"session": {...}} to
+    set session state keys (None = remove); a file it replaces, like the
+    previous streamed bulk result, is closed.
+    """
+    jobs = st.session_state.get("jobs", {})
+    for kind, job_id in list(jobs.items()):
+        job = JOBS.get(job_id)
+        if job is None:
+            del jobs[kind]
+            continue
+        if job.active:
+            st.sidebar.caption(f"⏳ {job.label}: {job.message} ({job.progress:.0%})")
+            continue
+
+        del jobs[kind]
+        if job.status == DONE:
+            for name, value in ((job.result or {}).get("session") or {}).items():
+                old = st.session_state.get(name)
+                if old is not value and hasattr(old, "close"):
+                    old.close()
+                if value is None:
+                    st.session_state.pop(name, None)
+                else:
+                    st.session_state[name] = value
+        st.session_state.setdefault("finished_jobs", {})[kind] = job_id
+
+
+def active_job(kind):
+    """The session's queued or running job of kind, or None."""
+    job_id = st.session_state.get("jobs", {}).get(kind)
+    job = JOBS.get(job_id) if job_id else None
+    return job if job is not None and job.active else None
+
+
+def finished_job(kind):
+    """The session's finished job of kind, once (None afterwards)."""
+    job_id = st.session_state.get("finished_jobs", {}).pop(kind, None)
+    return JOBS.get(job_id) if job_id else None
+
+
+def show_job_outcome(job):
+    """Error / cancel message of a finished job; True if it succeeded."""
+    if job.status == DONE:
+        return True
+    if job.status == FAILED:
+        st.error(f"❌ {job.label} failed: {job.error}")
+    else:
+        st.warning(f"⏹️ {job.label} cancelled.")
+    return False
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(kind, show_details=None):
+    """
+    Progress bar and Cancel button of the session's running job of kind;
+    show_details(job.details) renders whatever else the job reports.
+    """
+    job = active_job(kind)
+    if job is None:
+        # finished since the last refresh - rerun the page to show the result
+        st.rerun(scope="app")
+        return
+
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        position = "queued" if job.status == QUEUED else f"{job.seconds:.0f}s"
+        st.progress(job.progress, text=f"{job.label}: {job.message} ({position})")
+    with col2:
+        if st.button("⏹️ Cancel", key=f"{kind}_job_cancel"):
+            JOBS.cancel(job.id)
+    if show_details is not None and job.details:
+        show_details(job.details)
@@ -0,0 +1,183 @@
+"""
+StudyTrack AI - online summary statistics.
+
+Moments keeps, for every pair of numeric columns, the count, means, sums
+of squared deviations (M2) and the co-moment of the rows where both are
+present - the pairwise-complete statistics DataFrame.corr() uses. Rows are
+folded in per block (or one row at a time) with Welford / Chan updates,
+and two accumulators merge exactly, so shards scanned separately or rows
+appended later give the same result as one pass over everything:
+
+    moments = Moments(columns).update(block_1).update(block_2)
+    moments.merge(other_shard).correlation()
+
+Unlike raw sums of x and x^2, the deviations never subtract two large
+nearly-equal numbers, so variances and correlations stay accurate for
+millions of rows and for columns far from zero.
+
+RunningMax is the matching accumulator for the top performer: the highest
+value seen with its label, first one winning ties like idxmax.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+# rows per block when folding a frame into Moments
+BLOCK_ROWS = 500_000
+
+
+# ------------------------------------------------
+# PAIRWISE MOMENTS (WELFORD / CHAN)
+# ------------------------------------------------
+def _block_moments(values):
+    # statistics of one block; columns are shifted by their block mean
+    # first, so the sums below are of small deviations
+    present = ~np.isnan(values)
+    m = present.astype("float64")
+    n = m.T @ m
+
+    counts = np.diag(n)
+    totals = np.where(present, values, 0.0).sum(axis=0)
+    shift = np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0)
+
+    x = np.where(present, values - shift, 0.0)
+    # [i, j] sums of column i over the rows where column j is present
+    sx = x.T @ m
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+
+    centered = np.divide(sx, n, out=np.zeros_like(sx), where=n > 0)
+    means = np.where(n > 0, shift[:, None] + centered, 0.0)
+    m2 = sxx - sx * centered
+    comoment = sxy - sx * centered.T
+    return n, means, m2, comoment
+
+
+class Moments:
+    """
+    Mergeable pairwise-complete count / mean / M2 / co-moment over columns.
+
+    Entry [i, j] of n, means and m2 describes column i over the rows where
+    column j is present too; comoment[i, j] is symmetric.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.means = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    @classmethod
+    def of(cls, df, columns=None, block_rows=BLOCK_ROWS):
+        """Moments of df[columns] (all columns by default), in row blocks."""
+        columns = list(df.columns if columns is None else columns)
+        return cls(columns).update(df, block_rows)
+
+    @classmethod
+    def from_sums(cls, columns, n, sx, sxx, sxy):
+        """Moments from raw pairwise sums (bundles saved before this module)."""
+        moments = cls(columns)
+        means = np.divide(sx, n, out=np.zeros_like(sx, dtype="float64"), where=n > 0)
+        moments.n = np.asarray(n, dtype="float64")
+        moments.means = means
+        moments.m2 = np.maximum(sxx - sx * means, 0.0)
+        moments.comoment = sxy - sx * means.T
+        return moments
+
+    # ---------- UPDATE / MERGE ----------
+    def update(self, values, block_rows=BLOCK_ROWS):
+        """
+        Fold rows in place and return self. values: a DataFrame holding
+        the columns, a 2-D array in column order, or one row (1-D).
+        """
+        if isinstance(values, pd.DataFrame):
+            for start in range(0, len(values), block_rows):
+                block = values[self.columns].iloc[start:start + block_rows]
+                self._fold(*_block_moments(block.to_numpy(dtype="float64", na_value=np.nan)))
+            return self
+
+        values = np.asarray(values, dtype="float64")
+        if values.ndim == 1:
+            values = values[None, :]
+        if values.shape[1] != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} columns, got {values.shape[1]}")
+        for start in range(0, len(values), block_rows):
+            self._fold(*_block_moments(values[start:start + block_rows]))
+        return self
+
+    def merge(self, other):
+        """New accumulator over the rows of both (self's rows first)."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge moments over different columns")
+        merged = copy.deepcopy(self)
+        merged._fold(other.n, other.means, other.m2, other.comoment)
+        return merged
+
+    def _fold(self, n, means, m2, comoment):
+        # Chan et al. pairwise update; delta.T[i, j] is column j's mean
+        # shift over the rows where both are present
+        total = self.n + n
+        weight = np.divide(n, total, out=np.zeros_like(total), where=total > 0)
+        delta = means - self.means
+        self.means = self.means + delta * weight
+        self.m2 = self.m2 + m2 + delta * delta * self.n * weight
+        self.comoment = self.comoment + comoment + delta * delta.T * self.n * weight
+        self.n = total
+
+    # ---------- RESULTS ----------
+    def _index(self, column):
+        return self.columns.index(column)
+
+    def count(self, column):
+        i = self._index(column)
+        return int(self.n[i, i])
+
+    def mean(self, column):
+        i = self._index(column)
+        return float(self.means[i, i]) if self.n[i, i] else float("nan")
+
+    def variance(self, column, ddof=1):
+        i = self._index(column)
+        n = self.n[i, i]
+        return float(self.m2[i, i] / (n - ddof)) if n > ddof else float("nan")
+
+    def correlation(self):
+        """Pearson correlation matrix, like DataFrame.corr() on the rows seen."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr[(self.n < 2) | (self.m2 <= 0) | (self.m2.T <= 0)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+# ------------------------------------------------
+# RUNNING ARG-MAX
+# ------------------------------------------------
+class RunningMax:
+    """Highest value seen and its label; the earliest wins ties, like idxmax."""
+
+    def __init__(self, value=None, label=None):
+        self.value = value
+        self.label = label
+
+    def offer(self, value, label):
+        if value is None or value != value:
+            return self
+        if self.value is None or value > self.value:
+            self.value, self.label = float(value), label
+        return self
+
+    def update(self, values, labels):
+        """Offer the best of values (array-like) with its entry of labels."""
+        values = np.asarray(values, dtype="float64")
+        if not len(values) or np.isnan(values).all():
+            return self
+        best = int(np.nanargmax(values))
+        return self.offer(values[best], labels.iloc[best] if hasattr(labels, "iloc") else labels[best])
+
+    def merge(self, other):
+        return RunningMax(self.value, self.label).offer(other.value, other.label)
@@ -0,0 +1,210 @@
+"""
+StudyTrack AI - paginated, sortable and filterable tables.
+
+Instead of sending a whole frame to st.dataframe, the query runs on the
+server (search on Student_Name / Student_ID, Predicted_Marks range, advice
+given, sort) and only the visible page is rendered. Sort orders, search columns and
+recent query results are cached per dataset, so paging through a large
+result only slices an index array.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from metrics import span
+from recommendations import (
+    ADVICE, RECOMMENDATION_COLUMN, advice_counts, decode_recommendations, given_advice, is_flags, readable
+)
+
+PAGE_SIZES = [25, 50, 100, 250]
+SEARCH_COLUMNS = ["Student_Name", "Student_ID"]
+RANGE_COLUMN = "Predicted_Marks"
+
+# query results remembered per dataset
+MAX_CACHED_QUERIES = 8
+
+# ------------------------------------------------
+# PER-DATASET INDEX CACHE
+# ------------------------------------------------
+# id(df) -> {"sort": {...}, "search": {...}, "queries": OrderedDict,
+#           "advice": per-message counts, once asked for}
+# entries are dropped when the DataFrame is garbage collected
+_INDEXES = {}
+_LOCK = threading.Lock()
+
+
+def _indexes(df):
+    key = id(df)
+    with _LOCK:
+        entry = _INDEXES.get(key)
+        if entry is None:
+            entry = {"sort": {}, "search": {}, "queries": OrderedDict()}
+            _INDEXES[key] = entry
+            weakref.finalize(df, _INDEXES.pop, key, None)
+    return entry
+
+
+def sort_order(df, column, ascending=True):
+    """Row positions of df sorted by column (missing values last), cached."""
+    cache = _indexes(df)["sort"]
+    if (column, ascending) not in cache:
+        values = df[column].reset_index(drop=True)
+        if column == RECOMMENDATION_COLUMN and is_flags(values):
+            # by advice text, not by bit pattern
+            values = pd.Series(decode_recommendations(values.to_numpy()))
+        cache[(column, ascending)] = values.sort_values(
+            ascending=ascending, kind="stable", na_position="last"
+        ).index.to_numpy()
+    return cache[(column, ascending)]
+
+
+def _search_labels(df, col):
+    # lower-cased text of each distinct label (categoricals) or each row,
+    # built once per dataset
+    cache = _indexes(df)["search"]
+    if col not in cache:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.categories
+        labels = pd.Series(values, copy=False).reset_index(drop=True)
+        if labels.dtype.kind in "iufb":
+            labels = pd.Series([str(v) for v in labels.tolist()])
+        cache[col] = labels.astype(str).str.lower()
+    return cache[col]
+
+
+def _search_mask(df, text):
+    text = text.strip().lower()
+    mask = np.zeros(len(df), dtype=bool)
+
+    for col in SEARCH_COLUMNS:
+        if col not in df.columns:
+            continue
+        hits = _search_labels(df, col).str.contains(text, regex=False).to_numpy(dtype=bool, na_value=False)
+
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # broadcast the per-label hits through the codes (-1 = missing)
+            codes = df[col].cat.codes.to_numpy()
+            hits = np.append(hits, False)[codes]
+        mask |= hits
+    return mask
+
+
+def _has_flags(df):
+    return RECOMMENDATION_COLUMN in df.columns and is_flags(df[RECOMMENDATION_COLUMN])
+
+
+def query(df, search="", marks_range=None, sort_by=None, ascending=True, advice=()):
+    """Row positions matching the filters, in display order."""
+    advice = tuple(advice) if _has_flags(df) else ()
+    key = (search.strip().lower(), marks_range, sort_by, ascending, advice)
+    queries = _indexes(df)["queries"]
+    if key in queries:
+        queries.move_to_end(key)
+        return queries[key]
+
+    positions = sort_order(df, sort_by, ascending) if sort_by else np.arange(len(df))
+
+    mask = None
+    if key[0]:
+        mask = _search_mask(df, search)
+    if marks_range is not None and RANGE_COLUMN in df.columns:
+        marks = df[RANGE_COLUMN].to_numpy(dtype="float64")
+        in_range = (marks >= marks_range[0]) & (marks <= marks_range[1])
+        mask = in_range if mask is None else mask & in_range
+    if advice:
+        # every selected message: one AND over the bitmask column
+        told = given_advice(df[RECOMMENDATION_COLUMN].to_numpy(), advice)
+        mask = told if mask is None else mask & told
+    if mask is not None:
+        positions = positions[mask[positions]]
+
+    queries[key] = positions
+    if len(queries) > MAX_CACHED_QUERIES:
+        queries.popitem(last=False)
+    return positions
+
+
+# ------------------------------------------------
+# STREAMLIT COMPONENT
+# ------------------------------------------------
+def page_frame(df, positions, columns):
+    # a categorical slice still carries every label of the full dataset
+    # (1M student names -> ~20 MB of Arrow per page) - keep only this page's
+    # recommendations are decoded here, for the visible rows only
+    page = readable(df.iloc[positions][columns])
+    trimmed = {
+        col: page[col].cat.remove_unused_categories()
+        for col in page.columns
+        if isinstance(page[col].dtype, pd.CategoricalDtype)
+    }
+    return page.assign(**trimmed) if trimmed else page
+
+
+def paged_table(df, key, columns=None):
+    """Render df (optionally only columns) one page at a time."""
+    columns = list(columns) if columns is not None else list(df.columns)
+
+    c1, c2, c3 = st.columns([2, 2, 1])
+    with c1:
+        search = ""
+        if any(col in df.columns for col in SEARCH_COLUMNS):
+            search = st.text_input("🔍 Search name / ID", key=f"{key}_search")
+    with c2:
+        sort_by = st.selectbox("Sort by", ["(none)"] + columns, key=f"{key}_sort")
+    with c3:
+        ascending = st.toggle("Ascending", value=True, key=f"{key}_asc")
+
+    marks_range = None
+    if RANGE_COLUMN in df.columns and len(df):
+        low = float(np.floor(np.nanmin(df[RANGE_COLUMN].to_numpy(dtype="float64"))))
+        high = float(np.ceil(np.nanmax(df[RANGE_COLUMN].to_numpy(dtype="float64"))))
+        if high > low:
+            picked = st.slider("Predicted marks range", low, high, (low, high), key=f"{key}_range")
+            if picked != (low, high):
+                marks_range = picked
+
+    advice = []
+    if RECOMMENDATION_COLUMN in columns and _has_flags(df):
+        cache = _indexes(df)
+        if "advice" not in cache:
+            cache["advice"] = advice_counts(df[RECOMMENDATION_COLUMN].to_numpy())
+        counts = cache["advice"]
+        advice = st.multiselect(
+            "Advice given", [text for text in ADVICE if counts[text]],
+            format_func=lambda text: f"{text} ({counts[text]:,})", key=f"{key}_advice",
+            help="Only students given every selected advice."
+        )
+
+    with span("table.query", rows=len(df)):
+        positions = query(
+            df,
+            search=search,
+            marks_range=marks_range,
+            sort_by=None if sort_by == "(none)" else sort_by,
+            ascending=ascending,
+            advice=advice
+        )
+
+    c4, c5 = st.columns([1, 1])
+    with c4:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, -(-len(positions) // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with c5:
+        page = st.number_input("Page", 1, pages, 1, key=f"{key}_page")
+
+    start = (int(page) - 1) * page_size
+    visible = positions[start:start + page_size]
+
+    st.dataframe(page_frame(df, visible, columns), use_container_width=True)
+    st.caption(
+        f"Showing {min(start + 1, len(positions)):,}–{start + len(visible):,} "
+        f"of {len(positions):,} rows (page {int(page):,} of {pages:,})"
+    )
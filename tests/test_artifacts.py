@@ -0,0 +1,129 @@
+"""
+Artifacts: save -> load round trips, formula re-registration and upgrades
+of versions saved by older releases.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import artifacts
+from benchmark import synthetic_students
+from datasets import ARROW_AVAILABLE, apply_schema
+from insights import build_insights, correlation
+from pipeline import train_dataset
+from recommendations import FLAG_DTYPE, readable
+from scoring import FORMULAS, LEVELS, formula_version, predict_marks
+from trainer import LeastSquaresTrainer
+
+pytestmark = pytest.mark.skipif(not ARROW_AVAILABLE, reason="needs pyarrow")
+
+USER = "teacher@school.org"
+
+
+@pytest.fixture(autouse=True)
+def artifact_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_ROOT", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def trained():
+    df = train_dataset(apply_schema(synthetic_students(800, seed=5)))
+    return df, build_insights(df)
+
+
+def test_round_trip(trained):
+    df, bundle = trained
+    key = ("trained", "abc123", formula_version("training"))
+    path = artifacts.save_artifact(USER, df, bundle, "training", key)
+    assert artifacts.latest_version(USER) == path
+
+    loaded, loaded_bundle, formula, meta = artifacts.load_artifact(path)
+    pd.testing.assert_frame_equal(loaded, df.reset_index(drop=True))
+    assert loaded["Recommendation"].dtype == FLAG_DTYPE
+    assert loaded["Performance_Level"].cat.ordered
+
+    assert loaded_bundle["rows"] == bundle["rows"]
+    assert loaded_bundle["columns"] == bundle["columns"]
+    pd.testing.assert_frame_equal(correlation(loaded_bundle), correlation(bundle))
+    assert loaded_bundle["topper"].label == bundle["topper"].label
+
+    assert formula == "training"
+    assert meta["rows"] == len(df) and meta["version"] == "v0001"
+    # JSON lists back to the cache key tuple
+    assert meta["dataset_key"] == key
+
+
+def test_only_the_newest_versions_are_kept(trained, monkeypatch):
+    df, bundle = trained
+    monkeypatch.setattr(artifacts, "KEEP_VERSIONS", 2)
+    paths = [artifacts.save_artifact(USER, df.head(10 * n), bundle, "training") for n in range(1, 5)]
+
+    assert artifacts.latest_version(USER) == paths[-1]
+    assert artifacts._versions(artifacts.user_dir(USER)) == ["v0003", "v0004"]
+    assert artifacts.load_artifact(paths[-1])[3]["rows"] == 40
+
+
+def test_missing_user_has_no_version():
+    assert artifacts.latest_version("nobody") is None
+
+
+def test_fitted_formula_is_registered_again_after_a_restart(trained):
+    df, bundle = trained
+    trainer = LeastSquaresTrainer(["Study_Hours", "Sleep_Hours", "Attendance_Percentage"]).fit(df)
+    name = trainer.register()
+    version, expected = formula_version(name), predict_marks(df, name)
+    path = artifacts.save_artifact(USER, df, bundle, name)
+
+    # fitted formulas only live in memory
+    del FORMULAS[name]
+    _, _, formula, meta = artifacts.load_artifact(path, data=False)
+
+    assert formula == name == meta["formula"]["name"]
+    assert formula_version(name) == version
+    np.testing.assert_array_equal(predict_marks(df, name), expected)
+
+
+def test_older_versions_are_upgraded(trained, artifact_root):
+    df, bundle = trained
+    path = artifacts.save_artifact(USER, df, bundle, "training")
+
+    # as saved before the advice bit flags and the ordered levels: text
+    # recommendations, unordered levels and raw moment sums in the bundle
+    old = readable(df).assign(
+        Performance_Level=df["Performance_Level"].astype(str).astype("category")
+    )
+    old.reset_index(drop=True).to_feather(f"{path}/data.arrow", compression="uncompressed")
+
+    values = df[bundle["columns"]].to_numpy(dtype="float64")
+    ones = np.ones_like(values)
+    old_bundle = {
+        key: value for key, value in bundle.items() if key not in ("moments", "topper")
+    }
+    old_bundle.update(
+        sums={"n": ones.T @ ones, "sx": values.T @ ones, "sxx": (values * values).T @ ones,
+              "sxy": values.T @ values},
+        topper=(bundle["topper"].value, bundle["topper"].label),
+        exports={"CSV": b"..."},
+    )
+    with open(f"{path}/insights.pkl", "wb") as f:
+        pickle.dump(old_bundle, f)
+
+    loaded, loaded_bundle, _, _ = artifacts.load_artifact(path)
+    assert "exports" not in loaded_bundle
+    assert loaded_bundle["topper"].label == bundle["topper"].label
+    pd.testing.assert_frame_equal(correlation(loaded_bundle), correlation(bundle), rtol=1e-6)
+
+    assert loaded["Recommendation"].dtype == FLAG_DTYPE
+    np.testing.assert_array_equal(loaded["Recommendation"].to_numpy(), df["Recommendation"].to_numpy())
+    assert loaded["Performance_Level"].cat.ordered
+    assert list(loaded["Performance_Level"].cat.categories) == LEVELS
+    assert loaded["Performance_Level"].astype(str).tolist() == df["Performance_Level"].astype(str).tolist()
+
+
+def test_free_text_recommendations_are_kept_as_text():
+    old = pd.DataFrame({"Recommendation": ["Call the parents", "Maintain current study routine"]})
+    assert artifacts._upgrade(old)["Recommendation"].tolist() == old["Recommendation"].tolist()
@@ -0,0 +1,127 @@
+"""
+batch_score.py: sharded runs against one unsharded pass over each file.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch_score
+from benchmark import synthetic_students
+from datasets import ARROW_AVAILABLE
+
+ROWS = 3_000
+
+
+def _students(names=None):
+    df = synthetic_students(ROWS, seed=3)
+    if names is not None:
+        df["Student_Name"] = [names(i) for i in range(ROWS)]
+    return df
+
+
+def _score(tmp_path, df, fmt, shard_bytes, name):
+    source = tmp_path / f"{name}.csv"
+    df.to_csv(source, index=False)
+    out = tmp_path / f"out_{name}"
+    assert batch_score.run([str(source)], "train", fmt, str(out), 2, shard_bytes) == 0
+    target = batch_score.output_path(str(source), str(out), fmt)
+    return pd.read_csv(target) if fmt == "csv" else pd.read_parquet(target)
+
+
+def _assert_same_output(tmp_path, df, fmt, shard_bytes):
+    whole = _score(tmp_path, df, fmt, 1 << 40, "whole")
+    sharded = _score(tmp_path, df, fmt, shard_bytes, "sharded")
+    assert len(sharded) == len(df)
+    # shards can pick other compact dtypes (uint8 vs float32), not other values
+    pd.testing.assert_frame_equal(
+        sharded.astype({col: "float64" for col in sharded.select_dtypes("number")}),
+        whole.astype({col: "float64" for col in whole.select_dtypes("number")}),
+        check_dtype=False, check_categorical=False
+    )
+    return sharded
+
+
+FORMATS = ["csv"] + (["parquet"] if ARROW_AVAILABLE else [])
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_byte_ranges_match_an_unsharded_run(tmp_path, fmt):
+    df = _students()
+    source = tmp_path / "plain.csv"
+    df.to_csv(source, index=False)
+    assert not batch_score.has_quotes(str(source))
+    assert len(batch_score.csv_shards(str(source), 20_000)) > 5
+
+    sharded = _assert_same_output(tmp_path, df, fmt, 20_000)
+    assert sharded["Student_ID"].tolist() == df["Student_ID"].tolist()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("names", [
+    lambda i: f"Student, {i}",
+    lambda i: f"Student {i}\n(transfer)" if i % 7 == 0 else f"Student {i}",
+    lambda i: f'"Student" {i}\r\nline two' if i % 11 == 0 else f"Student {i}",
+], ids=["commas", "newlines", "quotes-crlf"])
+def test_row_chunks_match_an_unsharded_run(tmp_path, fmt, names):
+    df = _students(names)
+    source = tmp_path / "quoted.csv"
+    df.to_csv(source, index=False)
+    assert batch_score.has_quotes(str(source))
+
+    sharded = _assert_same_output(tmp_path, df, fmt, 20_000)
+    assert sharded["Student_Name"].tolist() == df["Student_Name"].tolist()
+
+
+def test_byte_ranges_start_on_a_row(tmp_path):
+    source = tmp_path / "plain.csv"
+    _students().to_csv(source, index=False)
+    data = source.read_bytes()
+    ranges = batch_score.csv_shards(str(source), 7_000)
+    assert ranges[0][0] == data.index(b"\n") + 1
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+
+
+@pytest.mark.skipif(not ARROW_AVAILABLE, reason="needs pyarrow")
+def test_merge_parts_widens_shard_dtypes(tmp_path):
+    # one shard of whole numbers (uint8), one with fractions (float32)
+    whole = pd.DataFrame({"Study_Hours": np.array([1, 2], dtype="uint8"), "Student_Name": ["a", "b"]})
+    fractions = pd.DataFrame({"Study_Hours": np.array([2.5, 3.5], dtype="float32"), "Student_Name": ["c", "d"]})
+    parts = []
+    for i, part in enumerate((whole, fractions)):
+        parts.append(str(tmp_path / f"part{i}.parquet"))
+        part.to_parquet(parts[-1], index=False)
+
+    target = str(tmp_path / "merged.parquet")
+    batch_score.merge_parts(parts, target, "parquet")
+    merged = pd.read_parquet(target)
+    assert merged["Study_Hours"].tolist() == [1.0, 2.0, 2.5, 3.5]
+    assert merged["Student_Name"].tolist() == ["a", "b", "c", "d"]
+
+
+def test_file_span_is_from_first_shard_start_to_last_shard_end():
+    shards = [
+        {"started_at": 100.0, "finished_at": 101.5},
+        {"started_at": 100.2, "finished_at": 103.0},
+        {"started_at": 101.6, "finished_at": 102.0},
+    ]
+    assert batch_score.file_span(shards) == pytest.approx(3.0)
+    assert batch_score.file_span([]) == 0.0
+
+
+def test_each_file_reports_its_own_wall_time(tmp_path, capsys):
+    big, small = tmp_path / "big.csv", tmp_path / "small.csv"
+    synthetic_students(60_000, seed=1).to_csv(big, index=False)
+    synthetic_students(500, seed=2).to_csv(small, index=False)
+
+    assert batch_score.run([str(big), str(small)], "bulk", "csv", str(tmp_path / "out"), 2, 1 << 40) == 0
+    lines = {line.split()[0]: line.split() for line in capsys.readouterr().out.splitlines()
+             if line.startswith(("big.csv", "small.csv"))}
+    # file, shards, rows, wall s, cpu s, rows/s
+    big_wall, small_wall = float(lines["big.csv"][3]), float(lines["small.csv"][3])
+    assert small_wall < big_wall
+    assert os.path.exists(batch_score.output_path(str(small), str(tmp_path / "out"), "csv"))
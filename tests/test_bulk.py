@@ -0,0 +1,103 @@
+"""
+Chunked bulk prediction against scoring the whole file at once.
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from bulk import read_result, stream_predictions
+from pipeline import BULK_REQUIRED, predict_bulk
+
+ROWS = 437
+
+
+@pytest.fixture(scope="module")
+def csv_bytes():
+    return synthetic_students(ROWS, seed=4).to_csv(index=False).encode()
+
+
+def _floats(df):
+    # a chunk can parse a column as int64 where the whole file has float64
+    return df.astype({col: "float64" for col in df.select_dtypes("number")})
+
+
+@pytest.mark.parametrize("chunksize", [1, 10, 100, ROWS - 1, ROWS, 10 * ROWS])
+def test_chunks_match_predict_bulk(csv_bytes, chunksize):
+    chunks = []
+    result, summary = stream_predictions(
+        io.BytesIO(csv_bytes), BULK_REQUIRED, chunksize=chunksize,
+        on_chunk=lambda summary, preview: chunks.append(summary["rows"])
+    )
+    try:
+        data = read_result(result)
+    finally:
+        result.close()
+
+    # one header row, however many chunks were appended
+    assert data.count(b"Student_ID,") == 1
+    assert data.startswith(b"Student_ID,")
+
+    expected = predict_bulk(pd.read_csv(io.BytesIO(csv_bytes)))
+    whole = pd.read_csv(io.BytesIO(expected.to_csv(index=False).encode()))
+    streamed = pd.read_csv(io.BytesIO(data))
+    pd.testing.assert_frame_equal(_floats(streamed), _floats(whole))
+
+    assert summary["rows"] == ROWS
+    assert summary["chunks"] == len(chunks) == -(-ROWS // chunksize)
+    assert summary["marks_sum"] == pytest.approx(expected["Predicted_Marks"].sum())
+    counts = expected["Performance_Level"].astype(str).value_counts()
+    assert {label: n for label, n in summary["levels"].items() if n} == counts.to_dict()
+
+
+def test_preview_is_the_head_of_the_first_chunk(csv_bytes):
+    previews = []
+    result, _ = stream_predictions(
+        io.BytesIO(csv_bytes), BULK_REQUIRED, chunksize=100,
+        on_chunk=lambda summary, preview: previews.append(preview)
+    )
+    result.close()
+    assert all(preview is previews[0] for preview in previews)
+    assert previews[0]["Student_ID"].tolist() == list(range(5))
+    assert "Predicted_Marks" in previews[0].columns
+
+
+def test_missing_columns_fail_on_the_first_chunk(csv_bytes):
+    df = pd.read_csv(io.BytesIO(csv_bytes)).drop(columns=["Sleep_Hours", "Exercise"])
+    seen = []
+    with pytest.raises(ValueError, match="Sleep_Hours, Exercise"):
+        stream_predictions(
+            io.BytesIO(df.to_csv(index=False).encode()), BULK_REQUIRED, chunksize=10,
+            on_chunk=lambda summary, preview: seen.append(summary["rows"])
+        )
+    assert seen == []
+
+
+def test_a_failing_callback_stops_the_run():
+    class Stop(Exception):
+        pass
+
+    seen = []
+
+    def on_chunk(summary, preview):
+        seen.append(summary["chunks"])
+        if summary["chunks"] == 3:
+            raise Stop()
+
+    source = io.BytesIO(synthetic_students(500).to_csv(index=False).encode())
+    with pytest.raises(Stop):
+        stream_predictions(source, BULK_REQUIRED, chunksize=50, on_chunk=on_chunk)
+    # stopped after the third of ten chunks
+    assert seen == [1, 2, 3]
+
+
+def test_read_result_leaves_the_result_readable(csv_bytes):
+    result, _ = stream_predictions(io.BytesIO(csv_bytes), BULK_REQUIRED, chunksize=200)
+    try:
+        first = read_result(result)
+        assert read_result(result) == first
+        assert not result.closed
+    finally:
+        result.close()
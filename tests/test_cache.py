@@ -0,0 +1,205 @@
+"""
+DatasetCache: memory budget, LRU eviction, Arrow spill / reload and the
+objects kept next to a frame.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache
+from cache import DatasetCache, frame_bytes, object_bytes
+from datasets import ARROW_AVAILABLE
+
+needs_arrow = pytest.mark.skipif(not ARROW_AVAILABLE, reason="needs pyarrow")
+
+
+def _frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"Study_Hours": rng.random(rows), "Student_Name": [f"S{i}" for i in range(rows)]})
+
+
+@pytest.fixture
+def frames():
+    # the same size each, so the budget below holds exactly two
+    return {name: _frame(1_000, seed) for seed, name in enumerate("abcd")}
+
+
+@pytest.fixture
+def store(tmp_path, frames):
+    return DatasetCache(2 * frame_bytes(frames["a"]) + 100, spill_dir=str(tmp_path / "spill"))
+
+
+# ------------------------------------------------
+# BUDGET / EVICTION
+# ------------------------------------------------
+def test_budget_counts_every_frame(store, frames):
+    store.put("a", frames["a"])
+    store.put("b", frames["b"])
+    stats = store.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == frame_bytes(frames["a"]) + frame_bytes(frames["b"]) <= stats["max_bytes"]
+
+    # putting a key again replaces the entry, not adds to it
+    store.put("a", frames["a"])
+    assert store.stats()["bytes"] == frame_bytes(frames["a"]) + frame_bytes(frames["b"])
+
+
+def test_least_recently_used_frame_goes_first(store, frames):
+    store.put("a", frames["a"])
+    store.put("b", frames["b"])
+    assert store.get("a") is frames["a"]      # b is now the oldest
+    store.put("c", frames["c"])
+
+    assert store.stats()["evictions"] == 1
+    assert list(store._entries) == ["a", "c"]
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_eviction_prefers_a_large_frame_among_the_oldest(tmp_path, frames):
+    big = _frame(3_000, seed=9)
+    store = DatasetCache(frame_bytes(big) + 2 * frame_bytes(frames["a"]) + 100, spill_dir=str(tmp_path))
+    store.put("a", frames["a"])
+    store.put("big", big)
+    store.put("b", frames["b"])
+    store.put("c", frames["c"])
+
+    # a is older, but one big frame goes instead of several small ones
+    assert "big" not in store._entries
+    assert list(store._entries) == ["a", "b", "c"]
+
+
+def test_get_or_compute_computes_once(store, frames):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return frames["a"]
+
+    assert store.get_or_compute("a", compute) is frames["a"]
+    assert store.get_or_compute("a", compute) is frames["a"]
+    assert calls == [1]
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+# ------------------------------------------------
+# SPILL / RELOAD
+# ------------------------------------------------
+@needs_arrow
+def test_evicted_frames_spill_to_arrow_and_reload(store, frames):
+    for name in "abc":
+        store.put(name, frames[name])
+    assert store.stats()["spilled_entries"] == 1
+    path, size = store._spilled["a"]
+    assert size == frame_bytes(frames["a"])
+
+    reloaded = store.get("a")
+    pd.testing.assert_frame_equal(reloaded, frames["a"])
+    stats = store.stats()
+    assert stats["reloads"] == 1 and stats["hits"] == 1
+    # back in memory as the newest entry, pushing out the oldest
+    assert list(store._entries)[-1] == "a"
+    assert stats["bytes"] <= store.max_bytes
+
+
+@needs_arrow
+def test_putting_a_spilled_key_again_removes_its_file(store, frames):
+    for name in "abc":
+        store.put(name, frames[name])
+    path, _ = store._spilled["a"]
+    store.put("a", frames["d"])
+    assert "a" not in store._spilled
+    assert store.get("a") is frames["d"]
+    assert not os.path.exists(path)
+
+
+@needs_arrow
+def test_frame_larger_than_the_budget_lives_on_disk_only(store, frames):
+    huge = _frame(5_000, seed=7)
+    store.put("huge", huge)
+    assert store.stats()["entries"] == 0 and store.stats()["bytes"] == 0
+    pd.testing.assert_frame_equal(store.get("huge"), huge)
+    assert store.stats()["entries"] == 0
+
+
+def test_without_arrow_evicted_frames_are_dropped(store, frames, monkeypatch):
+    monkeypatch.setattr(cache, "ARROW_AVAILABLE", False)
+    for name in "abc":
+        store.put(name, frames[name])
+    assert store.stats()["spilled_entries"] == 0
+    assert store.get("a") is None
+
+
+@needs_arrow
+def test_clear_removes_spill_files(store, frames):
+    for name in "abc":
+        store.put(name, frames[name])
+    path, _ = store._spilled["a"]
+    store.clear()
+    assert store.stats()["entries"] == store.stats()["spilled_entries"] == store.stats()["bytes"] == 0
+    assert not os.path.exists(path)
+
+
+# ------------------------------------------------
+# EXTRAS
+# ------------------------------------------------
+def test_extra_is_built_once_and_counted(store, frames):
+    store.put("a", frames["a"])
+    calls = []
+    bundle = {"marks": np.zeros(1_000), "names": ["x"] * 3}
+
+    def build():
+        calls.append(1)
+        return bundle
+
+    assert store.extra("a", "insights", build) is bundle
+    assert store.extra("a", "insights", build) is bundle
+    assert calls == [1]
+
+    size = object_bytes(bundle)
+    stats = store.stats()
+    assert stats["extra_bytes"] == size
+    assert stats["bytes"] == frame_bytes(frames["a"]) + size
+
+
+def test_extras_are_dropped_with_their_frame(store, frames):
+    store.put("a", frames["a"])
+    store.extra("a", "ranking", lambda: np.zeros(100))
+    store.put("b", frames["b"])
+    store.put("c", frames["c"])
+
+    assert "a" not in store._entries
+    assert store.stats()["extra_bytes"] == 0
+    assert store.stats()["bytes"] == frame_bytes(frames["b"]) + frame_bytes(frames["c"])
+
+
+def test_extras_can_push_their_frame_out(store, frames):
+    store.put("a", frames["a"])
+    store.put("b", frames["b"])
+    # a (older, and now larger with its extra) makes room
+    store.extra("a", "chart", lambda: np.zeros(frame_bytes(frames["a"]) // 8))
+    assert list(store._entries) == ["b"]
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_extra_of_a_frame_not_in_memory_is_not_kept(store):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return np.zeros(10)
+
+    store.extra("missing", "insights", build)
+    store.extra("missing", "insights", build)
+    assert calls == [1, 1]
+    assert store.stats()["extra_bytes"] == 0
+
+
+def test_object_bytes_counts_shared_objects_once():
+    marks = np.zeros(1_000)
+    assert object_bytes(marks) == marks.nbytes
+    assert object_bytes({"a": marks, "b": marks}) < 2 * marks.nbytes
+    frame = _frame(100)
+    assert object_bytes([frame]) >= frame_bytes(frame)
@@ -0,0 +1,75 @@
+"""
+LTTB downsampling against a plain loop over the textbook algorithm.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts import LINE_POINTS, actual_vs_predicted, lttb
+
+
+def lttb_reference(y, n_out):
+    # Steinarsson's Largest-Triangle-Three-Buckets, one point at a time
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return list(range(n))
+    every = (n - 2) / (n_out - 2)
+    keep = [0]
+    a = 0
+    for i in range(n_out - 2):
+        start = math.floor(i * every) + 1
+        stop = math.floor((i + 1) * every) + 1
+        next_start, next_stop = stop, min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(range(next_start, next_stop)) / (next_stop - next_start)
+        avg_y = sum(y[next_start:next_stop]) / (next_stop - next_start)
+
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    keep.append(n - 1)
+    return keep
+
+
+@pytest.mark.parametrize("n, n_out", [(1_000, 100), (5_003, 250), (12_345, 2_000), (101, 3)])
+def test_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    y = np.cumsum(rng.normal(size=n)) + 10 * np.sin(np.arange(n) / 50)
+    assert lttb(y, n_out).tolist() == lttb_reference(y.tolist(), n_out)
+
+
+def test_short_series_are_kept_whole():
+    assert lttb(np.arange(10.0), 20).tolist() == list(range(10))
+    assert lttb(np.arange(10.0), 2).tolist() == list(range(10))
+
+
+def test_keeps_spikes_and_ends():
+    y = np.zeros(10_000)
+    y[[1_234, 7_777]] = [50.0, -50.0]
+    keep = lttb(y, 100)
+    assert len(keep) == 100 and keep[0] == 0 and keep[-1] == len(y) - 1
+    assert {1_234, 7_777} <= set(keep.tolist())
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_missing_values_never_win():
+    y = np.arange(5_000, dtype="float64")
+    y[::3] = np.nan
+    keep = lttb(y, 200)
+    assert len(keep) == 200 and np.isnan(y[keep[1:-1]]).sum() == 0
+
+
+def test_large_comparison_chart_is_downsampled():
+    rows = 60_000
+    compare_df = pd.DataFrame({
+        "Actual Marks": np.random.default_rng(0).uniform(0, 100, rows),
+        "Predicted Marks": np.linspace(0, 100, rows),
+    })
+    fig = actual_vs_predicted(compare_df)
+    assert all(len(trace.y) <= LINE_POINTS for trace in fig.data)
@@ -0,0 +1,126 @@
+"""
+The compact student schema and the float32 handling in scoring.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datasets import (ARROW_AVAILABLE, EXPORT_FORMATS, STUDENT_COLUMNS, apply_schema,
+                      encode_dataset, read_dataset)
+from recommendations import FLAG_DTYPE, readable
+from scoring import _as_float64, predict_marks
+
+
+# ------------------------------------------------
+# APPLY_SCHEMA
+# ------------------------------------------------
+@pytest.mark.parametrize("values, dtype", [
+    ([0, 7, 255], "uint8"),
+    ([0.0, 7.0, 255.0], "uint8"),              # whole floats
+    ([True, False], "uint8"),
+    ([0, 7, 256], "float32"),                  # above uint8
+    ([-1, 7, 100], "float32"),                 # negative
+    ([6.5, 7.0, 8.0], "float32"),              # a fraction
+    ([6.0, np.nan, 8.0], "float32"),           # missing
+])
+def test_behavior_columns_pick_uint8_or_float32(values, dtype):
+    df = apply_schema(pd.DataFrame({"Study_Hours": values}))
+    assert df["Study_Hours"].dtype == dtype
+    np.testing.assert_array_equal(df["Study_Hours"].to_numpy(dtype="float64", na_value=np.nan),
+                                  np.asarray(values, dtype="float64"))
+
+
+def test_label_columns_become_categoricals():
+    df = apply_schema(pd.DataFrame({
+        "Student_ID": [3, 1, 3],
+        "Student_Name": ["Ana", "Ben", "Ana"],
+        "Performance_Level": ["Good Performer", None, "Good Performer"],
+    }))
+    for col in df.columns:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert df["Student_ID"].tolist() == [3, 1, 3]
+    assert df["Performance_Level"].isna().tolist() == [False, True, False]
+
+
+def test_other_columns_are_left_alone():
+    df = pd.DataFrame({"Study_Hours": ["a lot", "none"], "Class": ["7B", "7C"], "Score": [1.5, 2.5]})
+    out = apply_schema(df)
+    assert out.dtypes.to_dict() == df.dtypes.to_dict()
+
+
+def test_catalog_recommendations_become_bit_flags():
+    text = ["Maintain current study routine | Ensure adequate sleep", None,
+            "Immediate academic intervention required"]
+    df = apply_schema(pd.DataFrame({"Recommendation": text}))
+    assert df["Recommendation"].dtype == FLAG_DTYPE
+    assert readable(df)["Recommendation"].tolist() == [text[0], "", text[2]]
+
+
+def test_free_text_recommendations_stay_text():
+    df = apply_schema(pd.DataFrame({"Recommendation": ["Talk to the parents", None]}))
+    assert isinstance(df["Recommendation"].dtype, pd.CategoricalDtype)
+
+
+def test_schema_is_applied_once():
+    df = apply_schema(pd.DataFrame({"Study_Hours": [1.5], "Student_Name": ["Ana"]}))
+    assert apply_schema(df).dtypes.to_dict() == df.dtypes.to_dict()
+
+
+# ------------------------------------------------
+# READ / ENCODE
+# ------------------------------------------------
+def _students():
+    return pd.DataFrame({
+        "Student_ID": [1, 2, 3],
+        "Student_Name": ["Ana", "Ben", "Cy"],
+        "Study_Hours": [5.5, 6.0, 7.25],
+        "Attendance_Percentage": [80, 95, 100],
+        "Notes": ["x", "y", "z"],
+    })
+
+
+@pytest.mark.parametrize("fmt", EXPORT_FORMATS)
+def test_read_dataset_round_trip(fmt):
+    source = io.BytesIO(encode_dataset(_students(), fmt))
+    source.name = f"students.{fmt.lower()}"
+    df = read_dataset(source, columns=STUDENT_COLUMNS)
+
+    # only the wanted columns that exist, compact dtypes
+    assert set(df.columns) == {"Student_ID", "Student_Name", "Study_Hours", "Attendance_Percentage"}
+    assert df["Study_Hours"].dtype == "float32"
+    assert df["Attendance_Percentage"].dtype == "uint8"
+    assert isinstance(df["Student_Name"].dtype, pd.CategoricalDtype)
+    assert df["Study_Hours"].tolist() == [5.5, 6.0, 7.25]
+
+
+@pytest.mark.skipif(not ARROW_AVAILABLE, reason="needs pyarrow")
+def test_read_dataset_preview_rows():
+    source = io.BytesIO(encode_dataset(_students(), "Parquet"))
+    source.name = "students.parquet"
+    assert len(read_dataset(source, nrows=2)) == 2
+
+
+# ------------------------------------------------
+# FLOAT32 INPUTS IN SCORING
+# ------------------------------------------------
+def test_float32_inputs_are_rounded_to_four_decimals():
+    # float32 7.3 is 7.30000019...: scored as 7.3
+    values = np.array([7.3, 0.1, 1.23456, 2.00004, 1e-5], dtype="float32")
+    assert _as_float64(values).tolist() == [7.3, 0.1, 1.2346, 2.0, 0.0]
+
+    # float64 and integer inputs are taken as they are
+    assert _as_float64(np.array([1.23456])).tolist() == [1.23456]
+    assert _as_float64(np.array([3], dtype="uint8")).dtype == "float64"
+
+
+def test_float32_frames_score_like_the_rounded_float64_values():
+    raw = pd.DataFrame({
+        "Study_Hours": [7.3, 5.12345], "Sleep_Hours": [6.1, 8.0], "Attendance_Percentage": [80.5, 99.9],
+        "Attention_Level": [61.7, 40.0], "Previous_Marks": [70.2, 55.0],
+    })
+    compact = raw.astype("float32")
+    np.testing.assert_array_equal(predict_marks(compact, "training"),
+                                  predict_marks(raw.round(4), "training"))
@@ -0,0 +1,74 @@
+"""
+Insights scanned from scored files on disk against the in-memory bundle.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from datasets import ARROW_AVAILABLE, apply_schema
+from insights import build_insights, correlation, level_distribution, top_student
+
+pytestmark = pytest.mark.skipif(not ARROW_AVAILABLE, reason="needs pyarrow")
+
+
+def _scored(rows=3_000, seed=0):
+    from pipeline import train_dataset
+
+    return train_dataset(apply_schema(synthetic_students(rows, seed=seed)))
+
+
+def _write(df, path):
+    # the way batch_score.py writes its output: advice as text, shards
+    # merged without the pandas metadata (Student_ID comes back as int64)
+    from batch_score import merge_parts
+    from recommendations import readable
+
+    part = str(path) + ".part"
+    readable(df).to_parquet(part, index=False)
+    merge_parts([part], str(path), "parquet")
+    return str(path)
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    import engine
+
+    monkeypatch.setattr(engine, "_SCAN_OPTIONS", {**engine._SCAN_OPTIONS, "batch_size": 700})
+    engine._scans.clear()
+    yield engine
+    engine._scans.clear()
+
+
+def test_arrow_scan_matches_build_insights(tmp_path, small_batches):
+    df = _scored()
+    path = _write(df, tmp_path / "scored.parquet")
+
+    scanned = small_batches.scan_insights(path, "arrow")
+    expected = build_insights(df)
+
+    assert scanned["rows"] == expected["rows"]
+    assert scanned["columns"] == expected["columns"]
+    assert "Student_ID" not in scanned["columns"]
+    pd.testing.assert_frame_equal(correlation(scanned), correlation(expected), rtol=1e-9)
+    pd.testing.assert_frame_equal(
+        scanned["study_groups"], expected["study_groups"], check_index_type=False, rtol=1e-9
+    )
+    levels = [level_distribution(b).sort_values("Performance_Level", ignore_index=True) for b in (scanned, expected)]
+    pd.testing.assert_frame_equal(*levels, check_dtype=False)
+    assert top_student(scanned) == top_student(expected)
+
+
+def test_arrow_scan_keeps_the_first_of_tied_toppers(tmp_path, small_batches):
+    df = _scored(rows=2_000, seed=1)
+    best = df["Predicted_Marks"].max()
+    # the same top marks in a later batch and later in the first batch
+    marks = df["Predicted_Marks"].to_numpy().copy()
+    marks[[150, 40, 1_900]] = best
+    df = df.assign(Predicted_Marks=marks)
+    path = _write(df, tmp_path / "ties.parquet")
+
+    scanned = small_batches.scan_insights(path, "arrow")
+    first = df["Student_Name"].iat[int(np.argmax(marks))]
+    assert scanned["topper"].label == first == build_insights(df)["topper"].label
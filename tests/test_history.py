@@ -0,0 +1,116 @@
+"""
+StudentHistory against a row-by-row replay of the same uploads.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from datasets import ARROW_AVAILABLE
+from history import MISSING_KEY, StudentHistory, student_key, student_keys
+from scoring import FORMULAS, predict_marks
+
+FORMULA = "bulk"
+
+
+def _uploads():
+    """Weekly rosters: students join, leave and change their numbers."""
+    rng = np.random.default_rng(1)
+    week = synthetic_students(400, seed=1)
+    uploads = [week]
+    for n in range(4):
+        week = week.copy()
+        changed = rng.choice(len(week), 60, replace=False)
+        week.loc[week.index[changed], "Study_Hours"] += 1
+        week = week.iloc[rng.permutation(len(week))[:370]]
+        week = pd.concat([week, synthetic_students(30, seed=10 + n, start_id=1_000 + 100 * n)], ignore_index=True)
+        uploads.append(week)
+    # the same student several times in one upload: the last row wins
+    uploads.append(pd.concat([uploads[-1], uploads[-1].iloc[:5].assign(Sleep_Hours=1.0)], ignore_index=True))
+    return uploads
+
+
+def _replay(uploads):
+    """Reference: one dict per student, built row by row."""
+    columns = FORMULAS[FORMULA]["columns"]
+    latest, log = {}, {}
+    for run, df in enumerate(uploads):
+        marks = predict_marks(df, FORMULA)
+        last_row = {}
+        for row, (sid, values) in enumerate(zip(df["Student_ID"], df[columns].itertuples(index=False))):
+            last_row[sid] = (tuple(values), marks[row])
+        for sid, (values, mark) in last_row.items():
+            if sid not in latest or latest[sid][0] != values:
+                latest[sid] = (values, mark)
+                log.setdefault(sid, []).append((run, mark))
+    return latest, log
+
+
+def _rescore_all(store, uploads):
+    results = []
+    for run, df in enumerate(uploads):
+        results.append(store.rescore(df, FORMULA, source=f"week {run}", source_key=f"k{run}"))
+    return results
+
+
+def _assert_state(store, latest, log):
+    for sid, (_, mark) in latest.items():
+        position = store.keys.get_loc(student_key(sid))
+        assert store.marks[position] == mark
+        history = store.history(sid)
+        assert list(zip(history["Run"], history["Predicted_Marks"])) == log[sid]
+
+
+def test_rescore_matches_scoring_every_row(tmp_path):
+    store = StudentHistory(str(tmp_path))
+    for df, (scored, stats) in zip(_uploads(), _rescore_all(store, _uploads())):
+        assert np.array_equal(scored["Predicted_Marks"].to_numpy(), predict_marks(df, FORMULA))
+        assert stats["reused"] + stats["rescored"] == len(df)
+
+
+def test_only_new_and_changed_rows_are_rescored(tmp_path):
+    uploads = _uploads()
+    store = StudentHistory(str(tmp_path))
+    results = _rescore_all(store, uploads)
+    assert results[0][1]["rescored"] == len(uploads[0])
+    # 30 new students, at most 60 changed ones
+    assert 30 <= results[1][1]["rescored"] <= 90
+    # resubmitting the last upload logs nothing new
+    _, again = store.rescore(uploads[-1], FORMULA, source_key=f"k{len(uploads) - 1}")
+    assert again["repeated"] and len(store.runs) == len(uploads)
+
+
+def test_history_matches_row_by_row_replay(tmp_path):
+    uploads = _uploads()
+    store = StudentHistory(str(tmp_path))
+    _rescore_all(store, uploads)
+    _assert_state(store, *_replay(uploads))
+
+
+@pytest.mark.skipif(not ARROW_AVAILABLE, reason="history is only persisted with pyarrow")
+def test_reload_replays_the_last_entry_per_student(tmp_path):
+    uploads = _uploads()
+    store = StudentHistory(str(tmp_path))
+    _rescore_all(store, uploads)
+
+    reloaded = StudentHistory(str(tmp_path))
+    assert reloaded.keys.equals(store.keys)
+    assert np.array_equal(reloaded.fingerprints, store.fingerprints)
+    assert np.array_equal(reloaded.marks, store.marks, equal_nan=True)
+    _assert_state(reloaded, *_replay(uploads))
+
+    # the reloaded store reuses the stored marks for an unchanged upload
+    _, stats = reloaded.rescore(uploads[-2], FORMULA)
+    assert stats["new"] == 0
+
+
+def test_student_keys_match_student_key():
+    ids = pd.Series(["17", " 42 ", "A-7", None, "x y"], dtype=object)
+    keys = student_keys(ids)
+    assert keys[3] == MISSING_KEY
+    assert [student_key(i) for i in ["17", "42", "A-7"]] == keys[:3].tolist()
+    assert keys[4] == student_key("x y")
+    # whole numbers key by value whatever their type
+    assert student_keys(pd.Series([17.0, 17.5]))[0] == student_keys(pd.Series([17]))[0] == 17
+    assert student_keys(pd.Series(["17", "A-7"], dtype="category")).tolist() == keys[[0, 2]].tolist()
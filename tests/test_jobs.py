@@ -0,0 +1,155 @@
+"""
+The background job runner: per-user fairness, cancellation and results.
+"""
+
+import threading
+
+import pytest
+
+from jobs import CANCELLED, DONE, FAILED, QUEUED, JobRunner
+
+TIMEOUT = 10
+
+
+def _wait(job, until=lambda job: not job.active):
+    for _ in range(TIMEOUT * 100):
+        if until(job):
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"{job.label} still {job.status}")
+
+
+def _started(job):
+    return _wait(job, lambda job: job.status != QUEUED)
+
+
+def _record(order):
+    def run(job, gate=None):
+        order.append(job.label)
+        if gate is not None:
+            assert gate.wait(TIMEOUT)
+        return job.label
+    return run
+
+
+def test_result_is_handed_over_and_the_inputs_dropped():
+    runner = JobRunner(1)
+
+    def run(job, a, b=0):
+        job.update(0.5, "Adding", partial=a)
+        return {"sum": a + b}
+
+    job = _wait(runner.submit("ana", "train", run, 2, b=3, label="Train Model"))
+    assert job.status == DONE and job.error is None
+    assert job.result == {"sum": 5}
+    assert job.progress == 1.0 and job.message == "Done"
+    assert job.details == {"partial": 2}
+    assert job.fn is None and job.args == () and job.kwargs == {}
+    assert runner.get(job.id) is job
+
+
+def test_a_failing_job_reports_its_error(capsys):
+    runner = JobRunner(1)
+
+    def run(job):
+        raise ValueError("CSV missing required columns")
+
+    job = _wait(runner.submit("ana", "bulk", run))
+    assert job.status == FAILED
+    assert job.error == "CSV missing required columns"
+    assert job.result is None
+
+
+def test_users_take_turns_for_a_worker():
+    runner = JobRunner(1)
+    order, gate = [], threading.Event()
+    run = _record(order)
+
+    # ana's first job holds the only worker while everyone queues up
+    first = _started(runner.submit("ana", "bulk", run, gate, label="ana 1"))
+    jobs = [
+        runner.submit("ana", "bulk", run, label="ana 2"),
+        runner.submit("ana", "bulk", run, label="ana 3"),
+        runner.submit("ben", "bulk", run, label="ben 1"),
+        runner.submit("cy", "bulk", run, label="cy 1"),
+        runner.submit("ben", "bulk", run, label="ben 2"),
+    ]
+    assert runner.stats()["queued"] == 5
+    gate.set()
+    for job in [first] + jobs:
+        _wait(job)
+
+    # users never served go first, then the one served least recently;
+    # each user's own jobs keep their order
+    assert order == ["ana 1", "ben 1", "cy 1", "ana 2", "ben 2", "ana 3"]
+
+
+def test_one_running_job_per_user():
+    runner = JobRunner(2)
+    order, gate = [], threading.Event()
+    run = _record(order)
+
+    first = _started(runner.submit("ana", "train", run, gate, label="ana 1"))
+    second = runner.submit("ana", "bulk", run, label="ana 2")
+    other = _wait(runner.submit("ben", "bulk", run, label="ben 1"))
+
+    # a worker is free, but ana already has a job running
+    assert other.status == DONE
+    assert second.status == QUEUED
+    gate.set()
+    _wait(first), _wait(second)
+    assert order == ["ana 1", "ben 1", "ana 2"]
+
+
+def test_cancel_a_queued_job():
+    runner = JobRunner(1)
+    gate = threading.Event()
+    blocker = _started(runner.submit("ana", "train", _record([]), gate))
+    queued = runner.submit("ana", "bulk", _record([]))
+
+    runner.cancel(queued.id)
+    # taken out of the line at once, without waiting for a worker
+    assert queued.status == CANCELLED and queued.message == "Cancelled"
+    assert runner.stats()["queued"] == 0
+    gate.set()
+    assert _wait(blocker).status == DONE
+    assert queued.started is None
+
+
+def test_cancel_a_running_job_at_its_next_update():
+    runner = JobRunner(1)
+    started, chunks = threading.Event(), []
+
+    def run(job):
+        started.set()
+        for chunk in range(1_000):
+            job.update(chunk / 1_000, f"Chunk {chunk}")
+            chunks.append(chunk)
+            threading.Event().wait(0.005)
+        return "finished"
+
+    job = runner.submit("ana", "bulk", run)
+    assert started.wait(TIMEOUT)
+    runner.cancel(job.id)
+    _wait(job)
+    assert job.status == CANCELLED
+    assert job.result is None
+    assert len(chunks) < 1_000
+
+    # the runner goes on with the next job
+    assert _wait(runner.submit("ana", "bulk", lambda job: "next")).result == "next"
+
+
+def test_cancel_unknown_job_is_ignored():
+    JobRunner(1).cancel("missing")
+
+
+@pytest.mark.parametrize("finished", [1, 3])
+def test_finished_jobs_are_forgotten_after_keep_finished(monkeypatch, finished):
+    import jobs
+
+    monkeypatch.setattr(jobs, "KEEP_FINISHED", finished)
+    runner = JobRunner(1)
+    done = [_wait(runner.submit("ana", "bulk", lambda job: None)) for _ in range(4)]
+    kept = [job for job in done if runner.get(job.id) is not None]
+    assert kept == done[-finished:]
@@ -0,0 +1,108 @@
+"""
+RankingIndex against brute-force sorts and counts over the same frame.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from datasets import apply_schema
+from pipeline import train_dataset
+from ranking import AT_RISK_MARKS, RankingIndex, cohort_columns, ranked_frame
+
+
+@pytest.fixture(scope="module")
+def trained():
+    df = train_dataset(synthetic_students(2_000, seed=5))
+    # unscored rows, shared names and tied marks
+    df.loc[df.index[::97], "Predicted_Marks"] = np.nan
+    df.loc[df.index[1::50], "Student_Name"] = "Sam Lee"
+    df.loc[df.index[3::40], "Predicted_Marks"] = 70.0
+    return apply_schema(df)
+
+
+@pytest.fixture(scope="module")
+def ranking(trained):
+    return RankingIndex(trained)
+
+
+def _desc(marks):
+    """Row positions by marks, highest first, ties in row order, NaN left out."""
+    order = pd.Series(marks).sort_values(ascending=False, kind="stable", na_position="last")
+    return order.index[order.notna()].to_numpy()
+
+
+def test_order_is_a_stable_descending_sort(trained, ranking):
+    marks = trained["Predicted_Marks"].to_numpy(dtype="float64")
+    assert np.array_equal(ranking.order, _desc(marks))
+    assert ranking.scored == trained["Predicted_Marks"].notna().sum()
+
+
+@pytest.mark.parametrize("marks", [0.0, 54.99, 55.0, 70.0, 83.2, 100.0, 150.0])
+def test_rank_and_percentile_match_counts(trained, ranking, marks):
+    scored = trained["Predicted_Marks"].dropna()
+    assert ranking.rank_of(marks) == 1 + (scored > marks).sum()
+    assert ranking.percentile_of(marks) == pytest.approx(100 * (scored <= marks).mean())
+
+
+def test_top_and_bottom(trained, ranking):
+    order = _desc(trained["Predicted_Marks"].to_numpy(dtype="float64"))
+    assert np.array_equal(ranking.top(25), order[:25])
+    assert np.array_equal(ranking.bottom(25), order[::-1][:25])
+
+
+@pytest.mark.parametrize("k", [1, 10, 500])
+def test_top_and_bottom_of_a_subset(trained, ranking, k):
+    positions = np.arange(3, len(trained), 3)
+    marks = trained["Predicted_Marks"].to_numpy(dtype="float64")
+    order = positions[_desc(marks[positions])]
+    assert np.array_equal(ranking.top(k, positions), order[:k])
+    assert np.array_equal(ranking.bottom(k, positions), order[::-1][:k])
+
+
+def test_find_by_id_then_name(trained, ranking):
+    assert ranking.find(str(trained["Student_ID"].iat[42])).tolist() == [42]
+    assert ranking.find(f" {trained['Student_ID'].iat[7]} ").tolist() == [7]
+    names = trained["Student_Name"].astype(str)
+    assert ranking.find("Sam Lee").tolist() == np.flatnonzero(names == "Sam Lee").tolist()
+    assert len(ranking.find("nobody")) == 0 and len(ranking.find("  ")) == 0
+
+
+def test_cohort_leaderboards_and_ranks(trained, ranking):
+    assert "Performance_Level" in cohort_columns(trained)
+    marks = trained["Predicted_Marks"].to_numpy(dtype="float64")
+    levels = trained["Performance_Level"].astype(str).to_numpy()
+
+    assert sorted(ranking.cohorts("Performance_Level")) == sorted(set(levels[~np.isnan(marks)]))
+    for level in ranking.cohorts("Performance_Level"):
+        members = np.flatnonzero(levels == level)
+        order = members[_desc(marks[members])]
+        assert np.array_equal(ranking.leaderboard(10, "Performance_Level", level), order[:10])
+        assert np.array_equal(ranking.leaderboard(10, "Performance_Level", level, bottom=True), order[::-1][:10])
+        for position in members[:20]:
+            expected = None if np.isnan(marks[position]) else 1 + (marks[order] > marks[position]).sum()
+            assert ranking.cohort_rank("Performance_Level", position) == expected
+    assert len(ranking.leaderboard(10, "Performance_Level", "no such level")) == 0
+
+
+@pytest.mark.parametrize("below", [0.0, 40.0, AT_RISK_MARKS, 70.0, 101.0])
+def test_at_risk_is_everyone_below_lowest_first(trained, ranking, below):
+    marks = trained["Predicted_Marks"].to_numpy(dtype="float64")
+    order = _desc(marks)
+    expected = order[marks[order] < below][::-1]
+    assert np.array_equal(ranking.at_risk(below), expected)
+
+
+def test_ranked_frame(trained, ranking):
+    frame = ranked_frame(trained, ranking, ranking.top(5))
+    assert frame["Rank"].tolist() == [ranking.rank_of(m) for m in frame["Predicted_Marks"]]
+    assert frame["Rank"].iat[0] == 1
+
+
+def test_nbytes_counts_lazy_cohorts(trained):
+    ranking = RankingIndex(trained)
+    before = ranking.nbytes
+    ranking.leaderboard(5, "Performance_Level", ranking.cohorts("Performance_Level")[0])
+    built = sum(a.nbytes for _, *arrays in ranking._cohorts.values() for a in arrays)
+    assert before >= built > 0 and ranking.nbytes == before
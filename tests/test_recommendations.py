@@ -0,0 +1,104 @@
+"""
+Bitmask recommendations against the original row-by-row rules.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from datasets import apply_schema
+from pipeline import train_dataset
+from recommendations import (
+    ADVICE, RECOMMENDATION_COLUMN, advice_counts, decode_recommendations, encode_recommendations,
+    generate_recommendations, given_advice, readable
+)
+
+
+def generate_recommendation(row):
+    # the per-row rules of the original Train Model page
+    rec = []
+    if row["Performance_Level"] == "Excellent Performer":
+        rec.append("Maintain current study routine")
+        if row["Attention_Level"] < 70:
+            rec.append("Improve focus consistency")
+        if row["Sleep_Hours"] < 7:
+            rec.append("Ensure adequate sleep")
+    elif row["Performance_Level"] == "Average Performer":
+        rec.append("Increase academic consistency")
+        if row["Study_Hours"] < 6:
+            rec.append("Increase study hours")
+        if row["Attention_Level"] < 65:
+            rec.append("Reduce distractions and improve focus")
+        if row["Attendance_Percentage"] < 80:
+            rec.append("Improve class attendance")
+    else:
+        rec.append("Immediate academic intervention required")
+        if row["Study_Hours"] < 6:
+            rec.append("Significantly increase study hours")
+        if row["Sleep_Hours"] < 7:
+            rec.append("Improve sleep routine")
+        if row["Attention_Level"] < 60:
+            rec.append("Work on concentration techniques")
+        if row["Attendance_Percentage"] < 75:
+            rec.append("Attend classes regularly")
+    return " | ".join(rec)
+
+
+def _students():
+    df = synthetic_students(5_000, seed=2)
+    # values exactly on every threshold, and missing ones
+    df.loc[df.index[:40], "Attention_Level"] = [60, 65, 70] * 13 + [60]
+    df.loc[df.index[40:60], "Sleep_Hours"] = 7.0
+    df.loc[df.index[60:80], "Study_Hours"] = 6.0
+    df.loc[df.index[80:100], "Attendance_Percentage"] = [75, 80] * 10
+    df["Sleep_Hours"] = df["Sleep_Hours"].astype("float64")
+    df.loc[df.index[100:110], "Sleep_Hours"] = np.nan
+    return df
+
+
+def test_text_matches_row_by_row_rules():
+    df = train_dataset(_students())
+    expected = df.apply(generate_recommendation, axis=1)
+    assert readable(df)[RECOMMENDATION_COLUMN].astype(str).tolist() == expected.tolist()
+
+
+def test_compact_schema_gives_the_same_text():
+    raw = train_dataset(_students())
+    compact = train_dataset(apply_schema(_students()))
+    assert readable(compact)[RECOMMENDATION_COLUMN].astype(str).tolist() == \
+        raw.apply(generate_recommendation, axis=1).tolist()
+
+
+@pytest.mark.parametrize("level", ["Excellent Performer", "Good Performer", "Average Performer", "Needs Improvement"])
+def test_every_level_and_unknown_labels(level):
+    df = _students().assign(Performance_Level=level)
+    flags = generate_recommendations(df)
+    expected = df.apply(generate_recommendation, axis=1)
+    assert [str(t) for t in decode_recommendations(flags)] == expected.tolist()
+
+
+def test_encode_round_trips_the_text():
+    df = train_dataset(_students())
+    text = readable(df)[RECOMMENDATION_COLUMN]
+    assert np.array_equal(encode_recommendations(text.astype(str)), df[RECOMMENDATION_COLUMN].to_numpy())
+    assert encode_recommendations(pd.Series(["Maintain current study routine | Not advice"])) is None
+    assert encode_recommendations(pd.Series([None], dtype=object)).tolist() == [0]
+
+
+def test_queries_match_substring_search():
+    df = train_dataset(_students())
+    text = df.apply(generate_recommendation, axis=1).str.split(" | ", regex=False)
+    flags = df[RECOMMENDATION_COLUMN].to_numpy()
+
+    counts = advice_counts(flags)
+    for advice in ADVICE:
+        given = text.map(lambda messages: advice in messages)
+        assert counts[advice] == given.sum()
+        assert np.array_equal(given_advice(flags, [advice]), given.to_numpy())
+
+    pair = ["Improve sleep routine", "Attend classes regularly"]
+    both = text.map(lambda messages: all(a in messages for a in pair)).to_numpy()
+    either = text.map(lambda messages: any(a in messages for a in pair)).to_numpy()
+    assert np.array_equal(given_advice(flags, pair), both)
+    assert np.array_equal(given_advice(flags, pair, match="any"), either)
@@ -0,0 +1,164 @@
+"""
+The shared scoring engine against the original per-page formulas.
+
+The reference expressions below are the ones the pages used before the
+engine existed; marks must match them exactly, not just approximately,
+or rows on a band bound or a rounding tie change level or value.
+"""
+
+import io
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datasets import read_dataset
+from scoring import PERFORMANCE_BANDS, performance_levels, predict_marks, score, score_one
+from whatif import SLIDERS, score_grid
+
+
+def training_marks(d):
+    return (
+        0.35 * d["Study_Hours"] * 10 +
+        0.20 * d["Sleep_Hours"] * 10 +
+        0.20 * d["Attendance_Percentage"] / 10 +
+        0.15 * d["Attention_Level"] +
+        0.10 * d["Previous_Marks"]
+    )
+
+
+def bulk_marks(d):
+    marks = (
+        0.25 * d["Study_Hours"] * 5 +
+        0.15 * d["Sleep_Hours"] * 4 +
+        0.10 * (6 - d["Play_Hours"]).clip(0) * 3 +
+        0.10 * d["Exercise"] * 3 +
+        0.25 * d["Attendance_Percentage"] * 0.3 +
+        0.15 * d["Attention_Level"] * 4
+    )
+    return marks.clip(0, 100).round(2)
+
+
+def individual_marks(d):
+    return (
+        0.35 * d["Study_Hours"] * 10 +
+        0.20 * d["Sleep_Hours"] * 10 +
+        0.20 * (100 - d["Social_Media_Hours"] * 10) / 10 +
+        0.15 * d["Attention_Level"] * 10 +
+        0.10 * d["Exercise"] * 10
+    )
+
+
+def recommendation_marks(d):
+    return (
+        0.30 * d["Study_Hours"] * 10 +
+        0.20 * d["Sleep_Hours"] * 10 +
+        0.15 * d["Attention_Level"] * 10 +
+        0.15 * d["Exercise"] * 10 +
+        0.10 * (6 - d["Play_Hours"]) * 10 +
+        0.10 * (6 - d["Social_Media_Hours"]) * 10
+    )
+
+
+def performance_level(marks):
+    if marks >= 85:
+        return "Excellent Performer"
+    elif marks >= 70:
+        return "Good Performer"
+    elif marks >= 55:
+        return "Average Performer"
+    return "Needs Improvement"
+
+
+REFERENCES = {"training": training_marks, "bulk": bulk_marks}
+
+
+def _random_students(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Study_Hours": rng.uniform(0, 12, rows),
+        "Sleep_Hours": rng.uniform(0, 10, rows),
+        "Play_Hours": rng.uniform(0, 8, rows),
+        "Exercise": rng.uniform(0, 7, rows),
+        "Attendance_Percentage": rng.uniform(0, 100, rows),
+        "Attention_Level": rng.uniform(0, 10, rows),
+        "Previous_Marks": rng.uniform(0, 100, rows),
+    })
+
+
+def _csv_students():
+    # one decimal for hours, whole numbers elsewhere - where ties on the
+    # band bounds and on the second decimal are common
+    df = _random_students(seed=1)
+    for col in df.columns:
+        df[col] = df[col].round(1 if col.endswith("_Hours") or col == "Exercise" else 0)
+    return df
+
+
+def _assert_same(df, formula, reference_df=None):
+    expected = REFERENCES[formula](df if reference_df is None else reference_df).to_numpy()
+    scored = score(df, formula)
+    assert np.array_equal(scored["Predicted_Marks"].to_numpy(), expected)
+    assert scored["Performance_Level"].astype(str).tolist() == [performance_level(m) for m in expected]
+
+
+@pytest.mark.parametrize("formula", sorted(REFERENCES))
+def test_random_rows_match_exactly(formula):
+    _assert_same(_random_students(), formula)
+
+
+@pytest.mark.parametrize("formula", sorted(REFERENCES))
+def test_csv_rows_match_exactly(formula):
+    df = _csv_students()
+    _assert_same(df, formula)
+    # parsed with the compact schema (float32 hours, small integer columns)
+    upload = io.BytesIO(df.to_csv(index=False).encode())
+    upload.name = "students.csv"
+    _assert_same(read_dataset(upload), formula, reference_df=df)
+
+
+def test_rows_on_the_band_bounds():
+    # training marks of exactly 85 / 70 / 55 (and just below)
+    df = pd.DataFrame({
+        "Study_Hours": [10.0, 10.0, 10.0, 10.0, 10.0, 10.0],
+        "Sleep_Hours": [5.0, 5.0, 0.0, 0.0, 0.0, 0.0],
+        "Attendance_Percentage": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        "Attention_Level": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        "Previous_Marks": [0.0, -0.1, 0.0, -0.1, -150.0, -150.1],
+    })
+    marks = predict_marks(df, "training")
+    assert np.array_equal(marks, training_marks(df).to_numpy())
+    levels = performance_levels(marks).astype(str).tolist()
+    assert levels == [performance_level(m) for m in marks]
+    assert [bound for bound, _ in PERFORMANCE_BANDS] == [85, 70, 55]
+
+
+def test_missing_inputs_score_as_needs_improvement():
+    df = _random_students(rows=3)
+    df.loc[1, "Sleep_Hours"] = np.nan
+    scored = score(df, "training")
+    assert np.isnan(scored["Predicted_Marks"].iat[1])
+    assert scored["Performance_Level"].iat[1] == "Needs Improvement"
+
+
+@pytest.fixture(scope="module")
+def slider_grid():
+    ranges = [range(low, high + 1) for low, high, *_ in SLIDERS.values()]
+    return pd.DataFrame(list(itertools.product(*ranges)), columns=list(SLIDERS))
+
+
+@pytest.mark.parametrize("formula, reference", [
+    ("individual", individual_marks),
+    ("recommendation", recommendation_marks),
+])
+def test_every_slider_combination_matches_exactly(slider_grid, formula, reference):
+    expected = reference(slider_grid).to_numpy()
+    marks = predict_marks(slider_grid, formula)
+    assert np.array_equal(marks, expected)
+    # the what-if grid is the same numbers, cell for cell
+    assert np.array_equal(score_grid(formula).reshape(-1), marks)
+
+    row = slider_grid.iloc[12_345]
+    value, level = score_one(formula, **row.to_dict())
+    assert value == expected[12_345] and level == performance_level(expected[12_345])
@@ -0,0 +1,116 @@
+"""
+Moments / RunningMax against pandas on the same rows.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats import Moments, RunningMax
+
+
+def _frame(rows=3_000, seed=0, offset=0.0):
+    rng = np.random.default_rng(seed)
+    a = rng.normal(offset, 1.0, rows)
+    df = pd.DataFrame({
+        "a": a,
+        "b": 2 * a + rng.normal(0, 0.5, rows),
+        "c": rng.uniform(0, 10, rows),
+        "d": rng.integers(0, 5, rows).astype("float64"),
+    })
+    # pairwise-complete statistics: a different set of rows missing per column
+    for col, every in (("a", 7), ("b", 11), ("c", 13)):
+        df.loc[df.index[::every], col] = np.nan
+    return df
+
+
+def _assert_matches(moments, df, atol=1e-9):
+    pd.testing.assert_frame_equal(moments.correlation(), df.corr(), atol=atol, rtol=0)
+    for col in df.columns:
+        assert moments.count(col) == df[col].count()
+        assert moments.mean(col) == pytest.approx(df[col].mean(), rel=1e-12, abs=1e-12)
+        assert moments.variance(col) == pytest.approx(df[col].var(), rel=1e-9)
+        assert moments.variance(col, ddof=0) == pytest.approx(df[col].var(ddof=0), rel=1e-9)
+
+
+def test_one_pass_matches_pandas():
+    df = _frame()
+    _assert_matches(Moments.of(df), df)
+
+
+def test_blocks_match_one_pass():
+    df = _frame()
+    _assert_matches(Moments.of(df, block_rows=97), df)
+
+
+def test_merged_shards_match_the_whole():
+    df = _frame()
+    shards = [df.iloc[:500], df.iloc[500:501], df.iloc[501:2_000], df.iloc[2_000:]]
+    merged = Moments.of(shards[0])
+    for shard in shards[1:]:
+        merged = merged.merge(Moments.of(shard))
+    _assert_matches(merged, df)
+
+
+def test_merge_leaves_both_sides_unchanged():
+    df = _frame()
+    left, right = Moments.of(df.iloc[:1_000]), Moments.of(df.iloc[1_000:])
+    before = left.n.copy(), left.means.copy()
+    left.merge(right)
+    assert np.array_equal(left.n, before[0]) and np.array_equal(left.means, before[1])
+
+
+def test_row_by_row_updates_match_pandas():
+    df = _frame(rows=300)
+    moments = Moments(df.columns)
+    for row in df.to_numpy():
+        moments.update(row)
+    _assert_matches(moments, df)
+
+
+def test_far_from_zero_stays_accurate():
+    # raw sums of x and x^2 lose every digit of the variance here; what is
+    # left is the rounding of the inputs themselves (1e9 + x keeps ~7 digits of x)
+    df = _frame(offset=1e9)
+    _assert_matches(Moments.of(df), df, atol=1e-6)
+
+
+def test_from_sums_matches_pandas():
+    df = _frame().fillna(0.0)
+    x = df.to_numpy()
+    ones = np.ones_like(x)
+    moments = Moments.from_sums(df.columns, ones.T @ ones, x.T @ ones, (x * x).T @ ones, x.T @ x)
+    pd.testing.assert_frame_equal(moments.correlation(), df.corr(), atol=1e-9, rtol=0)
+
+
+def test_too_few_rows_give_nan():
+    df = pd.DataFrame({"a": [1.0, np.nan], "b": [2.0, 3.0], "c": [5.0, 5.0]})
+    corr = Moments.of(df).correlation()
+    assert corr.isna().equals(df.corr().isna())
+
+
+def test_wrong_width_raises():
+    with pytest.raises(ValueError):
+        Moments(["a", "b"]).update(np.zeros((3, 3)))
+    with pytest.raises(ValueError):
+        Moments(["a"]).merge(Moments(["b"]))
+
+
+def test_running_max_matches_idxmax():
+    values = pd.Series([3.0, np.nan, 7.0, 1.0, 7.0, 2.0])
+    labels = pd.Series(list("abcdef"))
+    expected = labels[values.idxmax()]
+
+    assert RunningMax().update(values, labels).label == expected
+    # split anywhere and merged in row order: the earliest of a tie wins
+    for cut in range(len(values) + 1):
+        left = RunningMax().update(values[:cut], labels[:cut])
+        right = RunningMax().update(values[cut:].reset_index(drop=True), labels[cut:].reset_index(drop=True))
+        merged = left.merge(right)
+        assert (merged.value, merged.label) == (values.max(), expected)
+
+
+def test_running_max_ignores_missing():
+    topper = RunningMax().update([np.nan, np.nan], ["a", "b"])
+    assert topper.value is None and topper.label is None
+    assert topper.offer(None, "x").offer(float("nan"), "y").label is None
@@ -0,0 +1,105 @@
+"""
+Server-side table queries against plain pandas filtering and sorting.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from datasets import apply_schema
+from pipeline import train_dataset
+from recommendations import decode_recommendations
+from tables import query, sort_order
+
+
+@pytest.fixture(scope="module")
+def trained():
+    df = synthetic_students(2_000, seed=6)
+    df.loc[[3, 50], "Student_Name"] = None
+    df = train_dataset(apply_schema(df))
+    # a few unscored rows, for missing values in the range filter and sort
+    marks = df["Predicted_Marks"].to_numpy().copy()
+    marks[[7, 900]] = np.nan
+    return df.assign(Predicted_Marks=marks)
+
+
+def _text(df):
+    return pd.Series(decode_recommendations(df["Recommendation"].to_numpy()))
+
+
+def test_no_filters_is_every_row(trained):
+    np.testing.assert_array_equal(query(trained), np.arange(len(trained)))
+
+
+@pytest.mark.parametrize("search", ["student 12", "STUDENT 1", "  199 ", "nobody"])
+def test_search_names_and_ids(trained, search):
+    text = search.strip().lower()
+    names = trained["Student_Name"].astype(object).fillna("").astype(str).str.lower()
+    ids = trained["Student_ID"].astype(int).astype(str)
+    expected = np.flatnonzero(names.str.contains(text, regex=False) | ids.str.contains(text, regex=False))
+    np.testing.assert_array_equal(query(trained, search=search), expected)
+
+
+def test_range_filter_is_inclusive_and_skips_missing_marks(trained):
+    marks = trained["Predicted_Marks"]
+    low, high = float(marks.iloc[10]), float(marks.iloc[20])
+    low, high = min(low, high), max(low, high)
+    expected = np.flatnonzero(((marks >= low) & (marks <= high)).to_numpy())
+    positions = query(trained, marks_range=(low, high))
+    np.testing.assert_array_equal(positions, expected)
+    assert {10, 20} <= set(positions.tolist())
+    assert not {7, 900} & set(positions.tolist())
+
+
+@pytest.mark.parametrize("advice", [
+    ["Improve sleep routine"],
+    ["Significantly increase study hours", "Attend classes regularly"],
+    ["Maintain current study routine", "Improve sleep routine"],   # never together
+])
+def test_advice_filter_needs_every_message(trained, advice):
+    given = _text(trained).str.split(" | ", regex=False)
+    expected = np.flatnonzero(given.map(lambda told: all(a in told for a in advice)).to_numpy())
+    np.testing.assert_array_equal(query(trained, advice=advice), expected)
+
+
+def test_advice_filter_is_ignored_without_bit_flags(trained):
+    text = trained.assign(Recommendation=_text(trained))
+    np.testing.assert_array_equal(query(text, advice=["Improve sleep routine"]), np.arange(len(text)))
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("column", ["Predicted_Marks", "Student_Name", "Study_Hours", "Recommendation"])
+def test_sort_matches_a_stable_pandas_sort(trained, column, ascending):
+    values = _text(trained) if column == "Recommendation" else trained[column].reset_index(drop=True)
+    expected = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    np.testing.assert_array_equal(query(trained, sort_by=column, ascending=ascending), expected)
+    # missing values last either way
+    missing = int(values.isna().sum())
+    assert values.iloc[expected[len(expected) - missing:]].isna().all()
+
+
+def test_filters_combine_in_sort_order(trained):
+    advice = ["Significantly increase study hours"]
+    positions = query(trained, search="student 1", marks_range=(40.0, 60.0),
+                      sort_by="Predicted_Marks", ascending=False, advice=advice)
+
+    subset = trained.assign(told=_text(trained).str.contains(advice[0], regex=False).to_numpy())
+    names = subset["Student_Name"].astype(object).fillna("").astype(str).str.lower()
+    ids = subset["Student_ID"].astype(int).astype(str)
+    keep = ((names.str.contains("student 1", regex=False) | ids.str.contains("student 1", regex=False))
+            & subset["Predicted_Marks"].between(40.0, 60.0) & subset["told"])
+    expected = subset[keep.to_numpy()].reset_index().sort_values(
+        "Predicted_Marks", ascending=False, kind="stable")["index"].to_numpy()
+    assert len(positions)
+    np.testing.assert_array_equal(positions, expected)
+
+
+def test_results_and_sort_orders_are_cached_per_frame(trained):
+    first = query(trained, search="student 3", sort_by="Study_Hours")
+    assert query(trained, search=" Student 3 ", sort_by="Study_Hours") is first
+    assert sort_order(trained, "Study_Hours") is sort_order(trained, "Study_Hours")
+
+    # another frame object has its own indexes
+    other = trained.iloc[::-1].reset_index(drop=True)
+    assert sort_order(other, "Study_Hours") is not sort_order(trained, "Study_Hours")
@@ -0,0 +1,90 @@
+"""
+Streaming least squares against numpy's lstsq on the full design matrix.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import synthetic_students
+from scoring import FORMULAS, predict_marks
+from trainer import TARGET, LeastSquaresTrainer
+
+FEATURES = ["Study_Hours", "Sleep_Hours", "Attendance_Percentage", "Attention_Level", "Previous_Marks"]
+
+
+@pytest.fixture(scope="module")
+def students():
+    df = synthetic_students(20_000, seed=4).astype({TARGET: "float64", "Study_Hours": "float64"})
+    # incomplete rows are left out of the fit
+    df.loc[df.index[::101], TARGET] = np.nan
+    df.loc[df.index[5::211], "Study_Hours"] = np.nan
+    return df
+
+
+def _reference(df):
+    complete = df[FEATURES + [TARGET]].dropna()
+    X = np.column_stack([np.ones(len(complete)), complete[FEATURES].to_numpy(dtype="float64")])
+    y = complete[TARGET].to_numpy(dtype="float64")
+    beta = np.linalg.lstsq(X, y, rcond=None)[0]
+    residual = y - X @ beta
+    return beta, len(y), float(np.sqrt(np.mean(residual ** 2))), float(1 - residual @ residual / ((y - y.mean()) @ (y - y.mean())))
+
+
+def _assert_fit(trainer, df):
+    beta, rows, rmse, r2 = _reference(df)
+    intercept, weights = trainer.coefficients()
+    np.testing.assert_allclose(np.concatenate([[intercept], weights]), beta, rtol=1e-7, atol=1e-9)
+    metrics = trainer.metrics()
+    assert metrics["rows"] == rows
+    assert metrics["rmse"] == pytest.approx(rmse, rel=1e-6)
+    assert metrics["r2"] == pytest.approx(r2, rel=1e-6)
+
+
+def test_fit_matches_lstsq(students):
+    _assert_fit(LeastSquaresTrainer(FEATURES).fit(students), students)
+
+
+def test_chunks_and_merged_shards_match_one_fit(students):
+    _assert_fit(LeastSquaresTrainer(FEATURES).fit(students, chunk_rows=777), students)
+    _assert_fit(LeastSquaresTrainer(FEATURES).fit_chunks(students.iloc[start:start + 4_001] for start in range(0, len(students), 4_001)), students)
+
+    left = LeastSquaresTrainer(FEATURES).fit(students.iloc[:6_000])
+    right = LeastSquaresTrainer(FEATURES).fit(students.iloc[6_000:])
+    _assert_fit(left.merge(right), students)
+
+
+def test_recovers_exact_weights():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(0, 10, (500, len(FEATURES))), columns=FEATURES)
+    weights = np.array([3.0, 2.0, 0.2, 0.15, 0.1])
+    df[TARGET] = 5.0 + df[FEATURES].to_numpy() @ weights
+    intercept, fitted = LeastSquaresTrainer(FEATURES).fit(df).coefficients()
+    assert intercept == pytest.approx(5.0, abs=1e-8)
+    np.testing.assert_allclose(fitted, weights, atol=1e-9)
+    assert LeastSquaresTrainer(FEATURES).fit(df).metrics()["rmse"] < 1e-6
+
+
+def test_collinear_columns_still_solve(students):
+    df = students.assign(Copy=students["Sleep_Hours"] * 2)
+    trainer = LeastSquaresTrainer(FEATURES + ["Copy"]).fit(df)
+    complete = df[FEATURES + ["Copy", TARGET]].dropna()
+    intercept, weights = trainer.coefficients()
+    fitted = intercept + complete[FEATURES + ["Copy"]].to_numpy(dtype="float64") @ weights
+    reference = _reference(students)[2]
+    assert np.sqrt(np.mean((complete[TARGET].to_numpy() - fitted) ** 2)) == pytest.approx(reference, rel=1e-6)
+
+
+def test_too_few_rows_raise():
+    df = synthetic_students(5, seed=1)
+    with pytest.raises(ValueError):
+        LeastSquaresTrainer(FEATURES).fit(df).coefficients()
+
+
+def test_registered_formula_scores_with_the_fitted_weights(students):
+    trainer = LeastSquaresTrainer(FEATURES).fit(students)
+    name = trainer.register()
+    intercept, weights = trainer.coefficients()
+    assert FORMULAS[name]["columns"] == FEATURES
+    expected = intercept + students[FEATURES].to_numpy(dtype="float64") @ weights
+    np.testing.assert_allclose(predict_marks(students, name), expected, rtol=1e-12, atol=1e-9)
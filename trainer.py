@@ -0,0 +1,132 @@
+"""
+StudyTrack AI - least-squares trainer for the Train Model weights.
+
+Fits Final_Marks ~ intercept + sum(weight * feature) by accumulating the
+normal equations (X'X and X'y) one chunk at a time. Only O(features^2)
+numbers are kept, so the data never has to be in memory at once, new rows
+can be folded in later, and accumulators from separate shards can be
+merged before solving.
+"""
+
+import hashlib
+import time
+
+import numpy as np
+
+from scoring import column_matrix, register_formula
+
+TARGET = "Final_Marks"
+CHUNK_ROWS = 500_000
+
+
+class LeastSquaresTrainer:
+    """Streaming ordinary least squares with an intercept."""
+
+    def __init__(self, features, target=TARGET):
+        self.features = list(features)
+        self.target = target
+        k = len(self.features) + 1
+        self.xtx = np.zeros((k, k))
+        self.xty = np.zeros(k)
+        self.yty = 0.0
+        self.n = 0
+        self.fit_seconds = 0.0
+
+    def partial_fit(self, df):
+        """Add the complete rows of one chunk to the accumulators."""
+        started = time.perf_counter()
+
+        X = column_matrix(df, self.features)
+        y = column_matrix(df, [self.target])[:, 0]
+        ok = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+        X = np.column_stack([np.ones(ok.sum()), X[ok]])
+        y = y[ok]
+
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.yty += float(y @ y)
+        self.n += len(y)
+
+        self.fit_seconds += time.perf_counter() - started
+        return self
+
+    def fit(self, df, chunk_rows=CHUNK_ROWS):
+        for start in range(0, len(df), chunk_rows):
+            self.partial_fit(df.iloc[start:start + chunk_rows])
+        return self
+
+    def fit_chunks(self, chunks):
+        """Accumulate from any iterable of frames, e.g. read_csv(chunksize=...)."""
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def merge(self, other):
+        """Combine with a trainer fitted on other rows (same features)."""
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.yty += other.yty
+        self.n += other.n
+        self.fit_seconds += other.fit_seconds
+        return self
+
+    # ------------------------------------------------
+    # SOLUTION + METRICS
+    # ------------------------------------------------
+    def coefficients(self):
+        """(intercept, weights) minimizing the squared error."""
+        if self.n <= len(self.features):
+            raise ValueError(
+                f"Need more than {len(self.features)} complete rows with {self.target} to fit, got {self.n}"
+            )
+        # lstsq copes with collinear / constant columns
+        beta = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return float(beta[0]), beta[1:]
+
+    def metrics(self):
+        """RMSE and R^2 on the accumulated rows, computed from the sums."""
+        intercept, weights = self.coefficients()
+        beta = np.concatenate([[intercept], weights])
+
+        sse = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        sse = max(float(sse), 0.0)
+        mean_y = self.xty[0] / self.n
+        sst = self.yty - self.n * mean_y ** 2
+
+        return {
+            "rows": self.n,
+            "rmse": float(np.sqrt(sse / self.n)),
+            "r2": float(1 - sse / sst) if sst > 0 else float("nan"),
+            "fit_seconds": self.fit_seconds,
+        }
+
+    def register(self, base_name="fitted"):
+        """
+        Register the fitted weights as a scoring formula and return its
+        name. The name includes a digest of the weights, so sessions with
+        different data never overwrite each other's formula.
+        """
+        intercept, weights = self.coefficients()
+        digest = hashlib.sha1(
+            repr((self.features, intercept, weights.tolist())).encode()
+        ).hexdigest()[:10]
+
+        name = f"{base_name}-{digest}"
+        register_formula(
+            name,
+            list(zip(self.features, weights.tolist())),
+            intercept=intercept
+        )
+        return name
+
+
+# fitted trainers by (dataset content hash, features) - retraining the
+# same upload reuses the fit instead of another pass over the rows
+_FITTED = {}
+
+
+def fit_cached(key, df, features, target=TARGET):
+    cache_key = (key, tuple(features), target)
+    if cache_key not in _FITTED:
+        _FITTED[cache_key] = LeastSquaresTrainer(features, target).fit(df)
+    return _FITTED[cache_key]
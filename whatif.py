@@ -0,0 +1,269 @@
+"""
+StudyTrack AI - what-if explorer for the slider formulas.
+
+The Student / Recommendation sliders span a small integer grid
+(13 x 11 x 7 x 7 x 8 x 11 = 616,616 combinations). Every formula term
+depends on one slider only, so the marks of the whole grid - or of any
+slice of it - are the per-slider term vectors broadcast against each
+other and summed: one array expression, no loop over combinations.
+
+Grids are cached per (formula version, varied sliders, fixed values), so
+changing a formula's weights gets new grids and moving a slider that the
+slice does not vary costs nothing.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from metrics import span
+from scoring import FORMULAS, PERFORMANCE_BANDS, add_terms, finish_marks, performance_levels
+
+# column -> (low, high, default, label), as on the pages' sliders
+SLIDERS = {
+    "Study_Hours": (0, 12, 5, "Study Hours"),
+    "Sleep_Hours": (0, 10, 7, "Sleep Hours"),
+    "Play_Hours": (0, 6, 2, "Play Hours"),
+    "Social_Media_Hours": (0, 6, 2, "Social Media Hours"),
+    "Exercise": (0, 7, 3, "Exercise (hrs/week)"),
+    "Attention_Level": (0, 10, 7, "Attention Level"),
+}
+DEFAULTS = {col: spec[2] for col, spec in SLIDERS.items()}
+LABELS = {col: spec[3] for col, spec in SLIDERS.items()}
+
+# grids kept in memory (the full 6-D grid is ~5 MB of float64)
+GRID_CACHE_ENTRIES = 32
+
+# +/- slider steps shown in the sensitivity table
+SENSITIVITY_STEPS = 3
+
+_grids = OrderedDict()
+_lock = threading.Lock()
+
+
+def axis_values(column):
+    low, high = SLIDERS[column][:2]
+    return np.arange(low, high + 1, dtype="float64")
+
+
+def formula_sliders(formula):
+    """Slider columns the formula actually scores, in slider order."""
+    columns = FORMULAS[formula]["columns"]
+    return [col for col in SLIDERS if col in columns]
+
+
+# ------------------------------------------------
+# GRID
+# ------------------------------------------------
+def score_grid(formula, axes=None, fixed=None):
+    """
+    Predicted marks over the grid of the sliders in axes (all sliders by
+    default), with every other formula input held at fixed[col] (slider
+    default if missing). Returns a read-only array, one dimension per axis
+    in the given order.
+    """
+    spec = FORMULAS[formula]
+    axes = tuple(SLIDERS) if axes is None else tuple(axes)
+    unknown = [col for col in axes if col not in SLIDERS]
+    if unknown:
+        raise ValueError(f"Not a slider: {', '.join(unknown)}")
+
+    held = {}
+    for col in spec["columns"]:
+        if col in axes:
+            continue
+        if fixed is not None and col in fixed:
+            held[col] = float(fixed[col])
+        elif col in DEFAULTS:
+            held[col] = float(DEFAULTS[col])
+        else:
+            raise ValueError(f"No value given for {col}")
+
+    key = (spec["version"], axes, tuple(sorted(held.items())))
+    with _lock:
+        grid = _grids.get(key)
+        if grid is not None:
+            _grids.move_to_end(key)
+            return grid
+
+    shape = tuple(len(axis_values(col)) for col in axes)
+    with span("whatif.grid") as s:
+        # each varied slider is a vector along its own dimension; the
+        # terms are added in formula order, exactly like score_one
+        inputs = dict(held)
+        for dim, col in enumerate(axes):
+            if col in spec["columns"]:
+                inputs[col] = axis_values(col).reshape([-1 if d == dim else 1 for d in range(len(axes))])
+        marks = np.asarray(add_terms(formula, inputs), dtype="float64")
+
+        # sliders the formula ignores stay broadcast views, not copies
+        grid = np.broadcast_to(finish_marks(marks, formula), shape)
+        grid.flags.writeable = False
+        s.rows = grid.size
+
+    with _lock:
+        _grids[key] = grid
+        while len(_grids) > GRID_CACHE_ENTRIES:
+            _grids.popitem(last=False)
+    return grid
+
+
+def score_at(formula, values):
+    """Marks of one slider combination, read from the formula's grid."""
+    axes = formula_sliders(formula)
+    grid = score_grid(formula, axes, values)
+    index = tuple(int(values.get(col, DEFAULTS[col])) - SLIDERS[col][0] for col in axes)
+    return float(grid[index])
+
+
+def slice_frame(formula, x, y, values):
+    """2-D slice over sliders x and y, the rest held at values -> DataFrame (y rows, x columns)."""
+    grid = score_grid(formula, (y, x), values)
+    return pd.DataFrame(
+        grid,
+        index=pd.Index(axis_values(y).astype(int), name=y),
+        columns=pd.Index(axis_values(x).astype(int), name=x),
+    )
+
+
+def sensitivity(formula, values, steps=SENSITIVITY_STEPS):
+    """
+    Change in marks for moving each slider -steps..+steps from values, the
+    others held fixed -> DataFrame (slider rows, step columns). Steps that
+    leave the slider's range are NaN.
+    """
+    base = score_at(formula, values)
+    offsets = np.arange(-steps, steps + 1)
+
+    rows = {}
+    for col in formula_sliders(formula):
+        line = score_grid(formula, (col,), values)
+        position = offsets + int(values.get(col, DEFAULTS[col])) - SLIDERS[col][0]
+        inside = (position >= 0) & (position < len(line))
+        delta = np.full(len(offsets), np.nan)
+        delta[inside] = line[position[inside]] - base
+        rows[LABELS[col]] = delta
+
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=[f"{o:+d}" for o in offsets]
+    )
+
+
+# ------------------------------------------------
+# CHEAPEST CHANGE TO THE NEXT BAND
+# ------------------------------------------------
+def next_band(marks):
+    """(lower bound, label) of the band above marks, or None at the top."""
+    for bound, label in reversed(PERFORMANCE_BANDS):
+        if marks < bound:
+            return bound, label
+    return None
+
+
+def cheapest_improvement(formula, values, frozen=(), costs=None):
+    """
+    Smallest change to the sliders that lifts the predicted marks into the
+    next Performance_Level band.
+
+    Cost is the sum over sliders of costs[col] * |change| (1 per hour /
+    attention point by default); sliders in frozen are not moved. Returns
+    None when already in the top band, otherwise a dict with the target
+    band, its bound, and - if any reachable combination gets there - the
+    new marks, cost and {column: (current, suggested)} for the sliders that
+    change.
+    """
+    costs = costs or {}
+    current = score_at(formula, values)
+    band = next_band(current)
+    if band is None:
+        return None
+    bound, label = band
+
+    axes = tuple(col for col in formula_sliders(formula) if col not in frozen)
+    result = {"current": current, "level": str(performance_levels([current])[0]),
+              "target": label, "bound": bound, "changes": None}
+    if not axes:
+        return result
+
+    with span("whatif.cheapest") as s:
+        grid = score_grid(formula, axes, values)
+        s.rows = grid.size
+
+        cost = np.zeros(grid.shape)
+        for dim, col in enumerate(axes):
+            steps = np.abs(axis_values(col) - values.get(col, DEFAULTS[col])) * costs.get(col, 1.0)
+            cost = cost + steps.reshape([-1 if d == dim else 1 for d in range(len(axes))])
+
+        cost = np.where(grid >= bound, cost, np.inf)
+        best = int(np.argmin(cost))
+        if not np.isfinite(cost.flat[best]):
+            return result
+
+    index = np.unravel_index(best, grid.shape)
+    suggested = {col: int(axis_values(col)[i]) for col, i in zip(axes, index)}
+    result.update(
+        marks=float(grid[index]),
+        cost=float(cost.flat[best]),
+        changes={
+            col: (int(values.get(col, DEFAULTS[col])), new)
+            for col, new in suggested.items()
+            if new != int(values.get(col, DEFAULTS[col]))
+        },
+    )
+    return result
+
+
+# ------------------------------------------------
+# EXPLORER PANEL
+# ------------------------------------------------
+def explorer_panel(formula, values, key):
+    """What-if expander for a slider panel; key keeps widget ids per page."""
+    import plotly.express as px
+    import streamlit as st
+
+    sliders = formula_sliders(formula)
+
+    with st.expander("🔬 What-if Explorer"):
+        # ---------- Cheapest change to the next band ----------
+        frozen = st.multiselect(
+            "Keep fixed", sliders, format_func=LABELS.get, key=f"{key}_frozen",
+            help="Sliders the suggestion may not change."
+        )
+        best = cheapest_improvement(formula, values, frozen=frozen)
+        if best is None:
+            st.success("Already in the top performance band.")
+        elif not best["changes"]:
+            st.warning(f"No combination of the other sliders reaches {best['target']} ({best['bound']}+ marks).")
+        else:
+            st.markdown(f"**Smallest change to reach {best['target']}** "
+                        f"({best['current']:.2f} → {best['marks']:.2f} marks)")
+            st.dataframe(
+                pd.DataFrame(
+                    [(LABELS[col], old, new, new - old) for col, (old, new) in best["changes"].items()],
+                    columns=["Parameter", "Current", "Suggested", "Change"]
+                ),
+                hide_index=True
+            )
+
+        # ---------- Sensitivity ----------
+        st.markdown("**Marks change per slider step**")
+        table = sensitivity(formula, values)
+        st.plotly_chart(
+            px.imshow(table, text_auto=".1f", color_continuous_scale="RdYlGn",
+                      color_continuous_midpoint=0, aspect="auto",
+                      labels={"x": "Slider steps", "y": "", "color": "Δ marks"}),
+            use_container_width=True, key=f"{key}_sensitivity"
+        )
+
+        # ---------- 2-D slice ----------
+        col1, col2 = st.columns(2)
+        x = col1.selectbox("X axis", sliders, index=0, format_func=LABELS.get, key=f"{key}_x")
+        y = col2.selectbox("Y axis", [col for col in sliders if col != x], format_func=LABELS.get, key=f"{key}_y")
+        grid = slice_frame(formula, x, y, values)
+        fig = px.imshow(grid, origin="lower", color_continuous_scale="Viridis", aspect="auto",
+                        labels={"x": LABELS[x], "y": LABELS[y], "color": "Predicted Marks"})
+        fig.add_scatter(x=[values[x]], y=[values[y]], mode="markers", name="Current",
+                        marker={"color": "red", "size": 12, "symbol": "x"})
+        st.plotly_chart(fig, use_container_width=True, key=f"{key}_slice")